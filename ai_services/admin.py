@@ -1,14 +1,14 @@
 from django.contrib import admin
-from .models import AIGeneration
+from .models import AIGeneration, BoilerplateFingerprint, ExtractedTextCache, GenerationCacheEntry, ScrapedJobCache
 
 
 @admin.register(AIGeneration)
 class AIGenerationAdmin(admin.ModelAdmin):
-    list_display = ['generation_type', 'user', 'application', 'model_used', 'tokens_used', 'created_at']
+    list_display = ['generation_type', 'user', 'application', 'model_used', 'tokens_used', 'cache_hit', 'created_at']
     search_fields = ['user__username', 'generation_type', 'job_description']
-    list_filter = ['generation_type', 'model_used', 'created_at']
+    list_filter = ['generation_type', 'model_used', 'prompt_version', 'cache_hit', 'tokens_estimated', 'created_at']
     raw_id_fields = ['application', 'user']
-    readonly_fields = ['created_at', 'tokens_used']
+    readonly_fields = ['created_at', 'tokens_used', 'prompt_tokens', 'completion_tokens', 'cached_tokens', 'input_tokens_saved', 'tokens_estimated', 'first_token_ms', 'prompt_version', 'cache_hit']
     
     fieldsets = (
         ('Generation Info', {
@@ -18,9 +18,44 @@ class AIGenerationAdmin(admin.ModelAdmin):
             'fields': ('input_resume', 'job_description', 'job_url')
         }),
         ('Output', {
-            'fields': ('output_text', 'model_used', 'tokens_used')
+            'fields': ('output_text', 'model_used', 'prompt_version', 'cache_hit')
+        }),
+        ('Token Usage', {
+            'fields': ('tokens_used', 'prompt_tokens', 'completion_tokens', 'cached_tokens', 'input_tokens_saved', 'tokens_estimated', 'first_token_ms')
         }),
         ('Metadata', {
             'fields': ('created_at',)
         }),
     )
+
+
+
+@admin.register(ExtractedTextCache)
+class ExtractedTextCacheAdmin(admin.ModelAdmin):
+    list_display = ['content_hash', 'file_type', 'file_size', 'hit_count', 'last_used_at', 'created_at']
+    search_fields = ['content_hash']
+    list_filter = ['file_type']
+    readonly_fields = ['created_at', 'last_used_at', 'hit_count']
+
+
+@admin.register(GenerationCacheEntry)
+class GenerationCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['cache_key', 'generation_type', 'model_used', 'temperature', 'prompt_version', 'hit_count', 'expires_at']
+    search_fields = ['cache_key']
+    list_filter = ['generation_type', 'model_used', 'prompt_version']
+    readonly_fields = ['created_at', 'hit_count']
+
+
+@admin.register(ScrapedJobCache)
+class ScrapedJobCacheAdmin(admin.ModelAdmin):
+    list_display = ['canonical_url', 'extraction', 'fetched_at', 'fresh_until', 'stale_until']
+    search_fields = ['canonical_url']
+    list_filter = ['extraction']
+    readonly_fields = ['fetched_at', 'refreshing_since']
+
+
+@admin.register(BoilerplateFingerprint)
+class BoilerplateFingerprintAdmin(admin.ModelAdmin):
+    list_display = ['fingerprint', 'postings', 'companies', 'sample', 'updated_at']
+    search_fields = ['fingerprint', 'sample']
+    readonly_fields = ['updated_at']
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AiServicesConfig(AppConfig):
     name = 'ai_services'
+
+    def ready(self):
+        from . import signals  # noqa: F401
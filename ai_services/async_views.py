@@ -0,0 +1,150 @@
+"""
+Async streaming AI views for the ASGI stack.
+
+The sync views in views.py hold a worker thread for the whole 10-60s
+LLM stream. These views stream through the AsyncOpenAI client with
+async generators, so one ASGI process (uvicorn/daphne serving
+config.asgi:application) can hold hundreds of concurrent streams.
+
+They are plain Django async views (DRF's @api_view is sync-only),
+so JWT authentication is done explicitly.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+
+from .services.generation_cache import acached_stream, parse_reuse_flag
+from .services.generation_records import arecord_generation
+from .services.openai_service import (
+    atailor_resume_streaming,
+    agenerate_cover_letter,
+    agenerate_interview_prep,
+    amatch_score_streaming,
+)
+from .services.resume_input import (
+    ResumeInputError,
+    resolve_resume_text,
+    validate_application_id,
+    validate_job_description,
+)
+
+
+async def _authenticate(request):
+    """Return the JWT-authenticated user, or None"""
+    try:
+        result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+async def _stream_generation(request, generation_type, stream_factory):
+    """
+    Validate the request, resolve the resume and stream the generation.
+
+    Args:
+        request: Django HttpRequest
+        generation_type (str): AIGeneration.generation_type to store
+        stream_factory (callable): (resume_text, job_description, usage=dict) -> async iterator of chunks
+
+    Returns:
+        StreamingHttpResponse | JsonResponse
+    """
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    try:
+        job_description = validate_job_description(request.POST)
+        application_id = validate_application_id(request.POST)
+        resume_text = await sync_to_async(resolve_resume_text)(user, request.FILES, request.POST)
+    except ResumeInputError as e:
+        return JsonResponse({'error': e.message}, status=e.status_code)
+
+    reuse = parse_reuse_flag(request.POST.get('reuse_cached'))
+
+    async def generate_stream():
+        """Async generator that yields AI-generated chunks"""
+        full_response = []
+        cache_info = {}
+        usage = {}
+
+        try:
+            async for chunk in acached_stream(
+                generation_type, resume_text, job_description,
+                lambda: stream_factory(resume_text, job_description, usage=usage),
+                reuse=reuse, info=cache_info,
+            ):
+                full_response.append(chunk)
+                yield chunk
+
+            await arecord_generation(
+                user=user,
+                application_id=application_id,
+                generation_type=generation_type,
+                resume_text=resume_text,
+                job_description=job_description,
+                output_text=''.join(full_response),
+                cache_hit=cache_info['cache_hit'],
+                usage=usage,
+            )
+
+        except Exception as e:
+            yield f"\n\n[ERROR: {str(e)}]"
+
+    response = StreamingHttpResponse(
+        generate_stream(),
+        content_type='text/plain; charset=utf-8'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def tailor_resume_async_view(request):
+    """
+    Async streaming variant of tailor_resume_direct_view.
+
+    POST /api/ai/async/tailor-resume/
+    Body: same form-data as /api/ai/tailor-resume/
+    """
+    return await _stream_generation(request, 'tailored_resume', atailor_resume_streaming)
+
+
+@csrf_exempt
+@require_POST
+async def generate_cover_letter_async_view(request):
+    """
+    Async streaming variant of generate_cover_letter_view.
+
+    POST /api/ai/async/generate-cover-letter/
+    """
+    return await _stream_generation(request, 'cover_letter', agenerate_cover_letter)
+
+
+@csrf_exempt
+@require_POST
+async def generate_interview_prep_async_view(request):
+    """
+    Async streaming variant of generate_interview_prep_view.
+
+    POST /api/ai/async/generate-interview-prep/
+    """
+    return await _stream_generation(request, 'interview_prep', agenerate_interview_prep)
+
+
+@csrf_exempt
+@require_POST
+async def match_score_async_view(request):
+    """
+    Async streaming variant of match_score_view.
+
+    POST /api/ai/async/match-score/
+    """
+    return await _stream_generation(request, 'match_score', amatch_score_streaming)
@@ -0,0 +1,126 @@
+"""
+Local stub of the OpenAI Chat Completions API for benchmarks.
+
+Speaks HTTP/1.1 with keep-alive, answers POST /v1/chat/completions
+(plain JSON or SSE when "stream": true) and counts how many TCP
+connections were opened, so benchmarks can show connection reuse.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _completion(self, model, content):
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+        }
+
+    def _chunk(self, model, delta, finish_reason=None, usage=None):
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [] if usage else [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            'usage': usage,
+        }
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        model = request.get('model', 'stub-model')
+        server = self.server
+        with server._count_lock:
+            server.requests_served += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if not request.get('stream'):
+            body = json.dumps(self._completion(model, server.reply)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        events = [self._chunk(model, {'role': 'assistant', 'content': ''})]
+        events += [self._chunk(model, {'content': word + ' '}) for word in server.reply.split()]
+        events.append(self._chunk(model, {}, finish_reason='stop'))
+        if (request.get('stream_options') or {}).get('include_usage'):
+            prompt_tokens, cached_tokens = server.prompt_usage(request.get('messages') or [])
+            events.append(self._chunk(model, {}, usage={
+                'prompt_tokens': prompt_tokens, 'completion_tokens': len(server.reply.split()),
+                'total_tokens': prompt_tokens + len(server.reply.split()),
+                'prompt_tokens_details': {'cached_tokens': cached_tokens},
+            }))
+
+        payload = b''.join(b'data: ' + json.dumps(event).encode() + b'\n\n' for event in events)
+        payload += b'data: [DONE]\n\n'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class OpenAIStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, reply='Stub response from the local OpenAI server.', latency=0.0):
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+        self.reply = reply
+        self.latency = latency
+        self.connections_opened = 0
+        self.requests_served = 0
+        self._seen_prefixes = set()
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    def prompt_usage(self, messages):
+        """
+        Rough (prompt_tokens, cached_tokens) for a request. Mimics provider
+        prefix caching: a system message seen before counts as cached.
+        """
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages) // 4 or 10
+        system = messages[0].get('content') or '' if messages and messages[0].get('role') == 'system' else ''
+        with self._count_lock:
+            cached = system in self._seen_prefixes
+            self._seen_prefixes.add(system)
+        return prompt_tokens, (len(system) // 4 if cached else 0)
+
+    def process_request(self, request, client_address):
+        with self._count_lock:
+            self.connections_opened += 1
+        super().process_request(request, client_address)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,140 @@
+"""
+Job Page Extractor Benchmark
+
+Run with: python manage.py benchmark_extractors [--repeat 50] [--dir PATH] [--extractor NAME]
+
+This script:
+1. Loads the saved job pages in ai_services/fixtures/job_pages (manifest.json
+   gives each page's URL and the expected extractor, title, company and a
+   snippet of the description)
+2. Checks every page is routed to the expected extractor by host lookup
+3. Runs the page's extractor (with its fallback cascade) on the parsed page
+   and scores the extracted fields against the expected values
+4. Prints median extraction time per page next to the generic extractor's
+   on the same page, then accuracy and time per extractor
+
+Parsing (libxml2) is done once per page and not timed: it is the same for
+every extractor, see benchmark_job_parsing.
+"""
+import statistics
+import time
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand
+
+from ai_services.management.commands.benchmark_job_parsing import DEFAULT_FIXTURE_DIR, load_fixtures
+from ai_services.services.job_extractors import get_extractor, registry
+from ai_services.services.job_scraper import _parse_lxml, lxml_html
+
+
+def time_extraction(root, extractor, repeat):
+    """
+    Median time of one extraction (with the fallback cascade).
+
+    Returns:
+        tuple: (result dict, median ms)
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = registry.extract(root, extractor)
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def score(result, entry):
+    """
+    Compare extracted fields with the manifest's expected values.
+
+    Returns:
+        list: [(field, correct)]
+    """
+    checks = []
+    for field in ('title', 'company'):
+        if field in entry:
+            checks.append((field, result[field] == entry[field]))
+    if 'description_contains' in entry:
+        checks.append(('description', entry['description_contains'] in result['description']))
+    return checks
+
+
+class Command(BaseCommand):
+    help = 'Accuracy and speed of each job page extractor on the fixture corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Extractions per page (default: 50)')
+        parser.add_argument('--dir', default=DEFAULT_FIXTURE_DIR, help='Fixture directory with manifest.json')
+        parser.add_argument('--extractor', help='Only pages of this extractor')
+
+    def handle(self, *args, **options):
+        if lxml_html is None:
+            self.stdout.write(self.style.ERROR('lxml is not installed; the extractors need it'))
+            return
+
+        fixtures = load_fixtures(options['dir'])
+        if options['extractor']:
+            fixtures = [f for f in fixtures if f[1].get('extractor') == options['extractor']]
+
+        self.stdout.write("=" * 60)
+        self.stdout.write("Job Page Extractor Benchmark")
+        self.stdout.write("=" * 60)
+        self.stdout.write(f"{len(fixtures)} pages, {options['repeat']} extractions each, "
+                          f"extractors: {', '.join(registry.names())}\n")
+
+        header = f"{'page':<40} {'extractor':<11} {'fields':>7} {'ms':>7} {'generic ms':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        generic = registry.get('generic')
+        per_extractor = {}
+        failures = []
+        for name, entry, content in fixtures:
+            extractor = get_extractor(urlparse(entry['url']).hostname)
+            if 'extractor' in entry and extractor.name != entry['extractor']:
+                failures.append(f"{name}: routed to {extractor.name}, expected {entry['extractor']}")
+
+            root = _parse_lxml(content)
+            result, median_ms = time_extraction(root, extractor, options['repeat'])
+            _, generic_ms = time_extraction(root, generic, options['repeat'])
+
+            checks = score(result, entry)
+            correct = sum(1 for _, ok in checks if ok)
+            for field, ok in checks:
+                if not ok:
+                    expected = entry['description_contains'] if field == 'description' else entry[field]
+                    failures.append(f"{name}: {field} {result[field][:60]!r}, expected {expected!r}")
+
+            stats = per_extractor.setdefault(extractor.name, {'pages': 0, 'correct': 0, 'checked': 0, 'ms': []})
+            stats['pages'] += 1
+            stats['correct'] += correct
+            stats['checked'] += len(checks)
+            stats['ms'].append(median_ms)
+            self.stdout.write(
+                f"{name[:40]:<40} {extractor.name:<11} {f'{correct}/{len(checks)}':>7} "
+                f"{median_ms:>7.3f} {generic_ms:>11.3f}"
+            )
+
+        self.stdout.write("")
+        header = f"{'extractor':<11} {'pages':>6} {'accuracy':>9} {'median ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for extractor_name, stats in sorted(per_extractor.items()):
+            accuracy = stats['correct'] / stats['checked'] if stats['checked'] else 1.0
+            self.stdout.write(
+                f"{extractor_name:<11} {stats['pages']:>6} {accuracy:>9.0%} {statistics.median(stats['ms']):>10.3f}"
+            )
+
+        hosts = [urlparse(entry['url']).hostname for _, entry, _ in fixtures] or ['example.com']
+        lookups = 100000
+        started = time.perf_counter()
+        for index in range(lookups):
+            get_extractor(hosts[index % len(hosts)])
+        lookup_us = (time.perf_counter() - started) * 1e6 / lookups
+        self.stdout.write(f"\nHost lookup: {lookup_us:.2f} µs per URL")
+
+        if failures:
+            self.stdout.write(self.style.ERROR(f"\n{len(failures)} failures:"))
+            for failure in failures:
+                self.stdout.write(f"  {failure}")
+        else:
+            self.stdout.write(self.style.SUCCESS("\nEvery page was routed and extracted as expected"))
@@ -0,0 +1,182 @@
+"""
+Job Page Parsing Benchmark
+
+Run with: python manage.py benchmark_job_parsing [--repeat 20] [--dir PATH]
+
+This script:
+1. Loads the saved job pages in ai_services/fixtures/job_pages (manifest.json
+   gives each page's URL, expected title/company and, for pages with
+   structured metadata, whether it is complete enough to skip the LLM)
+2. Parses every page with the BeautifulSoup html.parser path and the lxml
+   targeted-extraction path
+3. Checks both paths return the same fields (where both have an extractor
+   for the site; per-extractor accuracy is benchmark_extractors' job)
+4. Prints median parse time and peak traced memory per page and path
+5. Replays every page as a streamed download (16 KB chunks through the
+   scraper's ExtractionWatcher) and prints how many bytes were needed
+   before the download could stop, the time to extract, and whether the
+   early result matches the full page
+
+Peak memory is measured with tracemalloc, which sees Python allocations
+only: libxml2's C tree is not included, BeautifulSoup's Python tree is.
+"""
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from ai_services.services.job_scraper import (
+    ExtractionWatcher,
+    lxml_html,
+    parse_job_page,
+    structured_fast_path_enabled,
+)
+from ai_services.services.scraper_http import STREAM_CHUNK_SIZE
+
+
+DEFAULT_FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'fixtures', 'job_pages',
+)
+PARSERS = ['html.parser', 'lxml']
+
+
+def load_fixtures(directory):
+    """
+    Read the fixture pages listed in manifest.json.
+
+    Returns:
+        list: [(file name, manifest entry, page bytes)]
+    """
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    fixtures = []
+    for name, entry in manifest.items():
+        with open(os.path.join(directory, name), 'rb') as f:
+            fixtures.append((name, entry, f.read()))
+    return fixtures
+
+
+def measure(content, url, parser, repeat):
+    """
+    Time and trace one parser on one page.
+
+    Returns:
+        tuple: (result dict, median ms, peak traced KB)
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parse_job_page(content, url, parser=parser)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    parse_job_page(content, url, parser=parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, statistics.median(timings), peak / 1024
+
+
+def replay_stream(content, url):
+    """
+    Feed a page to an ExtractionWatcher chunk by chunk, then parse what was
+    read. The watcher waits for JSON-LD as the scraper's does.
+
+    Returns:
+        tuple: (result dict, bytes read, time to extract in ms)
+    """
+    started = time.perf_counter()
+    watcher = ExtractionWatcher(url, wait_for_json_ld=structured_fast_path_enabled())
+    read = len(content)
+    for offset in range(0, len(content), STREAM_CHUNK_SIZE):
+        if watcher.feed(content[offset:offset + STREAM_CHUNK_SIZE]):
+            read = min(offset + STREAM_CHUNK_SIZE, len(content))
+            break
+    result = parse_job_page(content[:read], url, parser='lxml')
+    return result, read, (time.perf_counter() - started) * 1000
+
+
+class Command(BaseCommand):
+    help = 'Compare job page parsing time and memory: BeautifulSoup vs lxml targeted extraction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per page and path (default: 20)')
+        parser.add_argument('--dir', default=DEFAULT_FIXTURE_DIR, help='Fixture directory with manifest.json')
+
+    def handle(self, *args, **options):
+        if lxml_html is None:
+            self.stdout.write(self.style.ERROR('lxml is not installed; only html.parser is available'))
+            return
+
+        fixtures = load_fixtures(options['dir'])
+
+        self.stdout.write("=" * 60)
+        self.stdout.write("Job Page Parsing Benchmark")
+        self.stdout.write("=" * 60)
+        self.stdout.write(f"{len(fixtures)} pages, {options['repeat']} parses each\n")
+
+        header = f"{'page':<40} {'KB':>6} {'parser':<12} {'median ms':>10} {'peak KB':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        totals = {parser: {'ms': 0.0, 'kb': 0.0} for parser in PARSERS}
+        mismatches = []
+        for name, entry, content in fixtures:
+            results = {}
+            for parser in PARSERS:
+                result, median_ms, peak_kb = measure(content, entry['url'], parser, options['repeat'])
+                results[parser] = result
+                totals[parser]['ms'] += median_ms
+                totals[parser]['kb'] = max(totals[parser]['kb'], peak_kb)
+                self.stdout.write(
+                    f"{name[:40]:<40} {len(content) / 1024:>6.0f} {parser:<12} {median_ms:>10.2f} {peak_kb:>9.0f}"
+                )
+
+            # Sites without a BeautifulSoup extractor can't be compared
+            same_extractor = results['lxml']['extractor'] == results['html.parser']['extractor']
+            if same_extractor and results['html.parser'] != results['lxml']:
+                mismatches.append(f"{name}: parsers disagree")
+            for field in ('title', 'company'):
+                if field in entry and results['lxml'][field] != entry[field]:
+                    mismatches.append(f"{name}: {field} {results['lxml'][field]!r} != expected {entry[field]!r}")
+            confident = results['lxml']['structured']['confident']
+            if 'structured_confident' in entry and confident != entry['structured_confident']:
+                mismatches.append(f"{name}: structured confident={confident}, expected {entry['structured_confident']}")
+
+        self.stdout.write("")
+        baseline, fast = totals['html.parser'], totals['lxml']
+        self.stdout.write(f"Total median time: html.parser {baseline['ms']:.1f} ms, lxml {fast['ms']:.1f} ms "
+                          f"({baseline['ms'] / fast['ms']:.1f}x faster)")
+        self.stdout.write(f"Largest peak traced memory: html.parser {baseline['kb']:.0f} KB, lxml {fast['kb']:.0f} KB")
+
+        self.stdout.write("\nStreamed download (early stop once the extracted elements are complete)")
+        header = f"{'page':<40} {'KB read':>8} {'of KB':>7} {'saved':>6} {'extract ms':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        total_read = total_size = 0
+        for name, entry, content in fixtures:
+            result, read, extract_ms = replay_stream(content, entry['url'])
+            total_read += read
+            total_size += len(content)
+            self.stdout.write(
+                f"{name[:40]:<40} {read / 1024:>8.0f} {len(content) / 1024:>7.0f} "
+                f"{1 - read / len(content):>6.0%} {extract_ms:>11.2f}"
+            )
+            if result != parse_job_page(content, entry['url'], parser='lxml'):
+                mismatches.append(f"{name}: streamed result differs from the full page")
+        self.stdout.write(f"Bytes not downloaded: {(total_size - total_read) / 1024:.0f} KB of "
+                          f"{total_size / 1024:.0f} KB ({1 - total_read / total_size:.0%})")
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"\n{len(mismatches)} mismatches:"))
+            for mismatch in mismatches:
+                self.stdout.write(f"  {mismatch}")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                "\nBoth parsers, and the streamed downloads, returned identical fields for every page"
+            ))
@@ -0,0 +1,110 @@
+"""
+Local Match Agreement Benchmark
+
+Run with: python manage.py benchmark_match_agreement
+
+This script:
+1. Loads stored match_score generations (LLM reports with "Match Score: XX%")
+2. Re-scores each stored resume / job description pair with the local engine
+3. Prints agreement between the two: mean absolute error, Pearson and
+   Spearman correlation, share within 10 / 20 points, pairwise ranking agreement
+4. Prints local scoring latency
+
+Use it to tune the weights in ai_services/services/local_match.py.
+"""
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from ai_services.models import AIGeneration
+from ai_services.services.local_match import get_idf_model, parse_llm_match_score, score_match
+
+
+def _ranks(values):
+    """Average ranks (ties share their mean rank), for Spearman correlation"""
+    order = np.argsort(values, kind='mergesort')
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values), dtype=np.float64)
+    for value in np.unique(values):
+        tied = values == value
+        ranks[tied] = ranks[tied].mean()
+    return ranks
+
+
+def _correlation(a, b):
+    if len(a) < 2 or a.std() == 0 or b.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+class Command(BaseCommand):
+    help = 'Compare local match scores with stored LLM match_score results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000, help='Most recent generations to compare')
+        parser.add_argument('--show', type=int, default=10, help='Largest disagreements to print')
+
+    def handle(self, *args, **options):
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('LOCAL MATCH AGREEMENT BENCHMARK')
+        self.stdout.write('='*60 + '\n')
+
+        generations = (
+            AIGeneration.objects.filter(generation_type='match_score', cache_hit=False)
+            .exclude(input_resume__isnull=True).exclude(input_resume='')
+            .order_by('-created_at')[:options['limit']]
+        )
+
+        idf_model = get_idf_model()
+        self.stdout.write(f"IDF corpus: {idf_model.document_count} job descriptions")
+
+        pairs = []
+        timings = []
+        skipped = 0
+        for generation in generations:
+            llm_score = parse_llm_match_score(generation.output_text)
+            if llm_score is None:
+                skipped += 1
+                continue
+            start = time.perf_counter()
+            local = score_match(generation.input_resume, generation.job_description, idf_model=idf_model)
+            timings.append((time.perf_counter() - start) * 1000)
+            pairs.append((generation.id, llm_score, local['score']))
+
+        self.stdout.write(f"Compared: {len(pairs)}   Skipped (no parsable score): {skipped}\n")
+        if not pairs:
+            self.stdout.write(self.style.WARNING('No stored match_score generations to compare.'))
+            return
+
+        llm = np.array([p[1] for p in pairs], dtype=np.float64)
+        local = np.array([p[2] for p in pairs], dtype=np.float64)
+        diff = np.abs(llm - local)
+
+        # Pairwise ranking agreement: same order for every pair of generations
+        sign_llm = np.sign(llm[:, None] - llm[None, :])
+        sign_local = np.sign(local[:, None] - local[None, :])
+        comparable = np.triu(sign_llm != 0, k=1)
+        concordant = (sign_llm == sign_local) & comparable
+
+        self.stdout.write(f"{'Metric':<32} {'Value':>12}")
+        self.stdout.write('-'*60)
+        self.stdout.write(f"{'Mean absolute error (points)':<32} {diff.mean():>12.1f}")
+        self.stdout.write(f"{'Mean bias (local - LLM)':<32} {(local - llm).mean():>12.1f}")
+        self.stdout.write(f"{'Pearson correlation':<32} {_correlation(llm, local):>12.3f}")
+        self.stdout.write(f"{'Spearman correlation':<32} {_correlation(_ranks(llm), _ranks(local)):>12.3f}")
+        self.stdout.write(f"{'Within 10 points':<32} {(diff <= 10).mean() * 100:>11.1f}%")
+        self.stdout.write(f"{'Within 20 points':<32} {(diff <= 20).mean() * 100:>11.1f}%")
+        if comparable.sum():
+            self.stdout.write(f"{'Pairwise rank agreement':<32} {concordant.sum() / comparable.sum() * 100:>11.1f}%")
+        self.stdout.write(f"{'Local score p50 (ms)':<32} {np.percentile(timings, 50):>12.2f}")
+        self.stdout.write(f"{'Local score p95 (ms)':<32} {np.percentile(timings, 95):>12.2f}")
+        self.stdout.write('-'*60)
+
+        if options['show']:
+            self.stdout.write('\nLargest disagreements:')
+            for index in np.argsort(-diff)[:options['show']]:
+                generation_id, llm_score, local_score = pairs[index]
+                self.stdout.write(f"  generation {generation_id}: LLM {llm_score}%  local {local_score}%")
+
+        self.stdout.write('='*60 + '\n')
@@ -0,0 +1,100 @@
+"""
+OpenAI Client Benchmark
+
+Run with: python manage.py benchmark_openai_client
+
+This script:
+1. Starts a local stub of the Chat Completions API
+2. Sends N requests building a new OpenAI() client per call (old behaviour)
+3. Sends N requests through the pooled, process-wide client
+4. Prints per-request latency and how many TCP connections each path opened
+
+The stub speaks plain HTTP, so the savings shown are TCP connect + client
+construction only. Against api.openai.com every avoided connection also
+skips a TLS handshake (1-2 extra round trips).
+"""
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from openai import OpenAI
+
+from ai_services.services.openai_client import (
+    OpenAIClientRegistry,
+    build_openai_client,
+    get_client_options,
+)
+from ._openai_stub import OpenAIStubServer
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-call OpenAI clients against the pooled client registry'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent callers')
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help='Simulated server processing time per request (seconds)')
+
+    def _run(self, server, make_client, total, concurrency):
+        server.connections_opened = 0
+
+        def call(_):
+            client = make_client()
+            client.chat.completions.create(
+                model='gpt-4.1-nano',
+                messages=[{'role': 'user', 'content': 'ping'}],
+            )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(call, range(total)))
+        elapsed = time.perf_counter() - start
+
+        return elapsed, server.connections_opened
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        concurrency = options['concurrency']
+
+        server = OpenAIStubServer(latency=options['latency']).start()
+        pooled_options = dict(get_client_options(), api_key='sk-benchmark', base_url=server.base_url)
+
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('OPENAI CLIENT BENCHMARK')
+        self.stdout.write('='*60)
+        self.stdout.write(f"Stub server: {server.base_url}")
+        self.stdout.write(f"Requests: {total}   Concurrency: {concurrency}   HTTP/2: {pooled_options['http2']}\n")
+
+        try:
+            # Old behaviour: a brand-new client (and connection pool) per call
+            fresh_time, fresh_connections = self._run(
+                server,
+                lambda: OpenAI(api_key='sk-benchmark', base_url=server.base_url),
+                total, concurrency,
+            )
+
+            registry = OpenAIClientRegistry()
+            pooled_time, pooled_connections = self._run(
+                server,
+                lambda: registry.get('sync', lambda: build_openai_client(pooled_options)),
+                total, concurrency,
+            )
+            registry.close()
+        finally:
+            server.stop()
+
+        self.stdout.write(f"{'Scenario':<22} {'Total (s)':>10} {'Per req (ms)':>13} {'Connections':>12}")
+        self.stdout.write('-'*60)
+        self.stdout.write(
+            f"{'New client per call':<22} {fresh_time:>10.2f} {fresh_time / total * 1000:>13.2f} {fresh_connections:>12}"
+        )
+        self.stdout.write(
+            f"{'Pooled registry':<22} {pooled_time:>10.2f} {pooled_time / total * 1000:>13.2f} {pooled_connections:>12}"
+        )
+        self.stdout.write('-'*60)
+
+        saved_ms = (fresh_time - pooled_time) / total * 1000
+        self.stdout.write(f"Saved per request: {saved_ms:.2f} ms")
+        self.stdout.write(f"Connections avoided: {fresh_connections - pooled_connections}")
+        self.stdout.write('='*60 + '\n')
@@ -0,0 +1,152 @@
+"""
+PDF Extraction Benchmark
+
+Run with: python manage.py benchmark_pdf_extraction
+
+This script:
+1. Builds synthetic resume-like PDFs with 1, 5, 20 and 100 pages
+2. Extracts each one serially (the default path)
+3. Extracts each one with the page-parallel process pool
+4. Prints timings and the speedup per document size
+"""
+import io
+import time
+
+import PyPDF2
+from django.core.management.base import BaseCommand
+
+from ai_services.services import pdf_parallel
+
+
+SAMPLE_LINES = [
+    "Senior Software Engineer - Platform Team",
+    "Designed and shipped REST APIs in Python and Django serving 2M requests/day.",
+    "Led migration from a monolith to containerized services on Kubernetes.",
+    "Reduced p95 latency by 40% by introducing caching and query optimization.",
+    "Mentored 5 engineers; ran code reviews and architecture design sessions.",
+    "Skills: Python, Django, PostgreSQL, Redis, Docker, AWS, Terraform, React.",
+]
+
+
+def build_sample_pdf(page_count, lines_per_page=45):
+    """
+    Build an uncompressed PDF with `page_count` pages of text using only
+    the standard Helvetica font, so no PDF writing library is needed.
+
+    Returns:
+        bytes: PDF file content
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # placeholder, filled once page ids are known
+    page_ids = []
+
+    for page_number in range(page_count):
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line_number in range(lines_per_page):
+            line = SAMPLE_LINES[(page_number + line_number) % len(SAMPLE_LINES)]
+            line = f"{page_number + 1}.{line_number + 1} {line}"
+            commands.append(f"({line}) Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands).encode('latin-1')
+
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog_id, xref_offset)
+    )
+    return output.getvalue()
+
+
+def _extract_serial(pdf_bytes):
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return [page.extract_text() or '' for page in reader.pages]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark serial vs page-parallel PDF text extraction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20, 100],
+                            help='Page counts to benchmark (default: 1 5 20 100)')
+        parser.add_argument('--workers', type=int, default=pdf_parallel.get_max_workers(),
+                            help='Process pool size for the parallel run')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per measurement (best time is reported)')
+
+    def _best_time(self, func, repeat):
+        best = None
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        repeat = options['repeat']
+
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write('PDF EXTRACTION BENCHMARK')
+        self.stdout.write('='*60)
+        self.stdout.write(f"Workers: {workers}   Runs per measurement: {repeat} (best of)\n")
+
+        # Start the pool up front so process spawn time isn't billed to the first document
+        warmup = build_sample_pdf(2)
+        pdf_parallel.extract_pages_parallel(warmup, 2, max_workers=workers)
+
+        self.stdout.write(f"{'Pages':>6} {'Serial (ms)':>12} {'Parallel (ms)':>14} {'Speedup':>8}  Output")
+        self.stdout.write('-'*60)
+
+        for page_count in options['pages']:
+            pdf_bytes = build_sample_pdf(page_count)
+
+            serial_time, serial_pages = self._best_time(lambda: _extract_serial(pdf_bytes), repeat)
+            parallel_time, parallel_pages = self._best_time(
+                lambda: pdf_parallel.extract_pages_parallel(pdf_bytes, page_count, max_workers=workers),
+                repeat,
+            )
+
+            identical = '✓ identical' if serial_pages == parallel_pages else '✗ MISMATCH'
+            speedup = serial_time / parallel_time if parallel_time else 0.0
+            self.stdout.write(
+                f"{page_count:>6} {serial_time * 1000:>12.1f} {parallel_time * 1000:>14.1f} "
+                f"{speedup:>7.2f}x  {identical}"
+            )
+
+        pdf_parallel.shutdown_pool()
+
+        self.stdout.write('-'*60)
+        self.stdout.write(
+            f"Documents below PDF_PARALLEL_PAGE_THRESHOLD ({pdf_parallel.get_page_threshold()} pages) "
+            f"stay on the serial path."
+        )
+        self.stdout.write('='*60 + '\n')
@@ -0,0 +1,30 @@
+"""
+Build Skill Index
+
+Run with: python manage.py build_skill_index [--user USERNAME] [--batch-size 1000]
+
+Rebuilds the skill -> application index (ApplicationSkill) from the stored
+job descriptions. Needed once for applications saved before the index
+existed, and after changing the skill dictionary; saves keep it current.
+"""
+
+from django.core.management.base import BaseCommand
+from applications.models import JobApplication
+from ai_services.services.skill_index import rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the skill inverted index over job application descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only index this username')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Applications per transaction (default: 1000)')
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.order_by('id')
+        if options['user']:
+            applications = applications.filter(user__username=options['user'])
+
+        indexed, written = rebuild_skill_index(applications, batch_size=options['batch_size'])
+        self.stdout.write(f"Done: {indexed} applications indexed, {written} skill rows written")
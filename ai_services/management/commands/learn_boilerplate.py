@@ -0,0 +1,62 @@
+"""
+Learn Boilerplate
+
+Run with: python manage.py learn_boilerplate [--limit 20000] [--min-postings 2]
+
+Relearns the boilerplate line fingerprints (BoilerplateFingerprint) from the
+stored job descriptions, newest first: every line long enough to be a
+template is counted per posting and per company. Lines that reach
+BOILERPLATE_MIN_POSTINGS / BOILERPLATE_MIN_COMPANIES are dropped by text
+normalization (services/text_normalization.py) once the processes reload
+their fingerprints (BOILERPLATE_FINGERPRINT_TTL).
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from applications.models import JobApplication
+from ai_services.services.text_normalization import (
+    DEFAULT_MIN_COMPANIES,
+    DEFAULT_MIN_POSTINGS,
+    learn_fingerprints,
+    store_fingerprints,
+)
+
+
+class Command(BaseCommand):
+    help = 'Learn boilerplate job description lines from the stored applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int,
+                            help='Most recent descriptions to scan (default: BOILERPLATE_LEARN_MAX_DOCS)')
+        parser.add_argument('--min-postings', type=int, default=2,
+                            help='Store lines seen in at least this many postings (default: 2)')
+
+    def handle(self, *args, **options):
+        limit = options['limit'] or getattr(settings, 'BOILERPLATE_LEARN_MAX_DOCS', 20000)
+        postings = (
+            JobApplication.objects.exclude(job_description__isnull=True).exclude(job_description='')
+            .order_by('-id').values_list('job_description', 'company_id')[:limit]
+        )
+
+        self.stdout.write("=" * 60)
+        self.stdout.write("Learn Boilerplate")
+        self.stdout.write("=" * 60)
+
+        learned = learn_fingerprints(postings.iterator())
+        stored = store_fingerprints(learned, min_postings=options['min_postings'])
+
+        min_postings = getattr(settings, 'BOILERPLATE_MIN_POSTINGS', DEFAULT_MIN_POSTINGS)
+        min_companies = getattr(settings, 'BOILERPLATE_MIN_COMPANIES', DEFAULT_MIN_COMPANIES)
+        active = sorted(
+            (entry for entry in learned.values()
+             if entry['postings'] >= min_postings and len(entry['companies']) >= min_companies),
+            key=lambda entry: entry['postings'], reverse=True,
+        )
+
+        self.stdout.write(f"Lines counted: {len(learned)}")
+        self.stdout.write(f"Fingerprints stored (>= {options['min_postings']} postings): {stored}")
+        self.stdout.write(f"Boilerplate (>= {min_postings} postings, >= {min_companies} companies): {len(active)}")
+        for entry in active[:10]:
+            self.stdout.write(f"  {entry['postings']:>5} postings, {len(entry['companies']):>4} companies: "
+                              f"{entry['sample'][:70]}")
+        self.stdout.write(self.style.SUCCESS("\nDone"))
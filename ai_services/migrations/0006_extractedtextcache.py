@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0005_alter_aigeneration_generation_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractedTextCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the uploaded file bytes', max_length=64)),
+                ('file_type', models.CharField(help_text="File extension used for parsing, e.g. '.pdf'", max_length=10)),
+                ('extracted_text', models.TextField()),
+                ('file_size', models.PositiveIntegerField(default=0, help_text='Size of the uploaded file in bytes')),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='ai_services_last_us_9ab687_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'file_type'), name='unique_extracted_text_per_hash')],
+            },
+        ),
+    ]
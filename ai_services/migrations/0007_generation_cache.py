@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0006_extractedtextcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(help_text='SHA-256 of the normalized generation inputs', max_length=64, unique=True)),
+                ('generation_type', models.CharField(choices=[('tailored_resume', 'Tailored Resume'), ('cover_letter', 'Cover Letter'), ('interview_prep', 'Interview Preparation'), ('match_score', 'Match Score')], max_length=20)),
+                ('output_text', models.TextField()),
+                ('model_used', models.CharField(max_length=100)),
+                ('temperature', models.FloatField()),
+                ('prompt_version', models.PositiveIntegerField()),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='cache_hit',
+            field=models.BooleanField(default=False, help_text='Output was replayed from the generation cache'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0007_generation_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigeneration',
+            name='cached_tokens',
+            field=models.IntegerField(blank=True, help_text="Input tokens served from the provider's prompt cache", null=True),
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='completion_tokens',
+            field=models.IntegerField(blank=True, help_text='Output tokens', null=True),
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='prompt_tokens',
+            field=models.IntegerField(blank=True, help_text='Input tokens', null=True),
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='tokens_estimated',
+            field=models.BooleanField(default=False, help_text='Token counts are a local estimate (no usage reported)'),
+        ),
+        migrations.AddIndex(
+            model_name='aigeneration',
+            index=models.Index(fields=['created_at'], name='ai_services_created_efc5c1_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0008_aigeneration_token_usage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigeneration',
+            name='input_tokens_saved',
+            field=models.IntegerField(blank=True, help_text='Input tokens removed by prompt compression and budgeting', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0009_aigeneration_input_tokens_saved'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aigeneration',
+            name='first_token_ms',
+            field=models.IntegerField(blank=True, help_text='Time to first streamed token in milliseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='aigeneration',
+            name='prompt_version',
+            field=models.PositiveIntegerField(blank=True, help_text='Version of the prompt template used', null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0010_aigeneration_prompt_version'),
+        ('applications', '0006_merge_20260115_1956'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTermVector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the job description the vector was built from', max_length=64)),
+                ('terms', models.JSONField(default=dict, help_text='term -> sublinear term frequency')),
+                ('skills', models.JSONField(default=list, help_text='Known skills named in the job description')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='term_vector', to='applications.jobapplication')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_term_vectors', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'updated_at'], name='ai_services_user_id_d9537d_idx')],
+            },
+        ),
+    ]
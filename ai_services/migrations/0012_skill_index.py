@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0011_jobtermvector'),
+        ('applications', '0006_merge_20260115_1956'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(help_text='Canonical skill name (see services/skill_dictionary.py)', max_length=64)),
+                ('occurrences', models.PositiveIntegerField(default=1)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_skills', to='applications.jobapplication')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_skills', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'skill', 'application'], name='ai_services_user_id_183d2a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('application', 'skill'), name='unique_application_skill')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=64)),
+                ('applications', models.IntegerField(default=0)),
+                ('mentions', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_demand', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-applications'], name='ai_services_user_id_6297c7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'skill'), name='unique_user_skill_demand')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0012_skill_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedJobCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('canonical_url', models.CharField(max_length=500, unique=True)),
+                ('payload', models.JSONField(help_text='Job details as returned by the scrape-job endpoint')),
+                ('extraction', models.CharField(help_text="'structured' or 'llm'", max_length=20)),
+                ('fetched_at', models.DateTimeField()),
+                ('fresh_until', models.DateTimeField()),
+                ('stale_until', models.DateTimeField(db_index=True)),
+                ('refreshing_since', models.DateTimeField(blank=True, help_text='Set while a background revalidation runs', null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0013_scraped_job_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoilerplateFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(help_text='blake2b-64 of the normalized line (hex)', max_length=16, unique=True)),
+                ('postings', models.PositiveIntegerField(help_text='Distinct postings containing the line')),
+                ('companies', models.PositiveIntegerField(help_text='Distinct companies among those postings')),
+                ('sample', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
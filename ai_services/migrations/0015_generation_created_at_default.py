@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0014_boilerplate_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aigeneration',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
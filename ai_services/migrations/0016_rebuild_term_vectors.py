@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:02
+
+from django.db import migrations
+
+
+def delete_term_vectors(apps, schema_editor):
+    # Built from unnormalized job descriptions; ranking rebuilds missing
+    # vectors on first use (batch_ranking.backfill_term_vectors)
+    apps.get_model('ai_services', 'JobTermVector').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0015_generation_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_term_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:14
+
+from django.db import migrations
+
+
+def invalidate_extracted_text(apps, schema_editor):
+    # Normalized with repeated lines dropped, which lost resume bullets
+    # shared by several jobs. The text cache refills on the next upload;
+    # documents are extracted again on first use (get_document_text)
+    apps.get_model('ai_services', 'ExtractedTextCache').objects.all().delete()
+    apps.get_model('documents', 'Document').objects.filter(extraction_status='ready').update(
+        extraction_status='pending', extracted_at=None,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0016_rebuild_term_vectors'),
+        ('documents', '0003_document_text_extraction'),
+    ]
+
+    operations = [
+        migrations.RunPython(invalidate_extracted_text, migrations.RunPython.noop),
+    ]
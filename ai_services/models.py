@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 
@@ -28,16 +29,175 @@ class AIGeneration(models.Model):
     
     # Metadata
     model_used = models.CharField(max_length=100, default='gpt-4.1-nano', help_text="OpenAI model used")
+    prompt_version = models.PositiveIntegerField(null=True, blank=True, help_text="Version of the prompt template used")
     tokens_used = models.IntegerField(null=True, blank=True, help_text="Total tokens consumed")
-    created_at = models.DateTimeField(auto_now_add=True)
+    prompt_tokens = models.IntegerField(null=True, blank=True, help_text="Input tokens")
+    completion_tokens = models.IntegerField(null=True, blank=True, help_text="Output tokens")
+    cached_tokens = models.IntegerField(null=True, blank=True, help_text="Input tokens served from the provider's prompt cache")
+    input_tokens_saved = models.IntegerField(null=True, blank=True, help_text="Input tokens removed by prompt compression and budgeting")
+    tokens_estimated = models.BooleanField(default=False, help_text="Token counts are a local estimate (no usage reported)")
+    first_token_ms = models.IntegerField(null=True, blank=True, help_text="Time to first streamed token in milliseconds")
+    cache_hit = models.BooleanField(default=False, help_text="Output was replayed from the generation cache")
+    # Set when the generation finishes, not when the row is written (write-behind, see generation_writer.py)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['application']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
         app_name = f" for {self.application}" if self.application else ""
         return f"{self.get_generation_type_display()}{app_name} - {self.created_at.strftime('%Y-%m-%d')}"
+
+
+class ExtractedTextCache(models.Model):
+    """
+    Persistent backing table for the extracted resume text cache.
+    Rows are keyed by a SHA-256 hash of the uploaded file bytes,
+    so the same document is only parsed once across all AI endpoints.
+    """
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the uploaded file bytes")
+    file_type = models.CharField(max_length=10, help_text="File extension used for parsing, e.g. '.pdf'")
+    extracted_text = models.TextField()
+    file_size = models.PositiveIntegerField(default=0, help_text="Size of the uploaded file in bytes")
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'file_type'], name='unique_extracted_text_per_hash'),
+        ]
+        indexes = [
+            models.Index(fields=['last_used_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_hash[:12]}{self.file_type} ({len(self.extracted_text)} chars)"
+
+
+class GenerationCacheEntry(models.Model):
+    """
+    Cached AI output keyed on the normalized inputs, generation type,
+    model, temperature and prompt version. Lets identical reruns replay
+    instantly instead of paying for another LLM round trip.
+    """
+    cache_key = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the normalized generation inputs")
+    generation_type = models.CharField(max_length=20, choices=AIGeneration.GENERATION_TYPE_CHOICES)
+    output_text = models.TextField()
+    model_used = models.CharField(max_length=100)
+    temperature = models.FloatField()
+    prompt_version = models.PositiveIntegerField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.generation_type} {self.cache_key[:12]} (expires {self.expires_at.strftime('%Y-%m-%d %H:%M')})"
+
+
+class JobTermVector(models.Model):
+    """
+    Precomputed terms of a JobApplication's job description, used to rank
+    all of a user's applications against a resume in one pass.
+    Refreshed on save when the job description changes.
+    """
+    application = models.OneToOneField('applications.JobApplication', on_delete=models.CASCADE, related_name='term_vector')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_term_vectors')
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the job description the vector was built from")
+    terms = models.JSONField(default=dict, help_text="term -> sublinear term frequency")
+    skills = models.JSONField(default=list, help_text="Known skills named in the job description")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"Terms for application {self.application_id} ({len(self.terms)} terms)"
+
+
+class ApplicationSkill(models.Model):
+    """
+    Inverted index: canonical skill -> job applications whose description names it.
+    Maintained on save (see services/skill_index.py).
+    """
+    application = models.ForeignKey('applications.JobApplication', on_delete=models.CASCADE, related_name='indexed_skills')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='application_skills')
+    skill = models.CharField(max_length=64, help_text="Canonical skill name (see services/skill_dictionary.py)")
+    occurrences = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'skill'], name='unique_application_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'skill', 'application']),
+        ]
+
+    def __str__(self):
+        return f"{self.skill} in application {self.application_id}"
+
+
+class SkillDemand(models.Model):
+    """
+    Per-user rollup of ApplicationSkill: how many applications name each skill.
+    Kept in step with the index, so top-skill queries never aggregate it.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_demand')
+    skill = models.CharField(max_length=64)
+    applications = models.IntegerField(default=0)
+    mentions = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'skill'], name='unique_user_skill_demand'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-applications']),
+        ]
+
+    def __str__(self):
+        return f"{self.skill}: {self.applications} applications"
+
+
+class ScrapedJobCache(models.Model):
+    """
+    Extracted job details (the scrape-job payload) shared across users,
+    keyed by the canonical job URL so tracking parameters and URL variants
+    of the same posting hit one entry. Fresh until fresh_until, then served
+    while revalidating until stale_until (see services/scrape_cache.py).
+    """
+    canonical_url = models.CharField(max_length=500, unique=True)
+    payload = models.JSONField(help_text="Job details as returned by the scrape-job endpoint")
+    extraction = models.CharField(max_length=20, help_text="'structured' or 'llm'")
+    fetched_at = models.DateTimeField()
+    fresh_until = models.DateTimeField()
+    stale_until = models.DateTimeField(db_index=True)
+    refreshing_since = models.DateTimeField(null=True, blank=True, help_text="Set while a background revalidation runs")
+
+    def __str__(self):
+        return f"{self.canonical_url} (fetched {self.fetched_at.strftime('%Y-%m-%d %H:%M')})"
+
+
+class BoilerplateFingerprint(models.Model):
+    """
+    A job description line seen across many postings: ATS templates, EEO
+    statements, cookie banners. Learned from stored job descriptions by the
+    learn_boilerplate command; lines above the BOILERPLATE_MIN_POSTINGS /
+    BOILERPLATE_MIN_COMPANIES thresholds are dropped by text normalization
+    (see services/text_normalization.py).
+    """
+    fingerprint = models.CharField(max_length=16, unique=True, help_text="blake2b-64 of the normalized line (hex)")
+    postings = models.PositiveIntegerField(help_text="Distinct postings containing the line")
+    companies = models.PositiveIntegerField(help_text="Distinct companies among those postings")
+    sample = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.fingerprint} ({self.postings} postings, {self.companies} companies)"
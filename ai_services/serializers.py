@@ -23,10 +23,21 @@ class AIGenerationSerializer(serializers.ModelSerializer):
             'job_url',
             'output_text',
             'model_used',
+            'prompt_version',
             'tokens_used',
+            'prompt_tokens',
+            'completion_tokens',
+            'cached_tokens',
+            'input_tokens_saved',
+            'tokens_estimated',
+            'first_token_ms',
+            'cache_hit',
             'created_at'
         ]
-        read_only_fields = ['user_id', 'created_at', 'tokens_used', 'model_used']
+        read_only_fields = [
+            'user_id', 'created_at', 'tokens_used', 'prompt_tokens', 'completion_tokens',
+            'cached_tokens', 'input_tokens_saved', 'tokens_estimated', 'first_token_ms', 'model_used', 'prompt_version', 'cache_hit'
+        ]
 
 
 class TailorResumeRequestSerializer(serializers.Serializer):
@@ -34,7 +45,8 @@ class TailorResumeRequestSerializer(serializers.Serializer):
     Request serializer for tailoring a resume.
     Accepts either job_description text or job_url.
     """
-    document_id = serializers.IntegerField(help_text="ID of the resume document to tailor")
+    document_id = serializers.IntegerField(required=False, help_text="ID of the resume document to tailor (uses its precomputed text)")
+    use_master = serializers.BooleanField(required=False, default=False, help_text="Use the user's master resume instead of document_id")
     job_description = serializers.CharField(required=False, allow_blank=True, help_text="Job description text")
     job_url = serializers.URLField(required=False, allow_blank=True, help_text="URL to scrape job description from")
     application_id = serializers.IntegerField(required=False, allow_null=True, help_text="Link to job application (optional)")
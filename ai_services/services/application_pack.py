@@ -0,0 +1,163 @@
+"""
+Application Pack
+
+Runs several generations (tailored resume, cover letter, interview prep,
+match score) for one resume + job description concurrently and
+multiplexes their output into a single event stream.
+
+Each artifact streams in its own worker thread through the same path as
+its standalone endpoint (generation cache, single-flight, token usage)
+and is saved as its own AIGeneration row. Wall time is the slowest
+artifact instead of the sum of all four.
+
+Workers keep running if the client disconnects, so every artifact that
+completes is still persisted.
+"""
+import json
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+from .generation_cache import cached_stream
+from .generation_records import save_generation
+from .openai_service import (
+    tailor_resume_streaming,
+    generate_cover_letter,
+    generate_interview_prep,
+    match_score_streaming,
+)
+
+
+# Artifact name (= AIGeneration.generation_type) -> streaming function
+ARTIFACT_STREAMS = {
+    'match_score': match_score_streaming,
+    'tailored_resume': tailor_resume_streaming,
+    'cover_letter': generate_cover_letter,
+    'interview_prep': generate_interview_prep,
+}
+DEFAULT_ARTIFACTS = list(ARTIFACT_STREAMS)
+
+_DONE = object()
+
+
+def parse_artifacts(value):
+    """
+    Parse the requested artifact list ("a,b" string or list).
+
+    Returns:
+        list: Artifact names, in request order
+
+    Raises:
+        ValueError: If an unknown artifact is requested
+    """
+    if not value:
+        return list(DEFAULT_ARTIFACTS)
+
+    names = value if isinstance(value, (list, tuple)) else str(value).split(',')
+    artifacts = []
+    for name in (n.strip() for n in names):
+        if not name or name in artifacts:
+            continue
+        if name not in ARTIFACT_STREAMS:
+            raise ValueError(f'Unknown artifact: {name}. Allowed: {", ".join(ARTIFACT_STREAMS)}')
+        artifacts.append(name)
+    return artifacts
+
+
+def _run_artifact(events, artifact, user, resume_text, job_description, application_id, reuse):
+    """Worker: stream one artifact into the event queue, then persist it"""
+    started = time.perf_counter()
+    cache_info = {}
+    usage = {}
+    output = []
+    stream_function = ARTIFACT_STREAMS[artifact]
+
+    try:
+        for chunk in cached_stream(
+            artifact, resume_text, job_description,
+            lambda: stream_function(resume_text, job_description, usage=usage),
+            reuse=reuse, info=cache_info,
+        ):
+            output.append(chunk)
+            events.put({'event': 'chunk', 'artifact': artifact, 'data': chunk})
+
+        generation = save_generation(
+            user=user,
+            application_id=application_id,
+            generation_type=artifact,
+            resume_text=resume_text,
+            job_description=job_description,
+            output_text=''.join(output),
+            cache_hit=cache_info['cache_hit'],
+            usage=usage,
+        )
+        events.put({
+            'event': 'done',
+            'artifact': artifact,
+            'generation_id': generation.id if generation else None,
+            'cache_hit': cache_info['cache_hit'],
+            'elapsed_ms': int((time.perf_counter() - started) * 1000),
+        })
+    except Exception as e:
+        events.put({'event': 'error', 'artifact': artifact, 'error': str(e)})
+    finally:
+        close_old_connections()
+        events.put(_DONE)
+
+
+def stream_application_pack(user, resume_text, job_description, artifacts=None,
+                            application_id=None, reuse=None):
+    """
+    Generate several artifacts concurrently, yielding their events as they arrive.
+
+    Args:
+        user (User): Requesting user
+        resume_text (str): Resume text (parsed once for all artifacts)
+        job_description (str): Job description
+        artifacts (list): Artifact names (default: all four)
+        application_id (int): Linked JobApplication (optional)
+        reuse (bool | None): Parsed reuse_cached flag, applied to every artifact
+
+    Yields:
+        dict: Events, in arrival order:
+            {'event': 'start', 'artifacts': [...]}
+            {'event': 'chunk', 'artifact': str, 'data': str}
+            {'event': 'done', 'artifact': str, 'generation_id': int, 'cache_hit': bool, 'elapsed_ms': int}
+            {'event': 'error', 'artifact': str, 'error': str}
+            {'event': 'complete', 'elapsed_ms': int}
+    """
+    artifacts = artifacts or list(DEFAULT_ARTIFACTS)
+    events = queue.Queue()
+    started = time.perf_counter()
+
+    for artifact in artifacts:
+        threading.Thread(
+            target=_run_artifact,
+            args=(events, artifact, user, resume_text, job_description, application_id, reuse),
+            daemon=True,
+            name=f'application-pack-{artifact}',
+        ).start()
+
+    yield {'event': 'start', 'artifacts': artifacts}
+
+    running = len(artifacts)
+    while running:
+        event = events.get()
+        if event is _DONE:
+            running -= 1
+            continue
+        yield event
+
+    yield {'event': 'complete', 'elapsed_ms': int((time.perf_counter() - started) * 1000)}
+
+
+def format_ndjson(event):
+    """One event as a newline-delimited JSON line"""
+    return json.dumps(event) + '\n'
+
+
+def format_sse(event):
+    """One event as a Server-Sent Events message"""
+    return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
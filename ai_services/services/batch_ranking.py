@@ -0,0 +1,315 @@
+"""
+Batch Ranking
+
+Scores one resume against every saved JobApplication of a user in a
+single pass, instead of one match_score LLM call per application.
+
+- Each application's job description is tokenized once into a
+  JobTermVector row (refreshed on save, see signals.py).
+- Per user, the stored vectors are assembled into a sparse CSR matrix
+  (applications x terms, TF-IDF, L2-normalized rows) plus a binary
+  applications x skills matrix. Both are cached per process and rebuilt
+  only when the user's vectors or the IDF model change; the matrices of
+  the RANKING_MATRIX_CACHE_SIZE most recently ranking users are kept.
+- A ranking is then two sparse matrix-vector products: cosine
+  similarities against the resume vector and matched-skill counts.
+
+Scores use the same blend as the local match engine (local_match.py),
+so a ranked application and mode=fast agree.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+
+from ..models import JobTermVector
+from .local_match import KNOWN_SKILLS, combine_scores, extract_job_terms, extract_skills, extract_terms, get_idf_model
+
+
+DEFAULT_MATRIX_CACHE_SIZE = 100
+
+
+class CSRMatrix:
+    """Minimal compressed sparse row matrix (NumPy only)"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+        # Row number of every stored value, for the bincount product
+        self._rows = np.repeat(np.arange(shape[0], dtype=np.intp), np.diff(indptr))
+
+    @classmethod
+    def from_rows(cls, rows, n_columns, dtype=np.float64):
+        """
+        Build from per-row (column_indices, values) pairs.
+
+        Returns:
+            CSRMatrix
+        """
+        indptr = np.zeros(len(rows) + 1, dtype=np.intp)
+        indptr[1:] = np.cumsum([len(columns) for columns, _ in rows])
+        indices = np.fromiter((c for columns, _ in rows for c in columns), dtype=np.intp, count=indptr[-1])
+        data = np.fromiter((v for _, values in rows for v in values), dtype=dtype, count=indptr[-1])
+        return cls(data, indices, indptr, (len(rows), n_columns))
+
+    def dot(self, vector):
+        """Matrix-vector product"""
+        return np.bincount(self._rows, weights=self.data * vector[self.indices], minlength=self.shape[0])
+
+
+def hash_job_description(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def compute_term_vector(job_description):
+    """
+    Terms and skills of a job description (normalized as in local_match.score_match).
+
+    Returns:
+        tuple: (terms dict term -> sublinear tf, sorted skills list)
+    """
+    counts = extract_job_terms(job_description)
+    terms = {term: round(float(np.log1p(count)), 4) for term, count in counts.items()}
+    return terms, sorted(extract_skills(counts))
+
+
+def refresh_term_vector(application):
+    """
+    Create, update or delete the term vector of one application.
+    Skipped when the job description is unchanged.
+
+    Returns:
+        JobTermVector | None: None if the application has no job description
+    """
+    job_description = (application.job_description or '').strip()
+    if not job_description:
+        JobTermVector.objects.filter(application_id=application.id).delete()
+        return None
+
+    content_hash = hash_job_description(job_description)
+    vector = JobTermVector.objects.filter(application_id=application.id).first()
+    if vector is not None and vector.content_hash == content_hash:
+        return vector
+
+    terms, skills = compute_term_vector(job_description)
+    vector, _ = JobTermVector.objects.update_or_create(
+        application_id=application.id,
+        defaults={
+            'user_id': application.user_id,
+            'content_hash': content_hash,
+            'terms': terms,
+            'skills': skills,
+        },
+    )
+    return vector
+
+
+def backfill_term_vectors(user):
+    """
+    Build vectors for the user's applications that don't have one yet
+    (created before this index existed or bulk-inserted without signals).
+
+    Returns:
+        int: Vectors created
+    """
+    from applications.models import JobApplication
+
+    missing = (
+        JobApplication.objects.filter(user=user, term_vector__isnull=True)
+        .exclude(job_description__isnull=True).exclude(job_description='')
+    )
+    created = 0
+    for application in missing.iterator():
+        if refresh_term_vector(application) is not None:
+            created += 1
+    return created
+
+
+class UserTermMatrix:
+    """All of one user's job term vectors as sparse matrices"""
+
+    def __init__(self, vectors, idf_model, version):
+        self.version = version
+        self.idf_model = idf_model
+        self.application_ids = np.array([v.application_id for v in vectors], dtype=np.int64)
+
+        vocabulary = {}
+        for vector in vectors:
+            for term in vector.terms:
+                vocabulary.setdefault(term, len(vocabulary))
+        self.vocabulary = vocabulary
+        self.idf = idf_model.weights(list(vocabulary))
+
+        rows = []
+        for vector in vectors:
+            columns = np.fromiter((vocabulary[t] for t in vector.terms), dtype=np.intp, count=len(vector.terms))
+            values = np.fromiter(vector.terms.values(), dtype=np.float64, count=len(vector.terms)) * self.idf[columns]
+            norm = np.linalg.norm(values)
+            rows.append((columns, values / norm if norm else values))
+        self.tfidf = CSRMatrix.from_rows(rows, len(vocabulary))
+
+        skill_index = {skill: i for i, skill in enumerate(sorted(KNOWN_SKILLS))}
+        self.skill_index = skill_index
+        # Vectors stored before a KNOWN_SKILLS change may name retired skills
+        self.skills = [[s for s in vector.skills if s in skill_index] for vector in vectors]
+        self.skill_counts = np.array([len(s) for s in self.skills], dtype=np.float64)
+        self.skill_matrix = CSRMatrix.from_rows(
+            [([skill_index[s] for s in skills], [1.0] * len(skills)) for skills in self.skills],
+            len(skill_index),
+        )
+
+    def score(self, resume_text):
+        """
+        Score the resume against every application.
+
+        Returns:
+            dict: {
+                'application_ids': np.ndarray,
+                'similarity': np.ndarray (cosine),
+                'skill_coverage': np.ndarray (NaN where the job names no skills),
+                'score': np.ndarray (0-100),
+                'resume_terms': set
+            }
+        """
+        resume_counts = extract_terms(resume_text)
+
+        # Resume TF-IDF over the matrix vocabulary; the norm uses all resume terms
+        query = np.zeros(len(self.vocabulary), dtype=np.float64)
+        weights_all = np.log1p(np.fromiter(resume_counts.values(), dtype=np.float64, count=len(resume_counts)))
+        weights_all *= self.idf_model.weights(list(resume_counts))
+        norm = np.linalg.norm(weights_all)
+        for weight, term in zip(weights_all, resume_counts):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                query[column] = weight
+        if norm:
+            query /= norm
+
+        skills_vector = np.zeros(len(self.skill_index), dtype=np.float64)
+        for skill in extract_skills(resume_counts):
+            skills_vector[self.skill_index[skill]] = 1.0
+
+        similarity = self.tfidf.dot(query)
+        matched = self.skill_matrix.dot(skills_vector)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            coverage = np.where(self.skill_counts > 0, matched / self.skill_counts, np.nan)
+
+        scores = combine_scores(coverage, similarity)
+
+        return {
+            'application_ids': self.application_ids,
+            'similarity': similarity,
+            'skill_coverage': coverage,
+            'score': scores,
+            'resume_terms': set(resume_counts),
+        }
+
+
+_matrix_lock = threading.Lock()
+# user id -> UserTermMatrix, least recently used first
+_matrices = OrderedDict()
+
+
+def _matrix_version(user):
+    stats = JobTermVector.objects.filter(user=user).aggregate(count=Count('id'), updated=Max('updated_at'))
+    return (stats['count'], stats['updated'])
+
+
+def get_user_matrix(user):
+    """
+    Cached term matrix for a user, rebuilt when their vectors or the IDF model change.
+
+    Returns:
+        UserTermMatrix
+    """
+    backfill_term_vectors(user)
+    version = _matrix_version(user)
+    idf_model = get_idf_model()
+
+    with _matrix_lock:
+        matrix = _matrices.get(user.id)
+        if matrix is not None and matrix.version == version and matrix.idf_model is idf_model:
+            _matrices.move_to_end(user.id)
+            return matrix
+
+        vectors = list(JobTermVector.objects.filter(user=user).order_by('application_id'))
+        matrix = UserTermMatrix(vectors, idf_model, version)
+        _matrices[user.id] = matrix
+        _matrices.move_to_end(user.id)
+        while len(_matrices) > getattr(settings, 'RANKING_MATRIX_CACHE_SIZE', DEFAULT_MATRIX_CACHE_SIZE):
+            _matrices.popitem(last=False)
+    return matrix
+
+
+def invalidate_user_matrix(user_id):
+    """Forget a user's cached matrix"""
+    with _matrix_lock:
+        _matrices.pop(user_id, None)
+
+
+RANKING_ORDERINGS = {
+    'score': ('score', False),
+    '-score': ('score', True),
+    'similarity': ('similarity', False),
+    '-similarity': ('similarity', True),
+    'application_id': ('application_id', False),
+    '-application_id': ('application_id', True),
+}
+
+
+def rank_applications(user, resume_text, ordering='-score', application_ids=None):
+    """
+    Rank the user's applications against a resume.
+
+    Args:
+        user (User): Owner of the applications
+        resume_text (str): Resume to score
+        ordering (str): One of RANKING_ORDERINGS (default: best score first)
+        application_ids (iterable): Restrict to these applications (e.g. a status filter)
+
+    Returns:
+        tuple: (list of {'application_id', 'score', 'similarity', 'skill_coverage'} in order,
+                UserTermMatrix used, result of UserTermMatrix.score())
+    """
+    matrix = get_user_matrix(user)
+    if not len(matrix.application_ids):
+        return [], matrix, None
+
+    scored = matrix.score(resume_text)
+    keep = np.ones(len(matrix.application_ids), dtype=bool)
+    if application_ids is not None:
+        keep = np.isin(matrix.application_ids, np.fromiter(application_ids, dtype=np.int64))
+
+    field, descending = RANKING_ORDERINGS[ordering]
+    key = matrix.application_ids if field == 'application_id' else scored[field]
+    # Stable sort; ties keep the newest application first
+    order = np.lexsort((-matrix.application_ids, -key if descending else key))
+    order = order[keep[order]]
+
+    ranking = [
+        {
+            'application_id': int(matrix.application_ids[i]),
+            'score': int(scored['score'][i]),
+            'similarity': round(float(scored['similarity'][i]), 4),
+            'skill_coverage': None if np.isnan(scored['skill_coverage'][i]) else round(float(scored['skill_coverage'][i]), 4),
+            '_row': int(i),
+        }
+        for i in order
+    ]
+    return ranking, matrix, scored
+
+
+def skill_breakdown(matrix, row, resume_terms):
+    """
+    Matching and missing skills of one ranked application.
+
+    Returns:
+        tuple: (matching_skills, missing_skills)
+    """
+    skills = matrix.skills[row]
+    return [s for s in skills if s in resume_terms], [s for s in skills if s not in resume_terms]
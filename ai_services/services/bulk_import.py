@@ -0,0 +1,335 @@
+"""
+Bulk Job Import
+
+Imports a batch of job posting URLs (a user pasting 20-50 links) as
+JobApplication rows, streaming progress as each URL completes.
+
+- URLs are scraped and extracted concurrently in a thread pool, through
+  the same path as the scrape-job endpoint, shared scrape cache included
+  (scrape_cache.get_job_details).
+- A per-domain limiter keeps the import polite: at most
+  BULK_IMPORT_PER_DOMAIN_CONCURRENCY requests in flight per host, started
+  at least BULK_IMPORT_PER_DOMAIN_INTERVAL seconds apart. URLs are queued
+  round-robin across hosts, so a batch of links to one board doesn't hold
+  up the others.
+- Extracted jobs are written in small batches: companies are resolved for
+  the whole batch in one query (case-insensitive, like the application
+  serializer), missing ones bulk-created, then the applications
+  bulk-created. post_save is sent for each new application so the term
+  vector and skill indexes stay current.
+
+URLs the user already saved, and repeats within the batch, are reported
+as duplicates and not fetched. URLs are compared by their canonical form
+(scrape_cache.canonicalize_job_url), so tracking parameters, www., the
+scheme and the different URL shapes of one board posting don't matter.
+If the client disconnects, queued fetches are cancelled and in-flight
+ones finish without being saved.
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from applications.models import Company, JobApplication
+from .metrics import increment
+from .scrape_cache import canonicalize_job_url, get_job_details
+
+
+DEFAULT_MAX_URLS = 50
+DEFAULT_WORKERS = 8
+DEFAULT_PER_DOMAIN_CONCURRENCY = 2
+DEFAULT_PER_DOMAIN_INTERVAL = 1.0
+# Extracted jobs written per batch
+SAVE_BATCH_SIZE = 10
+MAX_URL_LENGTH = 500  # JobApplication.application_url
+
+
+def parse_urls(value):
+    """
+    Parse and validate the submitted URLs (list, or text with one URL per line).
+
+    Returns:
+        list: URLs in submission order, repeats included (stream_bulk_import
+              reports them as duplicates)
+
+    Raises:
+        ValueError: If no URL is given, one is invalid, or there are too many
+    """
+    if isinstance(value, str):
+        value = value.split()
+    urls = [u.strip() for u in (value or []) if u and u.strip()]
+    if not urls:
+        raise ValueError('urls is required')
+
+    max_urls = getattr(settings, 'BULK_IMPORT_MAX_URLS', DEFAULT_MAX_URLS)
+    if len(urls) > max_urls:
+        raise ValueError(f'Too many URLs: {len(urls)} (maximum {max_urls})')
+
+    for url in urls:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            raise ValueError(f'Invalid URL: {url}')
+        if len(url) > MAX_URL_LENGTH:
+            raise ValueError(f'URL too long (maximum {MAX_URL_LENGTH} characters): {url[:80]}...')
+    return urls
+
+
+class DomainRateLimiter:
+    """
+    Per-host politeness: bounded concurrency and a minimum interval
+    between request starts.
+    """
+
+    def __init__(self, concurrency, interval):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.concurrency))
+        self._next_start = defaultdict(float)
+
+    def acquire(self, host):
+        with self._lock:
+            semaphore = self._semaphores[host]
+        semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host):
+        with self._lock:
+            semaphore = self._semaphores[host]
+        semaphore.release()
+
+
+def interleave_by_host(urls):
+    """Order URLs round-robin across hosts (a, b, c, a, b, a, ...)"""
+    by_host = OrderedDict()
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+    ordered = []
+    while by_host:
+        for host in list(by_host):
+            ordered.append(by_host[host].pop(0))
+            if not by_host[host]:
+                del by_host[host]
+    return ordered
+
+
+def _url_key(url):
+    """Duplicate-detection key: the canonical URL, or the URL itself if it has none"""
+    return canonicalize_job_url(url) or url
+
+
+def find_duplicates(user, urls):
+    """
+    Split URLs into the ones to import and duplicates, by canonical URL.
+
+    Args:
+        user (User): Requesting user
+        urls (list): Output of parse_urls()
+
+    Returns:
+        tuple: (pending, duplicates): the first URL of each posting not
+               saved yet, and [(url, application_id)] for the rest, where
+               application_id is the user's saved application or None for
+               a repeat within the batch
+    """
+    keys = {url: _url_key(url) for url in urls}
+    existing = {}
+    saved = (
+        JobApplication.objects.filter(user=user).exclude(application_url__isnull=True)
+        .exclude(application_url='').order_by('id').values_list('application_url', 'id')
+    )
+    wanted = set(keys.values())
+    for application_url, application_id in saved.iterator():
+        key = _url_key(application_url)
+        if key in wanted:
+            existing.setdefault(key, application_id)
+
+    pending, duplicates, seen = [], [], set()
+    for url in urls:
+        key = keys[url]
+        if key in existing:
+            duplicates.append((url, existing[key]))
+        elif key in seen:
+            duplicates.append((url, None))
+        else:
+            seen.add(key)
+            pending.append(url)
+    return pending, duplicates
+
+
+def _fetch_job(url, limiter):
+    """Worker: scrape and extract one URL within its host's limits"""
+    host = urlparse(url).netloc.lower()
+    started = time.perf_counter()
+    limiter.acquire(host)
+    try:
+        details = get_job_details(url)
+    finally:
+        limiter.release(host)
+        # Pool threads outlive the request; don't leave their connections open
+        connection.close()
+    details['elapsed_ms'] = int((time.perf_counter() - started) * 1000)
+    return details
+
+
+def resolve_companies(names):
+    """
+    Get or create companies by name (case-insensitive) in one lookup.
+
+    Args:
+        names (iterable): Company names
+
+    Returns:
+        dict: lowercased name -> Company
+    """
+    wanted = OrderedDict((name.strip().lower(), name.strip()) for name in names if name and name.strip())
+
+    def lookup():
+        found = {}
+        queryset = Company.objects.annotate(name_lower=Lower('name')).filter(name_lower__in=list(wanted))
+        for company in queryset.order_by('id'):
+            found.setdefault(company.name_lower, company)
+        return found
+
+    companies = lookup()
+    missing = {key: Company(name=wanted[key][:255]) for key in wanted if key not in companies}
+    if missing:
+        Company.objects.bulk_create(missing.values())
+        if all(company.pk for company in missing.values()):
+            companies.update(missing)
+        else:
+            # Backends that don't return primary keys from bulk_create
+            companies = lookup()
+    return companies
+
+
+def save_imported_jobs(user, jobs, application_status='saved'):
+    """
+    Create JobApplication rows for extracted jobs, resolving companies in batch.
+
+    Args:
+        user (User): Owner of the applications
+        jobs (list): get_job_details() results
+        application_status (str): Status of the new applications
+
+    Returns:
+        list: Created JobApplication rows, in the order of jobs
+    """
+    def company_name(job):
+        return (job['company_name'] or '').strip() or 'Unknown'
+
+    today = timezone.localdate()
+    with transaction.atomic():
+        companies = resolve_companies(company_name(job) for job in jobs)
+        created = JobApplication.objects.bulk_create([
+            JobApplication(
+                user=user,
+                company=companies[company_name(job).lower()],
+                position=(job['position'] or 'Untitled position')[:255],
+                job_description=job['description'] or '',
+                application_url=job['job_url'],
+                location=(job['location'] or '')[:255] or None,
+                salary_range=(job['salary_range'] or '')[:100] or None,
+                status=application_status,
+                date_saved=today,
+            )
+            for job in jobs
+        ])
+    # bulk_create skips signals; the term vector and skill indexes listen to post_save
+    for application in created:
+        if application.pk is not None:
+            post_save.send(sender=JobApplication, instance=application, created=True, raw=False, using='default')
+    return created
+
+
+def stream_bulk_import(user, urls, application_status='saved'):
+    """
+    Import job URLs concurrently, yielding events as they happen.
+
+    Args:
+        user (User): Requesting user
+        urls (list): Output of parse_urls()
+        application_status (str): Status of the new applications
+
+    Yields:
+        dict: Events:
+            {'event': 'start', 'total': int, 'duplicates': int}
+            {'event': 'duplicate', 'url': str, 'application_id': int | None}
+            {'event': 'extracted', 'url': str, 'position': str, 'company_name': str,
+             'extraction': 'structured' | 'llm', 'cache': str, 'elapsed_ms': int}
+            {'event': 'created', 'url': str, 'application_id': int}
+            {'event': 'error', 'url': str, 'error': str}
+            {'event': 'complete', 'created': int, 'failed': int, 'duplicates': int, 'elapsed_ms': int}
+    """
+    started = time.perf_counter()
+    pending, duplicates = find_duplicates(user, urls)
+    counts = {'created': 0, 'failed': 0, 'duplicates': len(duplicates)}
+
+    increment('bulk_import.urls', len(urls))
+    yield {'event': 'start', 'total': len(urls), 'duplicates': len(duplicates)}
+    for url, application_id in duplicates:
+        yield {'event': 'duplicate', 'url': url, 'application_id': application_id}
+
+    limiter = DomainRateLimiter(
+        getattr(settings, 'BULK_IMPORT_PER_DOMAIN_CONCURRENCY', DEFAULT_PER_DOMAIN_CONCURRENCY),
+        getattr(settings, 'BULK_IMPORT_PER_DOMAIN_INTERVAL', DEFAULT_PER_DOMAIN_INTERVAL),
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(getattr(settings, 'BULK_IMPORT_WORKERS', DEFAULT_WORKERS), len(pending))),
+        thread_name_prefix='bulk-import',
+    )
+    try:
+        futures = {executor.submit(_fetch_job, url, limiter): url for url in interleave_by_host(pending)}
+        batch = []
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = futures.pop(future)
+                try:
+                    job = future.result()
+                except Exception as e:
+                    counts['failed'] += 1
+                    yield {'event': 'error', 'url': url, 'error': str(e)}
+                    continue
+                batch.append(job)
+                yield {
+                    'event': 'extracted',
+                    'url': url,
+                    'position': job['position'],
+                    'company_name': job['company_name'],
+                    'extraction': job['extraction'],
+                    'cache': job['cache']['status'],
+                    'elapsed_ms': job['elapsed_ms'],
+                }
+
+            if batch and (len(batch) >= SAVE_BATCH_SIZE or not futures):
+                try:
+                    created = save_imported_jobs(user, batch, application_status)
+                except Exception as e:
+                    counts['failed'] += len(batch)
+                    for job in batch:
+                        yield {'event': 'error', 'url': job['job_url'], 'error': f'Failed to save: {e}'}
+                else:
+                    counts['created'] += len(created)
+                    for job, application in zip(batch, created):
+                        yield {'event': 'created', 'url': job['job_url'], 'application_id': application.pk}
+                batch = []
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        increment('bulk_import.created', counts['created'])
+        increment('bulk_import.failed', counts['failed'])
+        increment('bulk_import.duplicates', counts['duplicates'])
+
+    yield {'event': 'complete', **counts, 'elapsed_ms': int((time.perf_counter() - started) * 1000)}
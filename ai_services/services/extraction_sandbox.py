@@ -0,0 +1,335 @@
+"""
+Extraction Sandbox
+
+Runs document parsing in a pool of pre-forked worker processes so a
+pathological PDF can't pin a web worker inside PyPDF2. Every document
+is bounded by:
+
+- a wall-clock timeout (EXTRACTION_SANDBOX_TIMEOUT seconds)
+- a resident memory cap (EXTRACTION_SANDBOX_MAX_RSS_MB, Linux only)
+- a page cutoff (EXTRACTION_SANDBOX_MAX_PAGES)
+
+Workers stream pages back as they are extracted, so the result of a
+document that hits the timeout or memory cap reports how far it got
+(pages_extracted / page_count). A worker that is killed is replaced
+immediately.
+
+Result statuses:
+    ok            - full document extracted
+    truncated     - stopped at the page cutoff; resume_parser.extract_text
+                    returns it as PartialText, which the text cache skips
+    timeout       - wall-clock limit hit
+    memory_limit  - RSS cap hit
+    error         - parser failed or the worker crashed
+
+extract_text_sandboxed() returns the text read so far for every status,
+but resume_parser.extract_text only uses ok and truncated results
+(COMPLETE_STATUSES) and raises ExtractionLimitError for the others.
+"""
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+from . import metrics
+
+
+STATUS_OK = 'ok'
+STATUS_TRUNCATED = 'truncated'
+STATUS_TIMEOUT = 'timeout'
+STATUS_MEMORY_LIMIT = 'memory_limit'
+STATUS_ERROR = 'error'
+
+# Statuses whose text is usable: all of it (ok) or the first pages (truncated)
+COMPLETE_STATUSES = [STATUS_OK, STATUS_TRUNCATED]
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_RSS_MB = 512
+DEFAULT_MAX_PAGES = 50
+
+# How often the parent checks the worker's memory while waiting for pages
+POLL_INTERVAL = 0.05
+
+
+class ExtractionLimitError(Exception):
+    """Raised when a sandboxed extraction doesn't finish within its limits"""
+
+    def __init__(self, result):
+        self.result = result
+        super().__init__(describe_result(result))
+
+
+def get_extraction_mode():
+    """'inprocess' (default) or 'sandbox', from DOCUMENT_EXTRACTION_MODE"""
+    return getattr(settings, 'DOCUMENT_EXTRACTION_MODE', 'inprocess')
+
+
+def _rss_bytes(pid):
+    """Current resident set size of a process, or None if unavailable"""
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _worker_loop(conn):
+    """
+    Worker process entry point. Receives (data, file_ext, max_pages) jobs and
+    replies with a stream of messages:
+        ('page_count', int), ('page', str)..., then ('done', None) or ('error', str)
+    """
+    import PyPDF2
+    from .resume_parser import extract_text_from_buffer
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+
+        data, file_ext, max_pages = job
+        try:
+            if file_ext == '.pdf':
+                reader = PyPDF2.PdfReader(io.BytesIO(data))
+                conn.send(('page_count', len(reader.pages)))
+                for index, page in enumerate(reader.pages):
+                    if index >= max_pages:
+                        break
+                    conn.send(('page', page.extract_text() or ''))
+            else:
+                conn.send(('page_count', 1))
+                conn.send(('page', extract_text_from_buffer(data, file_ext)))
+            conn.send(('done', None))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(timeout=1)
+        finally:
+            self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """
+    Fixed-size pool of pre-forked extraction workers.
+    Callers block until a worker is free (bounded by the document timeout).
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS):
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(method)
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self.size = size
+        for _ in range(size):
+            self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self._context)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        metrics.increment('extraction_sandbox.workers_replaced')
+        self._add_worker()
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def extract(self, data, file_ext, timeout, max_pages, max_rss_bytes):
+        """
+        Extract text from raw document bytes inside a worker.
+
+        Returns:
+            dict: See extract_text_sandboxed()
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        pages = []
+        page_count = None
+
+        def result(status, detail=''):
+            metrics.increment(f'extraction_sandbox.{status}')
+            return {
+                'status': status,
+                'text': '\n\n'.join(page for page in pages if page).strip(),
+                'pages_extracted': len(pages),
+                'page_count': page_count,
+                'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+                'detail': detail,
+            }
+
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return result(STATUS_TIMEOUT, 'No extraction worker became available')
+
+        healthy = True
+        next_memory_check = started
+        try:
+            worker.conn.send((bytes(data), file_ext, max_pages))
+
+            while True:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    healthy = False
+                    return result(STATUS_TIMEOUT, f'Extraction exceeded {timeout}s')
+
+                if max_rss_bytes and now >= next_memory_check:
+                    next_memory_check = now + POLL_INTERVAL
+                    rss = _rss_bytes(worker.process.pid)
+                    if rss is not None and rss > max_rss_bytes:
+                        healthy = False
+                        return result(STATUS_MEMORY_LIMIT, f'Extraction exceeded {max_rss_bytes // (1024 * 1024)}MB')
+
+                if worker.conn.poll(min(remaining, POLL_INTERVAL)):
+                    kind, value = worker.conn.recv()
+                    if kind == 'page_count':
+                        page_count = value
+                    elif kind == 'page':
+                        pages.append(value)
+                    elif kind == 'error':
+                        return result(STATUS_ERROR, value)
+                    elif kind == 'done':
+                        if page_count is not None and len(pages) < page_count:
+                            return result(STATUS_TRUNCATED, f'Stopped at the {max_pages}-page limit')
+                        return result(STATUS_OK)
+                elif not worker.process.is_alive():
+                    healthy = False
+                    return result(STATUS_ERROR, 'Extraction worker crashed')
+        except (EOFError, OSError) as e:
+            healthy = False
+            return result(STATUS_ERROR, f'Extraction worker failed: {e}')
+        finally:
+            if healthy:
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+
+
+_sandbox = None
+_sandbox_pid = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox():
+    """
+    Get the process-wide sandbox, forking its workers on first use.
+    Recreated after a fork so pre-forking servers don't share pipes.
+    """
+    global _sandbox, _sandbox_pid
+
+    with _sandbox_lock:
+        if _sandbox is None or _sandbox_pid != os.getpid():
+            _sandbox = ExtractionSandbox(
+                size=getattr(settings, 'EXTRACTION_SANDBOX_WORKERS', DEFAULT_WORKERS)
+            )
+            _sandbox_pid = os.getpid()
+        return _sandbox
+
+
+def shutdown_sandbox():
+    """Stop all sandbox workers (restarted lazily on next use)"""
+    global _sandbox, _sandbox_pid
+
+    with _sandbox_lock:
+        if _sandbox is not None and _sandbox_pid == os.getpid():
+            _sandbox.shutdown()
+        _sandbox = None
+        _sandbox_pid = None
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source.read()
+
+
+def extract_text_sandboxed(source, file_ext, timeout=None, max_pages=None, max_rss_mb=None):
+    """
+    Extract text from a document inside the sandbox worker pool.
+
+    Args:
+        source: bytes, memoryview, Django UploadedFile, or binary file-like
+        file_ext (str): File extension used to pick the parser (e.g. '.pdf')
+        timeout (float): Wall-clock limit in seconds (default: EXTRACTION_SANDBOX_TIMEOUT)
+        max_pages (int): Page cutoff for PDFs (default: EXTRACTION_SANDBOX_MAX_PAGES)
+        max_rss_mb (int): Worker memory cap in MB (default: EXTRACTION_SANDBOX_MAX_RSS_MB)
+
+    Returns:
+        dict: {
+            'status': str - ok / truncated / timeout / memory_limit / error,
+            'text': str - Extracted text (partial for timeout / memory_limit),
+            'pages_extracted': int,
+            'page_count': int | None - Total pages, if the worker got that far,
+            'elapsed_ms': float,
+            'detail': str - Human-readable reason for non-ok statuses
+        }
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'EXTRACTION_SANDBOX_TIMEOUT', DEFAULT_TIMEOUT)
+    if max_pages is None:
+        max_pages = getattr(settings, 'EXTRACTION_SANDBOX_MAX_PAGES', DEFAULT_MAX_PAGES)
+    if max_rss_mb is None:
+        max_rss_mb = getattr(settings, 'EXTRACTION_SANDBOX_MAX_RSS_MB', DEFAULT_MAX_RSS_MB)
+
+    return get_sandbox().extract(
+        _read_bytes(source),
+        file_ext.lower(),
+        timeout=timeout,
+        max_pages=max_pages,
+        max_rss_bytes=max_rss_mb * 1024 * 1024,
+    )
+
+
+def describe_result(result):
+    """One-line, user-facing description of a sandbox result"""
+    if result['status'] in COMPLETE_STATUSES and not result['detail']:
+        return 'Extraction complete'
+
+    progress = f"{result['pages_extracted']} of {result['page_count']} pages read" \
+        if result['page_count'] is not None else 'no pages read'
+    return f"{result['detail']} ({progress})"
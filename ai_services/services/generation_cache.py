@@ -0,0 +1,250 @@
+"""
+Generation Cache
+
+Reuses AI outputs for identical reruns. The cache key is a SHA-256 over:
+- the normalized resume text and job description
+- the generation type
+- the model, temperature and prompt version (from GENERATION_SETTINGS)
+
+Each generation type has a policy:
+- 'default': reuse automatically unless the request sends reuse_cached=false
+  (match_score: the same inputs should give the same score)
+- 'opt_in': reuse only when the request sends reuse_cached=true
+  (creative outputs, where a rerun usually means "give me another version")
+
+Every fresh output is stored, so an opt-in rerun can hit it later.
+Hits are replayed through the same streaming response as a live generation.
+"""
+import hashlib
+import unicodedata
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from ..models import AIGeneration, GenerationCacheEntry
+from . import metrics
+from .openai_service import get_generation_settings
+
+
+POLICY_DEFAULT = 'default'
+POLICY_OPT_IN = 'opt_in'
+
+DEFAULT_POLICIES = {
+    'match_score': {'reuse': POLICY_DEFAULT, 'ttl_hours': 24 * 7},
+    'tailored_resume': {'reuse': POLICY_OPT_IN, 'ttl_hours': 24},
+    'cover_letter': {'reuse': POLICY_OPT_IN, 'ttl_hours': 24},
+    'interview_prep': {'reuse': POLICY_OPT_IN, 'ttl_hours': 24 * 3},
+}
+
+# Replayed outputs are streamed in slices of this many characters
+REPLAY_CHUNK_SIZE = 256
+
+
+def get_policy(generation_type):
+    """
+    Get the cache policy for a generation type (GENERATION_CACHE_POLICIES overrides).
+
+    Returns:
+        dict: {'reuse': 'default' | 'opt_in', 'ttl_hours': int}
+    """
+    overrides = getattr(settings, 'GENERATION_CACHE_POLICIES', {})
+    return {**DEFAULT_POLICIES[generation_type], **overrides.get(generation_type, {})}
+
+
+def parse_reuse_flag(value):
+    """
+    Parse the reuse_cached request field.
+
+    Returns:
+        bool | None: True / False if given, None if absent
+    """
+    if value is None or value == '':
+        return None
+    return str(value).lower() in ['true', '1', 'yes']
+
+
+def should_reuse(generation_type, requested):
+    """
+    Decide whether a cached output may be served.
+
+    Args:
+        generation_type (str): AIGeneration.generation_type
+        requested (bool | None): Parsed reuse_cached flag
+
+    Returns:
+        bool
+    """
+    if not getattr(settings, 'GENERATION_CACHE_ENABLED', True):
+        return False
+    if get_policy(generation_type)['reuse'] == POLICY_DEFAULT:
+        return requested is not False
+    return requested is True
+
+
+def normalize_text(text):
+    """Normalize input text so cosmetic differences don't miss the cache"""
+    text = unicodedata.normalize('NFKC', text or '')
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def build_cache_key(generation_type, resume_text, job_description):
+    """
+    Build the cache key for a generation.
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    config = get_generation_settings(generation_type)
+    digest = hashlib.sha256()
+    for part in [
+        generation_type,
+        config['model'],
+        repr(float(config['temperature'])),
+        str(config['prompt_version']),
+        hashlib.sha256(normalize_text(resume_text).encode('utf-8')).hexdigest(),
+        hashlib.sha256(normalize_text(job_description).encode('utf-8')).hexdigest(),
+    ]:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def get_cached_output(cache_key):
+    """
+    Look up a live (non-expired) cached output.
+
+    Returns:
+        str | None: Cached output text
+    """
+    entry = GenerationCacheEntry.objects.filter(
+        cache_key=cache_key, expires_at__gt=timezone.now()
+    ).first()
+    if entry is None:
+        return None
+
+    GenerationCacheEntry.objects.filter(id=entry.id).update(hit_count=F('hit_count') + 1)
+    return entry.output_text
+
+
+def store_output(cache_key, generation_type, output_text):
+    """
+    Store (or refresh) a generated output under its cache key.
+    Best-effort: a failed write must not fail a generation that already streamed.
+    """
+    if not output_text.strip():
+        return
+
+    config = get_generation_settings(generation_type)
+    ttl = timedelta(hours=get_policy(generation_type)['ttl_hours'])
+    try:
+        GenerationCacheEntry.objects.update_or_create(
+            cache_key=cache_key,
+            defaults={
+                'generation_type': generation_type,
+                'output_text': output_text,
+                'model_used': config['model'],
+                'temperature': config['temperature'],
+                'prompt_version': config['prompt_version'],
+                'expires_at': timezone.now() + ttl,
+            },
+        )
+    except Exception:
+        metrics.increment('generation_cache.store_errors')
+
+
+def replay(output_text):
+    """Yield a cached output in slices, like a live stream"""
+    for start in range(0, len(output_text), REPLAY_CHUNK_SIZE):
+        yield output_text[start:start + REPLAY_CHUNK_SIZE]
+
+
+def cached_stream(generation_type, resume_text, job_description, stream_factory, reuse=None, info=None):
+    """
+    Stream a generation, serving it from the cache when the policy allows.
+
+    Args:
+        generation_type (str): AIGeneration.generation_type
+        resume_text (str): Resume text used for the generation
+        job_description (str): Job description used for the generation
+        stream_factory (callable): Zero-argument function returning the live chunk iterator
+        reuse (bool | None): Parsed reuse_cached flag from the request
+        info (dict): Filled with {'cache_hit': bool} for the caller
+
+    Yields:
+        str: Output chunks
+    """
+    info = info if info is not None else {}
+    info['cache_hit'] = False
+    cache_key = build_cache_key(generation_type, resume_text, job_description)
+
+    if should_reuse(generation_type, reuse):
+        cached = get_cached_output(cache_key)
+        if cached is not None:
+            info['cache_hit'] = True
+            metrics.increment('generation_cache.hits')
+            yield from replay(cached)
+            return
+        metrics.increment('generation_cache.misses')
+
+    chunks = []
+    for chunk in stream_factory():
+        chunks.append(chunk)
+        yield chunk
+
+    store_output(cache_key, generation_type, ''.join(chunks))
+
+
+async def acached_stream(generation_type, resume_text, job_description, stream_factory, reuse=None, info=None):
+    """Async variant of cached_stream() for the ASGI streaming views"""
+    from asgiref.sync import sync_to_async
+
+    info = info if info is not None else {}
+    info['cache_hit'] = False
+    cache_key = build_cache_key(generation_type, resume_text, job_description)
+
+    if should_reuse(generation_type, reuse):
+        cached = await sync_to_async(get_cached_output)(cache_key)
+        if cached is not None:
+            info['cache_hit'] = True
+            metrics.increment('generation_cache.hits')
+            for chunk in replay(cached):
+                yield chunk
+            return
+        metrics.increment('generation_cache.misses')
+
+    chunks = []
+    async for chunk in stream_factory():
+        chunks.append(chunk)
+        yield chunk
+
+    await sync_to_async(store_output)(cache_key, generation_type, ''.join(chunks))
+
+
+def get_generation_cache_stats():
+    """
+    Get cache counters for this process and the stored hit ratio per type.
+
+    Returns:
+        dict: {
+            'hits': int, 'misses': int (this process),
+            'stored_entries': int,
+            'hit_ratio_by_type': {generation_type: float (0-1)}
+        }
+    """
+    by_type = AIGeneration.objects.values('generation_type').annotate(
+        total=Count('id'),
+        hits=Count('id', filter=Q(cache_hit=True)),
+    )
+
+    return {
+        'hits': metrics.get_counter('generation_cache.hits'),
+        'misses': metrics.get_counter('generation_cache.misses'),
+        'stored_entries': GenerationCacheEntry.objects.filter(expires_at__gt=timezone.now()).count(),
+        'hit_ratio_by_type': {
+            row['generation_type']: round(row['hits'] / row['total'], 4)
+            for row in by_type if row['total']
+        },
+    }
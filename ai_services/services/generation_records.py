@@ -0,0 +1,131 @@
+"""
+Generation Records
+
+Builds and saves the AIGeneration row for a finished generation.
+Shared by the sync and async streaming views so every generation is
+stored the same way (model, prompt version, cache hit, token usage).
+
+The streaming views use record_generation(): the row is queued for the
+write-behind writer (generation_writer.py) and written off the response
+path. save_generation() writes it now, for callers that need its id.
+"""
+import logging
+
+from ..models import AIGeneration
+from .generation_writer import submit_generation, write_behind_enabled
+from .metrics import increment
+from .openai_service import get_generation_settings
+from .token_usage import empty_usage
+
+
+logger = logging.getLogger(__name__)
+
+# Stored copies of the inputs are truncated to this many characters
+MAX_STORED_INPUT_CHARS = 5000
+
+
+def build_generation(user, generation_type, resume_text, job_description, output_text,
+                     application_id=None, cache_hit=False, usage=None):
+    """
+    Build an (unsaved) AIGeneration for a finished generation.
+
+    Args:
+        user (User): Requesting user
+        generation_type (str): AIGeneration.generation_type
+        resume_text (str): Resume text used for the generation
+        job_description (str): Job description used for the generation
+        output_text (str): Generated text
+        application_id (int): Linked JobApplication (optional)
+        cache_hit (bool): Output was replayed from the generation cache
+        usage (dict): Token usage filled by the streaming function (empty on cache hits)
+
+    Returns:
+        AIGeneration: Unsaved instance
+    """
+    usage = usage or empty_usage()
+    config = get_generation_settings(generation_type)
+
+    return AIGeneration(
+        user=user,
+        application_id=application_id or None,
+        generation_type=generation_type,
+        input_resume=resume_text[:MAX_STORED_INPUT_CHARS],
+        job_description=job_description[:MAX_STORED_INPUT_CHARS],
+        output_text=output_text,
+        model_used=config['model'],
+        prompt_version=config['prompt_version'],
+        tokens_used=usage['prompt_tokens'] + usage['completion_tokens'],
+        prompt_tokens=usage['prompt_tokens'],
+        completion_tokens=usage['completion_tokens'],
+        cached_tokens=usage['cached_tokens'],
+        input_tokens_saved=usage.get('input_tokens_saved'),
+        tokens_estimated=usage['estimated'],
+        first_token_ms=usage.get('first_token_ms'),
+        cache_hit=cache_hit,
+    )
+
+
+def save_generation(**fields):
+    """
+    Save a finished generation. Never raises: a failed save must not
+    break the response that was already streamed. It is logged and
+    counted as a lost record (generation_writer.lost).
+
+    Args:
+        **fields: Arguments of build_generation()
+
+    Returns:
+        AIGeneration | None: Saved instance, None if saving failed
+    """
+    try:
+        generation = build_generation(**fields)
+        generation.save()
+        return generation
+    except Exception:
+        increment('generation_writer.lost')
+        logger.exception("Could not save a generation record")
+        return None
+
+
+async def asave_generation(**fields):
+    """Async variant of save_generation() for the ASGI streaming views"""
+    try:
+        generation = build_generation(**fields)
+        await generation.asave()
+        return generation
+    except Exception:
+        increment('generation_writer.lost')
+        logger.exception("Could not save a generation record")
+        return None
+
+
+def _queue_generation(fields):
+    try:
+        submit_generation(build_generation(**fields))
+    except Exception as e:
+        increment('generation_writer.lost')
+        logger.error("Could not queue a generation record: %s", e)
+
+
+def record_generation(**fields):
+    """
+    Persist a finished generation off the response path: queued for the
+    write-behind writer, or saved now when GENERATION_WRITE_BEHIND is off.
+    Never raises.
+
+    Args:
+        **fields: Arguments of build_generation()
+    """
+    if write_behind_enabled():
+        _queue_generation(fields)
+    else:
+        save_generation(**fields)
+
+
+async def arecord_generation(**fields):
+    """Async variant of record_generation() for the ASGI streaming views"""
+    if write_behind_enabled():
+        # Only a queue put: safe to call from the event loop
+        _queue_generation(fields)
+    else:
+        await asave_generation(**fields)
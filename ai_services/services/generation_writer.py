@@ -0,0 +1,352 @@
+"""
+Generation Writer
+
+Write-behind persistence for AIGeneration rows. The streaming views hand
+each finished generation to a process-wide writer instead of running an
+INSERT inside the response iterator:
+
+- Records go into a bounded in-memory queue. One background thread drains
+  it and writes everything that queued up while the previous batch was
+  being written, up to GENERATION_WRITER_BATCH_SIZE rows per bulk_create.
+- A failed batch is retried GENERATION_WRITER_RETRIES times with backoff,
+  then written row by row: rows the database rejects (e.g. their
+  application was deleted in the meantime) or that can't be converted to
+  column values are dropped and counted as lost, the rest are spooled.
+  A rejected row doesn't count as a failed attempt: the batch goes row by
+  row straight away.
+- The spool is one JSONL file per process in GENERATION_WRITER_SPOOL_DIR,
+  fsynced on every write. Records are also spooled when the queue is full
+  and when the process exits with records still queued. The writer thread
+  replays the spool files of its own process, and of processes that are
+  gone, whenever it is idle (at least once a minute). Delivery is at least
+  once: a crash between writing a replayed file and deleting it writes its
+  rows twice.
+
+Rows keep the created_at of the moment the generation finished, however
+late they are written.
+
+Counters (metrics.py):
+    generation_writer.queued / written / batches / retries
+    generation_writer.spooled / replayed / lost
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DataError, IntegrityError, close_old_connections, connection
+
+from ..models import AIGeneration
+from .metrics import get_counter_group, increment
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_QUEUE = 1000
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled on each attempt
+IDLE_POLL_INTERVAL = 1.0
+SPOOL_REPLAY_INTERVAL = 60
+SHUTDOWN_TIMEOUT = 5
+# Spool files: generations-<pid>.jsonl, claimed for replay as generations-<pid>.replaying
+SPOOL_PREFIX = 'generations-'
+# Errors caused by a row's values rather than the database being unavailable
+# (ValueError/TypeError/ValidationError: a value that can't be converted for its column)
+REJECTED_ROW_ERRORS = (IntegrityError, DataError, ValueError, TypeError, ValidationError)
+
+
+def write_behind_enabled():
+    return getattr(settings, 'GENERATION_WRITE_BEHIND', True)
+
+
+def _record_fields():
+    return [field for field in AIGeneration._meta.concrete_fields if not field.primary_key]
+
+
+def to_record(generation):
+    """Column values of an unsaved AIGeneration, as a JSON-serializable dict"""
+    return {field.attname: field.value_from_object(generation) for field in _record_fields()}
+
+
+def from_record(record):
+    """Unsaved AIGeneration from a to_record() dict read back from JSON"""
+    return AIGeneration(**{
+        field.attname: field.to_python(record[field.attname])
+        for field in _record_fields() if field.attname in record
+    })
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class GenerationWriter:
+    """
+    Bounded queue of unsaved AIGeneration rows and the thread writing them.
+    Created per process by get_writer().
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, max_queue=DEFAULT_MAX_QUEUE,
+                 retries=DEFAULT_RETRIES, spool_dir=None):
+        self.batch_size = batch_size
+        self.retries = retries
+        self.spool_dir = Path(spool_dir or Path(settings.BASE_DIR) / '.cache' / 'generations')
+        self.pid = os.getpid()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spool_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='generation-writer')
+        self._thread.start()
+
+    def submit(self, generation):
+        """Queue an unsaved generation (spooled to disk if the queue is full or the writer stopped)"""
+        if self._stopping.is_set():
+            self._spool([generation])
+            return
+        try:
+            self._queue.put_nowait(generation)
+            increment('generation_writer.queued')
+        except queue.Full:
+            self._spool([generation])
+
+    def pending(self):
+        """Rows queued and not yet written"""
+        return self._queue.qsize()
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Write what is queued (for up to timeout seconds), spool the rest"""
+        if self.pid != os.getpid():
+            # Inherited through a fork: the thread and queue belong to the parent
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            self._spool(leftover)
+
+    def _run(self):
+        next_replay = 0.0
+        try:
+            while not (self._stopping.is_set() and self._queue.empty()):
+                try:
+                    batch = self._next_batch()
+                    if batch:
+                        self._write(batch)
+                    elif time.monotonic() >= next_replay and not self._stopping.is_set():
+                        next_replay = time.monotonic() + SPOOL_REPLAY_INTERVAL
+                        self._replay_spool()
+                except Exception:
+                    logger.exception("Generation writer error")
+        finally:
+            connection.close()
+
+    def _next_batch(self):
+        """The next queued row (waiting up to IDLE_POLL_INTERVAL) and whatever queued up behind it"""
+        try:
+            batch = [self._queue.get(timeout=IDLE_POLL_INTERVAL)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """
+        Write a batch with bulk_create, retrying with backoff; if it still
+        fails, write it row by row.
+
+        Returns:
+            bool: False if rows had to be spooled
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                if self._stopping.is_set():
+                    break
+                increment('generation_writer.retries')
+                time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            # Drops a connection broken by the previous attempt
+            close_old_connections()
+            try:
+                AIGeneration.objects.bulk_create(batch)
+                increment('generation_writer.batches')
+                increment('generation_writer.written', len(batch))
+                return True
+            except REJECTED_ROW_ERRORS:
+                # Retrying won't help: find the rows that are rejected
+                break
+            except Exception as e:
+                logger.warning("Writing %d generation records failed (attempt %d): %s", len(batch), attempt + 1, e)
+        return self._write_rows(batch)
+
+    def _write_rows(self, batch):
+        """Write rows one at a time: drop the ones the database rejects, spool the rest"""
+        for index, generation in enumerate(batch):
+            close_old_connections()
+            try:
+                AIGeneration.objects.bulk_create([generation])
+                increment('generation_writer.written')
+            except REJECTED_ROW_ERRORS as e:
+                increment('generation_writer.lost')
+                logger.error("Dropping a rejected generation record: %s", e)
+            except Exception:
+                # The database is unavailable, not this row
+                self._spool(batch[index:])
+                return False
+        return True
+
+    def _spool_path(self):
+        return self.spool_dir / f'{SPOOL_PREFIX}{os.getpid()}.jsonl'
+
+    def _spool(self, generations):
+        """Append rows to this process's spool file; counted as lost if that fails"""
+        lines = ''.join(json.dumps(to_record(generation), cls=DjangoJSONEncoder) + '\n' for generation in generations)
+        try:
+            with self._spool_lock:
+                self.spool_dir.mkdir(parents=True, exist_ok=True)
+                with open(self._spool_path(), 'a', encoding='utf-8') as spool:
+                    spool.write(lines)
+                    spool.flush()
+                    os.fsync(spool.fileno())
+            increment('generation_writer.spooled', len(generations))
+        except OSError as e:
+            increment('generation_writer.lost', len(generations))
+            logger.error("Could not spool %d generation records: %s", len(generations), e)
+
+    def spool_files(self):
+        """Spool files waiting to be replayed (any process)"""
+        if not self.spool_dir.is_dir():
+            return []
+        return sorted(self.spool_dir.glob(f'{SPOOL_PREFIX}*'))
+
+    def _replay_spool(self):
+        """Write back the spooled rows of this process and of processes that exited"""
+        for path in self.spool_files():
+            owner, _, suffix = path.name[len(SPOOL_PREFIX):].partition('.')
+            if not owner.isdigit():
+                continue
+            owner = int(owner)
+            if owner == os.getpid():
+                if suffix != 'jsonl':
+                    continue
+            elif _pid_alive(owner):
+                continue
+
+            claimed = self.spool_dir / f'{SPOOL_PREFIX}{os.getpid()}.replaying'
+            with self._spool_lock:
+                try:
+                    path.rename(claimed)
+                except OSError:
+                    # Claimed by another process first
+                    continue
+            if not self._replay_file(claimed):
+                # The database is still unavailable; try again later
+                break
+
+    def _replay_file(self, path):
+        """
+        Write the rows of a claimed spool file, then delete it. Rows that
+        can't be written go back to this process's spool.
+
+        Returns:
+            bool: False if the database was unavailable
+        """
+        generations = []
+        with open(path, encoding='utf-8') as spool:
+            for line in spool:
+                try:
+                    generations.append(from_record(json.loads(line)))
+                except (ValueError, TypeError, ValidationError) as e:
+                    # A line cut short by a crash
+                    increment('generation_writer.lost')
+                    logger.error("Skipping an unreadable spooled generation record: %s", e)
+        increment('generation_writer.replayed', len(generations))
+
+        written = True
+        for start in range(0, len(generations), self.batch_size):
+            if not written:
+                self._spool(generations[start:])
+                break
+            written = self._write(generations[start:start + self.batch_size])
+        path.unlink()
+        return written
+
+
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """
+    Get the process-wide writer, starting its thread on first use.
+    Recreated after a fork (threads don't survive one).
+    """
+    global _writer, _writer_pid
+
+    with _writer_lock:
+        if _writer is None or _writer_pid != os.getpid():
+            _writer = GenerationWriter(
+                batch_size=getattr(settings, 'GENERATION_WRITER_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+                max_queue=getattr(settings, 'GENERATION_WRITER_MAX_QUEUE', DEFAULT_MAX_QUEUE),
+                retries=getattr(settings, 'GENERATION_WRITER_RETRIES', DEFAULT_RETRIES),
+                spool_dir=getattr(settings, 'GENERATION_WRITER_SPOOL_DIR', None),
+            )
+            _writer_pid = os.getpid()
+        return _writer
+
+
+def shutdown_writer(timeout=SHUTDOWN_TIMEOUT):
+    """Flush and stop the writer (restarted lazily on next use)"""
+    global _writer, _writer_pid
+
+    with _writer_lock:
+        if _writer is not None and _writer_pid == os.getpid():
+            _writer.stop(timeout)
+        _writer = None
+        _writer_pid = None
+
+
+# Queued rows are written (or spooled) when the worker process exits
+atexit.register(shutdown_writer)
+
+
+def submit_generation(generation):
+    """Queue an unsaved AIGeneration for the write-behind writer"""
+    get_writer().submit(generation)
+
+
+def get_writer_stats():
+    """
+    Write-behind counters plus the current backlog.
+
+    Returns:
+        dict: generation_writer counters, 'pending' (queued rows in this
+              process) and 'spool_files' (files waiting to be replayed)
+    """
+    stats = get_counter_group('generation_writer')
+    writer = _writer if _writer_pid == os.getpid() else None
+    stats['pending'] = writer.pending() if writer else 0
+    stats['spool_files'] = len(writer.spool_files()) if writer else 0
+    return stats
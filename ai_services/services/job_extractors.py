@@ -0,0 +1,359 @@
+"""
+Job Page Extractors
+
+Registry of per-site extractors for the lxml parsing path of the job
+scraper. Each extractor is a class with XPath selectors per field (title,
+company, description), tried in order with the first match winning;
+the selectors are compiled once per process, on first use.
+
+- Lookup is by host suffix: "acme.wd5.myworkdayjobs.com" tries the
+  registered hosts "acme.wd5.myworkdayjobs.com", "wd5.myworkdayjobs.com",
+  "myworkdayjobs.com", ... (one dict lookup per label). Unknown hosts get
+  the generic extractor.
+- Fields an extractor leaves empty are filled by its fallback extractor
+  (the generic one unless it says otherwise), so a site-specific
+  extractor only needs to know where its own pages differ.
+
+Adding a site:
+
+    @register
+    class AcmeJobsExtractor(JobExtractor):
+        name = 'acmejobs'
+        hosts = ('jobs.acme.com',)
+        selectors = {
+            'title': ["//h1[@class='posting-title']"],
+            'company': [],
+            'description': ["//section[@id='posting']"],
+        }
+
+then add a saved page to fixtures/job_pages (manifest.json) and check it
+with the benchmark_extractors command.
+
+The first selector of each field should be a single step ("//tag[...]",
+optionally ending in "/@attribute"): the scraper can then stop downloading
+as soon as those elements have been received (job_scraper.ExtractionWatcher).
+"""
+import re
+
+try:
+    from lxml import etree
+except ImportError:  # optional; without lxml pages go through the BeautifulSoup extractors
+    etree = None
+
+
+FIELDS = ('title', 'company', 'description')
+# Field -> separator between text nodes (as in Tag.get_text(separator=...))
+FIELD_SEPARATORS = {'title': '', 'company': '', 'description': '\n'}
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+
+def has_class(name):
+    """XPath predicate: the element's class attribute contains the class name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _element_strings(element):
+    """Text nodes of an element in document order, like Tag._all_strings()"""
+    walker = etree.iterwalk(element, events=('start', 'end'))
+    for event, node in walker:
+        if event == 'start':
+            if not isinstance(node.tag, str) or node.tag in NON_TEXT_TAGS:
+                walker.skip_subtree()
+            elif node.text:
+                yield node.text
+        elif node is not element and node.tail:
+            yield node.tail
+
+
+def element_text(element, separator=''):
+    """Equivalent of Tag.get_text(separator=separator, strip=True)"""
+    return separator.join(text.strip() for text in _element_strings(element) if text.strip())
+
+
+def node_text(node, separator=''):
+    """Text of a selector match: an element, or an attribute value"""
+    if isinstance(node, str):
+        return ' '.join(node.split())
+    return element_text(node, separator)
+
+
+def _single_step(query):
+    """
+    The query as a test on one element ("//div[...]" -> "self::div[...]"),
+    or None if it spans several steps.
+    """
+    if not query.startswith('//'):
+        return None
+    step, depth = query[2:], 0
+    for index, character in enumerate(step):
+        if character == '[':
+            depth += 1
+        elif character == ']':
+            depth -= 1
+        elif character == '/' and depth == 0:
+            # Only a trailing attribute step keeps it a test on the element itself
+            if not re.fullmatch(r'/@[\w-]+', step[index:]):
+                return None
+            break
+    return 'self::' + step
+
+
+class JobExtractor:
+    """
+    Base extractor: XPath selectors per field.
+
+    Attributes:
+        name (str): Registry name, reported as the page's 'extractor'
+        hosts (tuple): Host suffixes served by this extractor
+        selectors (dict): field -> XPath queries, first match wins
+        fallback (str | None): Extractor filling the fields this one leaves empty
+    """
+    name = None
+    hosts = ()
+    selectors = {'title': [], 'company': [], 'description': []}
+    fallback = 'generic'
+
+    def __init__(self):
+        self._compiled = None
+        self._watch_tests = None
+
+    @property
+    def compiled(self):
+        """field -> [etree.XPath returning the first match], built on first use"""
+        if self._compiled is None:
+            self._compiled = {
+                field: [etree.XPath(f'({query})[1]') for query in self.selectors.get(field, [])]
+                for field in FIELDS
+            }
+        return self._compiled
+
+    @property
+    def watch_tests(self):
+        """
+        field -> etree.XPath testing one element against the field's first
+        selector, or None for a field whose first selector can't be tested
+        that way. Fields without selectors are left out.
+        """
+        if self._watch_tests is None:
+            tests = {}
+            for field in FIELDS:
+                queries = self.selectors.get(field, [])
+                if queries:
+                    test = _single_step(queries[0])
+                    tests[field] = etree.XPath(test) if test else None
+            self._watch_tests = tests
+        return self._watch_tests
+
+    def clean(self, field, value):
+        """Site-specific cleanup of an extracted value"""
+        return value
+
+    def first_match(self, root, field):
+        for query in self.compiled[field]:
+            found = query(root)
+            if found:
+                return found[0]
+        return None
+
+    def extract(self, root):
+        """
+        Extract the fields from a parsed page.
+
+        Args:
+            root (lxml.html.HtmlElement): Document root
+
+        Returns:
+            dict: {'title': str, 'company': str, 'description': str}
+        """
+        result = {}
+        for field in FIELDS:
+            node = self.first_match(root, field)
+            value = node_text(node, FIELD_SEPARATORS[field]) if node is not None else ''
+            result[field] = self.clean(field, value) if value else ''
+        return result
+
+
+class ExtractorRegistry:
+    """Extractors by name and by host suffix"""
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_host = {}
+
+    def register(self, extractor_class):
+        """Class decorator: add an extractor (an existing name or host is replaced)"""
+        extractor = extractor_class()
+        self._by_name[extractor.name] = extractor
+        for host in extractor.hosts:
+            self._by_host[host.lower()] = extractor
+        return extractor_class
+
+    def get(self, name):
+        return self._by_name[name]
+
+    def names(self):
+        return list(self._by_name)
+
+    def for_host(self, host):
+        """
+        Extractor for a host: the longest registered suffix, else generic.
+
+        Returns:
+            JobExtractor
+        """
+        labels = (host or '').lower().rstrip('.').split('.')
+        for start in range(len(labels) - 1):
+            extractor = self._by_host.get('.'.join(labels[start:]))
+            if extractor is not None:
+                return extractor
+        return self._by_name['generic']
+
+    def cascade(self, extractor):
+        """The extractor followed by its fallbacks"""
+        chain = [extractor]
+        while chain[-1].fallback and chain[-1].fallback != chain[-1].name:
+            fallback = self._by_name[chain[-1].fallback]
+            if fallback in chain:
+                break
+            chain.append(fallback)
+        return chain
+
+    def extract(self, root, extractor):
+        """
+        Run an extractor and its fallback cascade on a parsed page.
+
+        Returns:
+            dict: {'title': str, 'company': str, 'description': str}
+        """
+        chain = self.cascade(extractor)
+        result = chain[0].extract(root)
+        for fallback in chain[1:]:
+            if all(result.values()):
+                break
+            more = fallback.extract(root)
+            result = {field: result[field] or more[field] for field in FIELDS}
+        return result
+
+
+registry = ExtractorRegistry()
+register = registry.register
+
+
+def get_extractor(host):
+    """Extractor registered for a host (the generic one if none is)"""
+    return registry.for_host(host)
+
+
+@register
+class GenericExtractor(JobExtractor):
+    """Unknown sites: common title and description containers, else all paragraphs"""
+    name = 'generic'
+    fallback = None
+    selectors = {
+        'title': ["//h1", "//title"],
+        'company': [],
+        'description': [
+            f"//div[{has_class('job-description')}]",
+            f"//div[{has_class('description')}]",
+            f"//div[{has_class('job-details')}]",
+            "//div[@id='job-description']",
+            "//div[@id='description']",
+        ],
+    }
+
+    def extract(self, root):
+        result = super().extract(root)
+        # No known description container: all paragraphs
+        if not result['description']:
+            paragraphs = (element_text(p) for p in root.iter('p'))
+            result['description'] = '\n\n'.join(text for text in paragraphs if text)
+        return result
+
+
+@register
+class LinkedInExtractor(JobExtractor):
+    name = 'linkedin'
+    hosts = ('linkedin.com',)
+    selectors = {
+        'title': [f"//h1[{has_class('top-card-layout__title')}]", "//h1"],
+        'company': [f"//a[{has_class('topcard__org-name-link')}]", f"//span[{has_class('topcard__flavor')}]"],
+        'description': [f"//div[{has_class('description__text')}]", f"//div[{has_class('show-more-less-html__markup')}]"],
+    }
+
+
+@register
+class IndeedExtractor(JobExtractor):
+    name = 'indeed'
+    hosts = ('indeed.com',)
+    selectors = {
+        'title': [f"//h1[{has_class('jobsearch-JobInfoHeader-title')}]"],
+        'company': ["//div[@data-company-name]"],
+        'description': ["//div[@id='jobDescriptionText']"],
+    }
+
+
+@register
+class GlassdoorExtractor(JobExtractor):
+    name = 'glassdoor'
+    hosts = ('glassdoor.com',)
+    selectors = {
+        'title': ["//div[@data-test='jobTitle']", "//h1"],
+        'company': ["//div[@data-test='employerName']"],
+        'description': [f"//div[{has_class('jobDescriptionContent')}]", "//div[@data-test='jobDescription']"],
+    }
+
+
+@register
+class GreenhouseExtractor(JobExtractor):
+    """Greenhouse job boards: classic (boards.) and current (job-boards.) layouts"""
+    name = 'greenhouse'
+    hosts = ('greenhouse.io',)
+    selectors = {
+        'title': [f"//h1[{has_class('app-title')}]", f"//div[{has_class('job__title')}]//h1"],
+        'company': [f"//span[{has_class('company-name')}]", "//meta[@property='og:site_name']/@content"],
+        'description': ["//div[@id='content']", f"//div[{has_class('job__description')}]"],
+    }
+
+    def clean(self, field, value):
+        # Classic boards print "at Initech"
+        if field == 'company' and value.lower().startswith('at '):
+            return value[3:].strip()
+        return value
+
+
+@register
+class LeverExtractor(JobExtractor):
+    name = 'lever'
+    hosts = ('lever.co',)
+    selectors = {
+        'title': [f"//h2[parent::div[{has_class('posting-headline')}]]", "//h2"],
+        'company': [f"//img[ancestor::div[{has_class('main-header-logo')}]]/@alt"],
+        'description': [
+            # The page header is a section-wrapper too
+            f"//div[{has_class('section-wrapper')} and {has_class('page-full-width')} and not({has_class('main-header')})]",
+            "//div[@data-qa='job-description']",
+        ],
+    }
+
+    def clean(self, field, value):
+        # The company is the header logo's alt text, "Acme logo"
+        if field == 'company' and value.lower().endswith(' logo'):
+            return value[:-5].strip()
+        return value
+
+
+@register
+class WorkdayExtractor(JobExtractor):
+    """Workday career sites (<tenant>.wd<N>.myworkdayjobs.com)"""
+    name = 'workday'
+    hosts = ('myworkdayjobs.com', 'myworkdaysite.com')
+    selectors = {
+        'title': ["//h2[@data-automation-id='jobPostingHeader']", "//meta[@property='og:title']/@content"],
+        'company': ["//meta[@property='og:site_name']/@content"],
+        'description': [
+            "//div[@data-automation-id='jobPostingDescription']",
+            "//meta[@property='og:description']/@content",
+        ],
+    }
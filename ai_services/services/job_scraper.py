@@ -3,11 +3,35 @@ Job Scraper Service
 
 Scrapes job descriptions from various job posting websites.
 Handles common job boards and company career pages.
+
+Pages are fetched through the shared scraper HTTP client (pooled
+connections, retries, conditional-GET cache), see scraper_http.py. The
+download is streamed and ends once the page's title, company and
+description elements have been received (ExtractionWatcher).
 """
+import html
+import json
+import re
+import time
+
 import requests
 from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+from django.conf import settings
 from urllib.parse import urlparse
 
+from .job_extractors import FIELDS, element_text, get_extractor, node_text, registry
+from .metrics import get_counter, increment
+from .openai_service import extract_job_details_from_html
+from .scraper_http import fetch
+from .text_normalization import clean_text
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # optional; pages are parsed with BeautifulSoup's html.parser
+    etree = lxml_html = None
+
 
 def scrape_job_description(url, timeout=10):
     """
@@ -21,35 +45,33 @@ def scrape_job_description(url, timeout=10):
         dict: {
             'description': str - Extracted job description text,
             'title': str - Job title (if found),
-            'company': str - Company name (if found)
+            'company': str - Company name (if found),
+            'structured': dict - Embedded JobPosting / OpenGraph details (see extract_structured_metadata),
+            'from_cache': bool - Page was unchanged (304) and read from the HTTP cache,
+            'timings': dict - Milliseconds per phase (dns/connect/tls/ttfb/download/parse);
+                total_ms is the time to extract,
+            'download': dict - Bytes read and saved, and why reading stopped (see FetchResult)
         }
     
     Raises:
         Exception: If scraping fails
     """
     try:
-        # Set user agent to avoid being blocked
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        watcher = None
+        if early_stop_enabled():
+            watcher = ExtractionWatcher(url, wait_for_json_ld=structured_fast_path_enabled())
+        page = fetch(url, timeout=timeout, stop_reading=watcher.feed if watcher else None)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        started = time.perf_counter()
+        result = parse_job_page(page.content, url)
         
-        # Detect website and use appropriate scraper
-        domain = urlparse(url).netloc.lower()
-        
-        if 'linkedin.com' in domain:
-            return _scrape_linkedin(soup)
-        elif 'indeed.com' in domain:
-            return _scrape_indeed(soup)
-        elif 'glassdoor.com' in domain:
-            return _scrape_glassdoor(soup)
-        else:
-            # Generic scraper for other sites
-            return _scrape_generic(soup)
+        timings = dict(page.timings)
+        timings['parse_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        timings['total_ms'] = round(timings['total_ms'] + timings['parse_ms'], 2)
+        result['from_cache'] = page.from_cache
+        result['timings'] = timings
+        result['download'] = page.download
+        return result
     
     except requests.RequestException as e:
         raise Exception(f"Failed to fetch URL: {str(e)}")
@@ -57,6 +79,447 @@ def scrape_job_description(url, timeout=10):
         raise Exception(f"Error scraping job description: {str(e)}")
 
 
+def scrape_job_details(job_url):
+    """
+    Scrape a job URL and extract the fields of a job application.
+    Uses the page's JobPosting metadata when it is complete, otherwise
+    the LLM extractor.
+
+    Args:
+        job_url (str): URL of the job posting
+
+    Returns:
+        dict: {
+            'job_url', 'company_name', 'position', 'location', 'salary_range',
+            'description', 'tracking_info': str,
+            'extraction': 'structured' | 'llm',
+            'fetch': {'from_cache': bool, 'timings': dict, 'download': dict}
+        }
+
+    Raises:
+        Exception: If scraping or extraction fails
+    """
+    scraped = scrape_job_description(job_url)
+    raw_description = scraped.get('description', '') or ''
+    cleaned_description = clean_job_description(raw_description)
+    structured = scraped.get('structured') or {}
+
+    if structured.get('confident') and structured_fast_path_enabled():
+        # The page embeds a complete schema.org JobPosting: no LLM round trip
+        record_extraction('structured')
+        ai_result = structured
+        extraction = 'structured'
+    else:
+        combined_content = (
+            f"Title: {scraped.get('title', '')}\n"
+            f"Company: {scraped.get('company', '')}\n"
+            f"URL: {job_url}\n"
+            f"Description:\n{cleaned_description}"
+        )
+
+        ai_result = extract_job_details_from_html(combined_content)
+        record_extraction('llm')
+        extraction = 'llm'
+
+    return {
+        'job_url': job_url,
+        'company_name': ai_result.get('company_name') or structured.get('company_name') or scraped.get('company') or '',
+        'position': ai_result.get('position') or structured.get('position') or scraped.get('title') or '',
+        'location': ai_result.get('location') or structured.get('location') or '',
+        'salary_range': ai_result.get('salary_range') or structured.get('salary_range') or '',
+        'description': clean_job_description(ai_result.get('description') or '') or cleaned_description,
+        # Add tracking info (link or instructions)
+        'tracking_info': ai_result.get('tracking_info') or f'Track your application at: {job_url}',
+        'extraction': extraction,
+        'fetch': {
+            'from_cache': scraped.get('from_cache', False),
+            'timings': scraped.get('timings', {}),
+            'download': scraped.get('download', {}),
+        },
+    }
+
+
+def get_html_parser():
+    """
+    Parser for scraped pages (SCRAPER_HTML_PARSER setting).
+
+    Returns:
+        str: 'lxml' (targeted XPath extraction, the default when lxml is
+             installed) or 'html.parser' (full BeautifulSoup tree)
+    """
+    parser = getattr(settings, 'SCRAPER_HTML_PARSER', 'lxml')
+    if parser == 'lxml' and lxml_html is None:
+        return 'html.parser'
+    return parser
+
+
+def parse_job_page(content, url, parser=None):
+    """
+    Extract title, company and description from a fetched job page,
+    plus any structured job metadata the page embeds.
+
+    Args:
+        content (bytes): Page body
+        url (str): Page URL (selects the site extractor)
+        parser (str): 'lxml' or 'html.parser' (default: get_html_parser())
+
+    Returns:
+        dict: {'description': str, 'title': str, 'company': str,
+               'extractor': str - Site extractor used,
+               'structured': dict (see extract_structured_metadata)}
+    """
+    extractor = get_extractor(urlparse(url).hostname)
+    if (parser or get_html_parser()) == 'lxml':
+        root = _parse_lxml(content)
+        result = registry.extract(root, extractor)
+        result['extractor'] = extractor.name
+        result['structured'] = extract_structured_metadata(
+            root.xpath("//script[@type='application/ld+json']/text()"),
+            _meta_tags(
+                (m.get('property') or m.get('name'), m.get('content'))
+                for m in root.xpath('//meta[@content][@property or @name]')
+            ),
+        )
+        return result
+
+    soup = BeautifulSoup(content, 'html.parser')
+    # Sites without a BeautifulSoup extractor get the generic one
+    site = extractor.name if extractor.name in SOUP_EXTRACTORS else 'generic'
+    result = SOUP_EXTRACTORS[site](soup)
+    if site != 'generic' and not all(result[field] for field in FIELDS):
+        # Same fallback cascade as the lxml extractors
+        generic = _scrape_generic(soup)
+        result = {field: result[field] or generic[field] for field in FIELDS}
+    result['extractor'] = site
+    result['structured'] = extract_structured_metadata(
+        [tag.string or '' for tag in soup.find_all('script', type='application/ld+json')],
+        _meta_tags(
+            (m.get('property') or m.get('name'), m.get('content'))
+            for m in soup.find_all('meta', content=True)
+        ),
+    )
+    return result
+
+
+# --- Structured metadata ---------------------------------------------------
+#
+# Career sites built for search engines embed a schema.org JobPosting as
+# JSON-LD (title, hiringOrganization, jobLocation, baseSalary, ...) and
+# OpenGraph tags. When the JobPosting has the required fields, the scrape
+# endpoint uses it directly instead of asking the LLM to extract them.
+
+STRUCTURED_REQUIRED_FIELDS = ('position', 'company_name', 'description')
+# Shorter JobPosting descriptions are usually teasers, not the posting
+MIN_STRUCTURED_DESCRIPTION_CHARS = 200
+
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'INR': '₹', 'JPY': '¥'}
+SALARY_UNITS = {'HOUR': 'hour', 'DAY': 'day', 'WEEK': 'week', 'MONTH': 'month', 'YEAR': 'year'}
+
+
+def _meta_tags(pairs):
+    """Lowercased meta property/name -> first content"""
+    tags = {}
+    for name, content in pairs:
+        if name and content and name.lower() not in tags:
+            tags[name.lower()] = content.strip()
+    return tags
+
+
+def _iter_json_ld(value):
+    """All objects in a JSON-LD document (top level, lists and @graph)"""
+    if isinstance(value, list):
+        for item in value:
+            yield from _iter_json_ld(item)
+    elif isinstance(value, dict):
+        yield value
+        if '@graph' in value:
+            yield from _iter_json_ld(value['@graph'])
+
+
+def _find_job_posting(blocks):
+    for block in blocks:
+        try:
+            document = json.loads(block.strip())
+        except (ValueError, AttributeError):
+            continue
+        for item in _iter_json_ld(document):
+            types = item.get('@type')
+            if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+                return item
+    return None
+
+
+def _name_of(value):
+    """A schema.org Thing's name (or the value itself when it's a string)"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name')
+    return value.strip() if isinstance(value, str) else ''
+
+
+def html_to_text(markup):
+    """Plain text of an HTML fragment (JobPosting descriptions are HTML, sometimes escaped twice)"""
+    markup = markup or ''
+    if '&lt;' in markup and '<' not in markup:
+        markup = html.unescape(markup)
+    if lxml_html is not None:
+        try:
+            return element_text(lxml_html.fragment_fromstring(markup, create_parent='div'), separator='\n')
+        except etree.ParserError:
+            return ''
+    return BeautifulSoup(markup, 'html.parser').get_text(separator='\n', strip=True)
+
+
+def _format_location(posting):
+    places = posting.get('jobLocation') or []
+    if isinstance(places, dict):
+        places = [places]
+
+    locations = []
+    for place in places:
+        address = place.get('address') if isinstance(place, dict) else place
+        if isinstance(address, str):
+            parts = [address.strip()]
+        elif isinstance(address, dict):
+            parts = [
+                _name_of(address.get(field))
+                for field in ('addressLocality', 'addressRegion', 'addressCountry')
+            ]
+        else:
+            parts = []
+        location = ', '.join(part for part in parts if part)
+        if location and location not in locations:
+            locations.append(location)
+
+    if posting.get('jobLocationType') == 'TELECOMMUTE':
+        region = _name_of(posting.get('applicantLocationRequirements'))
+        locations.insert(0, f'Remote ({region})' if region else 'Remote')
+    return '; '.join(locations)
+
+
+def _format_amount(amount):
+    amount = float(amount)
+    return f'{amount:,.0f}' if amount.is_integer() else f'{amount:,.2f}'
+
+
+def _format_salary(posting):
+    salary = posting.get('baseSalary') or posting.get('estimatedSalary')
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if not isinstance(salary, dict):
+        return str(salary).strip() if isinstance(salary, (str, int, float)) and salary else ''
+
+    currency = salary.get('currency') or posting.get('salaryCurrency') or ''
+    value = salary.get('value', salary)
+    unit = ''
+    try:
+        if isinstance(value, dict):
+            unit = SALARY_UNITS.get(str(value.get('unitText', '')).upper(), '')
+            low, high = value.get('minValue'), value.get('maxValue')
+            if low is None and high is None:
+                low = value.get('value')
+            amounts = [_format_amount(v) for v in (low, high) if v not in (None, '')]
+        else:
+            amounts = [_format_amount(value)]
+    except (TypeError, ValueError):
+        return ''
+    if not amounts:
+        return ''
+
+    symbol = CURRENCY_SYMBOLS.get(currency.upper(), '')
+    text = '-'.join(f'{symbol}{amount}' for amount in dict.fromkeys(amounts))
+    if currency and not symbol:
+        text = f'{text} {currency}'
+    return f'{text} per {unit}' if unit else text
+
+
+def extract_structured_metadata(json_ld_blocks, meta_tags):
+    """
+    Job details from a page's JSON-LD JobPosting, with OpenGraph as fallback.
+
+    Args:
+        json_ld_blocks (list): Contents of <script type="application/ld+json"> tags
+        meta_tags (dict): Lowercased meta property/name -> content
+
+    Returns:
+        dict: {
+            'source': 'json-ld' | 'opengraph' | None,
+            'position', 'company_name', 'location', 'salary_range', 'description': str,
+            'date_posted', 'employment_type': str,
+            'confident': bool - JSON-LD provided every required field
+                (position, company and a full description), so no LLM pass is needed
+        }
+    """
+    posting = _find_job_posting(json_ld_blocks) or {}
+    employment_type = posting.get('employmentType') or ''
+    if isinstance(employment_type, list):
+        employment_type = ', '.join(str(t) for t in employment_type)
+
+    structured = {
+        'source': 'json-ld' if posting else None,
+        'position': _name_of(posting.get('title')),
+        'company_name': _name_of(posting.get('hiringOrganization')),
+        'location': _format_location(posting) if posting else '',
+        'salary_range': _format_salary(posting) if posting else '',
+        'description': html_to_text(posting.get('description')) if isinstance(posting.get('description'), str) else '',
+        'date_posted': str(posting.get('datePosted') or ''),
+        'employment_type': str(employment_type),
+    }
+    structured['confident'] = bool(
+        posting
+        and all(structured[field] for field in STRUCTURED_REQUIRED_FIELDS)
+        and len(structured['description']) >= MIN_STRUCTURED_DESCRIPTION_CHARS
+    )
+
+    # OpenGraph only fills gaps: og:site_name is often the job board, not the employer
+    if not structured['position'] and meta_tags.get('og:title'):
+        structured['position'] = meta_tags['og:title']
+        structured['source'] = structured['source'] or 'opengraph'
+    if not structured['description'] and meta_tags.get('og:description'):
+        structured['description'] = meta_tags['og:description']
+        structured['source'] = structured['source'] or 'opengraph'
+    return structured
+
+
+def structured_fast_path_enabled():
+    """SCRAPER_STRUCTURED_FAST_PATH: skip the LLM extractor when JSON-LD is complete"""
+    return getattr(settings, 'SCRAPER_STRUCTURED_FAST_PATH', True)
+
+
+def record_extraction(method):
+    """
+    Count how a scraped job's details were extracted.
+
+    Args:
+        method (str): 'structured' (LLM skipped) or 'llm'
+    """
+    increment(f'job_extraction.{method}')
+
+
+def get_extraction_stats():
+    """
+    LLM-skip rate of the scrape endpoint.
+
+    Returns:
+        dict: {'structured': int, 'llm': int, 'llm_skip_rate': float}
+    """
+    structured = get_counter('job_extraction.structured')
+    llm = get_counter('job_extraction.llm')
+    total = structured + llm
+    return {
+        'structured': structured,
+        'llm': llm,
+        'llm_skip_rate': round(structured / total, 4) if total else 0.0,
+    }
+
+
+# --- lxml path -------------------------------------------------------------
+#
+# libxml2 builds the document in C and the site extractors (job_extractors.py)
+# only evaluate precompiled XPath queries for the few nodes they need, so no
+# Python object tree of the whole page is ever created. For the sites the
+# BeautifulSoup path knows, the queries mirror its extractors further down
+# (same order, first match wins) and the text is joined the same way as
+# Tag.get_text().
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def _parse_lxml(content):
+    """Parse page bytes into an lxml document (encoding detected like BeautifulSoup does)"""
+    markup = UnicodeDammit(content, is_html=True).unicode_markup or ''
+    # lxml rejects str input that carries its own encoding declaration
+    markup = XML_DECLARATION.sub('', markup)
+    if not markup.strip():
+        return lxml_html.document_fromstring('<html></html>')
+    return lxml_html.document_fromstring(markup, parser=lxml_html.HTMLParser(no_network=True))
+
+
+def early_stop_enabled():
+    """Whether downloads may end once the extracted elements are complete (SCRAPER_EARLY_STOP)"""
+    return getattr(settings, 'SCRAPER_EARLY_STOP', True) and get_html_parser() == 'lxml'
+
+
+class ExtractionWatcher:
+    """
+    Incremental parse of a page as it downloads, to tell when the rest of
+    it is no longer needed.
+
+    For each field the extractor will pick the first element, in document
+    order, matching the field's first selector. Once that element has been
+    opened and closed, with some text, for every field with selectors,
+    parsing the bytes read so far gives the same title, company and
+    description as the whole page, so feed() returns True and the download
+    can stop.
+
+    Pages where that can't be known never stop early: a first selector that
+    isn't a single step, an empty first match (the fallback cascade would
+    look further), generic pages without a description container (the
+    paragraph fallback).
+
+    With wait_for_json_ld (the structured fast path is on), the download
+    also runs until a JSON-LD script holding a JobPosting has been read,
+    so a posting placed after the description (at the end of <body>) still
+    skips the LLM. Pages without one are read to the end.
+    """
+
+    def __init__(self, url, wait_for_json_ld=False):
+        # field -> the field's first selector, as a test on one element
+        self.pending = dict(get_extractor(urlparse(url).hostname).watch_tests)
+        self.open = {}
+        self.json_ld_pending = wait_for_json_ld
+        self.done = False
+        if None in self.pending.values():
+            self.parser = None
+        else:
+            self.parser = etree.HTMLPullParser(events=('start', 'end'), no_network=True)
+
+    def feed(self, chunk):
+        """
+        Parse the next chunk of the page.
+
+        Returns:
+            bool: True once every watched element is complete
+        """
+        if self.done or self.parser is None:
+            return self.done
+        try:
+            self.parser.feed(chunk)
+            for event, element in self.parser.read_events():
+                if event == 'start':
+                    for field, test in self.pending.items():
+                        if field not in self.open and test(element):
+                            self.open[field] = element
+                else:
+                    if self.json_ld_pending and _is_job_posting_script(element):
+                        self.json_ld_pending = False
+                    for field in [f for f, opened in self.open.items() if opened is element]:
+                        if not node_text(self.pending[field](element)[0]):
+                            # Empty: the extractor will look further than this element
+                            self.parser = None
+                            return False
+                        del self.pending[field]
+                        del self.open[field]
+        except Exception:
+            # Unparseable as a stream: read the whole page
+            self.parser = None
+            return False
+        self.done = not self.pending and not self.json_ld_pending
+        return self.done
+
+
+def _is_job_posting_script(element):
+    """A complete <script type="application/ld+json"> element holding a JobPosting"""
+    return (
+        element.tag == 'script'
+        and (element.get('type') or '').strip().lower() == 'application/ld+json'
+        and _find_job_posting([element.text or '']) is not None
+    )
+
+
+# --- BeautifulSoup path ----------------------------------------------------
+
 def _scrape_linkedin(soup):
     """Scrape LinkedIn job postings"""
     result = {
@@ -171,21 +634,24 @@ def _scrape_generic(soup):
     return result
 
 
+SOUP_EXTRACTORS = {
+    'linkedin': _scrape_linkedin,
+    'indeed': _scrape_indeed,
+    'glassdoor': _scrape_glassdoor,
+    'generic': _scrape_generic,
+}
+
+
 def clean_job_description(raw_text):
     """
-    Clean up scraped job description text.
-    Removes extra whitespace, special characters, etc.
-    
+    Clean up scraped job description text: text_normalization's clean_text()
+    (whitespace, repeated lines and boilerplate). Line breaks are kept so
+    bullet lists and sections survive into storage and prompts.
+
     Args:
         raw_text (str): Raw scraped text
-    
+
     Returns:
         str: Cleaned text
     """
-    # Remove multiple newlines
-    cleaned = '\n'.join(line.strip() for line in raw_text.splitlines() if line.strip())
-    
-    # Remove excessive whitespace
-    cleaned = ' '.join(cleaned.split())
-    
-    return cleaned
+    return clean_text(raw_text)
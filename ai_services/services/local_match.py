@@ -0,0 +1,352 @@
+"""
+Local Match Engine
+
+Deterministic resume <-> job description scoring without the LLM.
+Runs in milliseconds, so it can rank or pre-screen before paying for
+the detailed match_score report.
+
+Score (0-100) combines:
+- skill coverage: share of the job's known skills found in the resume
+- TF-IDF cosine similarity of the two texts (unigrams + bigrams,
+  sublinear tf), vectorized with NumPy
+
+Job descriptions are normalized first (text_normalization.clean_text):
+EEO, legal and benefits boilerplate would otherwise surface "employer"
+or "hiring" among the missing terms.
+
+IDF weights come from the job descriptions stored on JobApplication
+rows (the closest corpus we have to "all job postings"), normalized like
+the job side of every score, and cached per process. Requests never wait
+for a full build: a process starts from the newest IDF_WARM_DOCS
+descriptions and builds the full model (LOCAL_MATCH_IDF_MAX_DOCS) in a
+background thread; every LOCAL_MATCH_IDF_TTL seconds it is rebuilt the
+same way while the old model keeps serving.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from .text_normalization import clean_text
+
+
+logger = logging.getLogger(__name__)
+
+# Descriptions in a process's first IDF model, built inline
+IDF_WARM_DOCS = 1000
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not now of
+off on once only or other our ours out over own per same she should so some such than that the their
+theirs them then there these they this those through to too under until up very via was we were what
+when where which while who whom why will with within would you your yours
+ability able across apply candidate candidates company environment excellent experience experienced
+including job join looking must new opportunity plus position preferred related required requirements
+responsibilities role strong team teams using work working year years
+""".split())
+
+# Common skills, matched as whole terms (multi-word skills as bigrams).
+# Skill coverage only counts these; other terms still feed TF-IDF.
+KNOWN_SKILLS = frozenset("""
+python java javascript typescript go golang rust ruby php c++ c# scala kotlin swift sql nosql bash
+django flask fastapi spring rails node.js react angular vue next.js redux graphql rest grpc html css sass
+postgresql mysql sqlite mongodb redis elasticsearch kafka rabbitmq celery spark hadoop airflow dbt snowflake
+aws azure gcp docker kubernetes terraform ansible jenkins linux git ci/cd microservices serverless
+pandas numpy scikit-learn tensorflow pytorch tableau excel jira figma agile scrum
+""".split()) | frozenset([
+    'machine learning', 'deep learning', 'data analysis', 'data engineering', 'data science',
+    'project management', 'product management', 'unit testing', 'system design', 'power bi',
+    'google cloud', 'computer vision', 'natural language',
+])
+
+# Score weights (tuned with the benchmark_match_agreement command)
+SKILL_WEIGHT = 0.6
+SIMILARITY_WEIGHT = 0.4
+# Cosine similarities of real resume/JD pairs rarely exceed this; scaled to 1.0
+SIMILARITY_CEILING = 0.5
+
+MAX_TERMS = 15
+
+
+def tokenize(text):
+    """
+    Lowercase word tokens, keeping tech spellings (c++, c#, node.js, ci/cd).
+
+    Returns:
+        list: Tokens with stopwords removed
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or '').lower().replace('ci/cd', 'ci-cd')):
+        token = token.rstrip('.-')
+        if token == 'ci-cd':
+            token = 'ci/cd'
+        if token and token not in STOPWORDS and not token.isdigit():
+            tokens.append(token)
+    return tokens
+
+
+def extract_terms(text):
+    """
+    Unigram and bigram term counts of a text.
+
+    Returns:
+        Counter: term -> count
+    """
+    tokens = tokenize(text)
+    terms = Counter(tokens)
+    terms.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms
+
+
+def extract_job_terms(job_description):
+    """
+    Term counts of a job description after normalization (repeats and
+    boilerplate dropped). Only the rule-based boilerplate is removed, not
+    the learned fingerprints: the terms then depend on the text alone, as
+    the stored term vectors (batch_ranking.py) keyed by its hash require.
+
+    Returns:
+        Counter: term -> count
+    """
+    return extract_terms(clean_text(job_description, fingerprints=frozenset()))
+
+
+def extract_skills(terms):
+    """Known skills present in a term Counter"""
+    return {term for term in terms if term in KNOWN_SKILLS}
+
+
+class IDFModel:
+    """Document frequencies over a corpus of job descriptions"""
+
+    def __init__(self, documents=()):
+        self.document_count = 0
+        self.document_frequency = Counter()
+        for document in documents:
+            self.add(document)
+
+    def add(self, text):
+        self.document_count += 1
+        self.document_frequency.update(set(extract_job_terms(text)))
+
+    def weights(self, terms):
+        """
+        Smoothed IDF weight per term.
+
+        Args:
+            terms (list): Terms, in vector order
+
+        Returns:
+            np.ndarray: idf = ln((1 + N) / (1 + df)) + 1
+        """
+        df = np.fromiter((self.document_frequency.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        return np.log((1.0 + self.document_count) / (1.0 + df)) + 1.0
+
+
+_idf_lock = threading.Lock()
+# generation: bumped by reset_idf_model() so an older background build isn't installed
+_idf_cache = {'model': None, 'built_at': 0.0, 'rebuilding': False, 'generation': 0}
+
+
+def build_idf_model(limit=None):
+    """Build an IDF model from the stored job descriptions"""
+    from applications.models import JobApplication
+
+    limit = limit or getattr(settings, 'LOCAL_MATCH_IDF_MAX_DOCS', 20000)
+    descriptions = (
+        JobApplication.objects.exclude(job_description__isnull=True).exclude(job_description='')
+        .order_by('-id').values_list('job_description', flat=True)[:limit]
+    )
+    return IDFModel(descriptions.iterator())
+
+
+def _rebuild_idf_model(generation):
+    """Background thread: build the full model and swap it in"""
+    try:
+        model = build_idf_model()
+        with _idf_lock:
+            if _idf_cache['generation'] == generation:
+                _idf_cache['model'] = model
+                _idf_cache['built_at'] = time.monotonic()
+    except Exception:
+        logger.exception("Rebuilding the IDF model failed")
+    finally:
+        with _idf_lock:
+            if _idf_cache['generation'] == generation:
+                _idf_cache['rebuilding'] = False
+        connection.close()
+
+
+def _start_rebuild():
+    """Start a background rebuild unless one is running (call with _idf_lock held)"""
+    if not _idf_cache['rebuilding']:
+        _idf_cache['rebuilding'] = True
+        threading.Thread(
+            target=_rebuild_idf_model, args=(_idf_cache['generation'],), daemon=True, name='idf-rebuild',
+        ).start()
+
+
+def get_idf_model():
+    """
+    Process-wide IDF model. The first call builds a quick one from the
+    newest IDF_WARM_DOCS descriptions; the full model, and the rebuild
+    after LOCAL_MATCH_IDF_TTL seconds, are built in the background.
+    """
+    ttl = getattr(settings, 'LOCAL_MATCH_IDF_TTL', 3600)
+    model = _idf_cache['model']
+    if model is not None and time.monotonic() - _idf_cache['built_at'] <= ttl:
+        return model
+
+    with _idf_lock:
+        if _idf_cache['model'] is None:
+            warm_docs = min(IDF_WARM_DOCS, getattr(settings, 'LOCAL_MATCH_IDF_MAX_DOCS', 20000))
+            _idf_cache['model'] = build_idf_model(limit=warm_docs)
+            _idf_cache['built_at'] = time.monotonic()
+            if _idf_cache['model'].document_count < warm_docs:
+                # That was the whole corpus
+                return _idf_cache['model']
+        elif time.monotonic() - _idf_cache['built_at'] <= ttl:
+            return _idf_cache['model']
+        _start_rebuild()
+        return _idf_cache['model']
+
+
+def reset_idf_model():
+    """Drop the cached IDF model (rebuilt on next use)"""
+    with _idf_lock:
+        _idf_cache['model'] = None
+        _idf_cache['rebuilding'] = False
+        _idf_cache['generation'] += 1
+
+
+def tfidf_vectors(term_counts, idf_model):
+    """
+    L2-normalized TF-IDF vectors for several term Counters over their shared vocabulary.
+
+    Returns:
+        tuple: (vocabulary list, np.ndarray of shape (len(term_counts), len(vocabulary)))
+    """
+    vocabulary = sorted(set().union(*term_counts))
+    index = {term: i for i, term in enumerate(vocabulary)}
+    matrix = np.zeros((len(term_counts), len(vocabulary)), dtype=np.float64)
+    for row, counts in enumerate(term_counts):
+        if counts:
+            columns = np.fromiter((index[t] for t in counts), dtype=np.intp, count=len(counts))
+            matrix[row, columns] = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+    # Sublinear tf, then idf
+    np.log1p(matrix, out=matrix)
+    matrix *= idf_model.weights(vocabulary)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vocabulary, matrix / norms
+
+
+def combine_score(skill_coverage, similarity):
+    """Blend skill coverage and cosine similarity into a 0-100 score"""
+    scaled_similarity = min(similarity / SIMILARITY_CEILING, 1.0)
+    if skill_coverage is None:
+        return round(100 * scaled_similarity)
+    return round(100 * (SKILL_WEIGHT * skill_coverage + SIMILARITY_WEIGHT * scaled_similarity))
+
+
+def combine_scores(skill_coverage, similarity):
+    """
+    combine_score() over arrays.
+
+    Args:
+        skill_coverage (np.ndarray): NaN where the job names no known skills
+        similarity (np.ndarray): Cosine similarities
+
+    Returns:
+        np.ndarray: int64 scores, 0-100
+    """
+    scaled_similarity = np.minimum(similarity / SIMILARITY_CEILING, 1.0)
+    blended = np.where(
+        np.isnan(skill_coverage),
+        scaled_similarity,
+        SKILL_WEIGHT * skill_coverage + SIMILARITY_WEIGHT * scaled_similarity,
+    )
+    # np.round rounds half to even, like round()
+    return np.round(100 * blended).astype(np.int64)
+
+
+def score_match(resume_text, job_description, idf_model=None):
+    """
+    Score how well a resume matches a job description.
+
+    Args:
+        resume_text (str): Candidate resume content
+        job_description (str): Job description
+        idf_model (IDFModel): IDF weights (default: from stored job descriptions)
+
+    Returns:
+        dict: {
+            'score': int (0-100),
+            'similarity': float (cosine, 0-1),
+            'skill_coverage': float | None (None if the job names no known skills),
+            'matching_skills': list, 'missing_skills': list,
+            'matching_terms': list, 'missing_terms': list,
+            'elapsed_ms': float
+        }
+    """
+    started = time.perf_counter()
+    idf_model = idf_model or get_idf_model()
+
+    resume_terms = extract_terms(resume_text)
+    job_terms = extract_job_terms(job_description)
+
+    vocabulary, vectors = tfidf_vectors([resume_terms, job_terms], idf_model)
+    similarity = float(vectors[0] @ vectors[1])
+
+    job_skills = extract_skills(job_terms)
+    matching_skills = sorted(job_skills & resume_terms.keys())
+    missing_skills = sorted(job_skills - resume_terms.keys())
+    skill_coverage = len(matching_skills) / len(job_skills) if job_skills else None
+
+    # Most important job terms by TF-IDF weight, split by presence in the resume
+    job_weights = vectors[1]
+    # (bigrams only when they are known skills, to keep the lists readable)
+    ranked = [
+        vocabulary[i] for i in np.argsort(-job_weights)
+        if job_weights[i] > 0 and (' ' not in vocabulary[i] or vocabulary[i] in KNOWN_SKILLS)
+    ]
+    matching_terms = [t for t in ranked if t in resume_terms][:MAX_TERMS]
+    missing_terms = [t for t in ranked if t not in resume_terms][:MAX_TERMS]
+
+    return {
+        'score': combine_score(skill_coverage, similarity),
+        'similarity': round(similarity, 4),
+        'skill_coverage': round(skill_coverage, 4) if skill_coverage is not None else None,
+        'matching_skills': matching_skills,
+        'missing_skills': missing_skills,
+        'matching_terms': matching_terms,
+        'missing_terms': missing_terms,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+MATCH_SCORE_PATTERN = re.compile(r'match\s*score\s*[:\-]?\s*(\d{1,3})\s*%', re.IGNORECASE)
+
+
+def parse_llm_match_score(output_text):
+    """
+    Read the percentage from an LLM match_score report ("Match Score: 78%").
+
+    Returns:
+        int | None
+    """
+    found = MATCH_SCORE_PATTERN.search(output_text or '')
+    if not found:
+        return None
+    value = int(found.group(1))
+    return value if 0 <= value <= 100 else None
@@ -0,0 +1,86 @@
+"""
+Metrics Service
+
+Process-wide counters for the AI services (cache hits, misses, etc.).
+Counters live in memory and reset when the worker process restarts.
+"""
+import threading
+from collections import defaultdict
+
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+
+
+def increment(name, amount=1):
+    """
+    Increment a named counter.
+
+    Args:
+        name (str): Counter name, e.g. 'text_cache.memory_hits'
+        amount (int): Value to add (default: 1)
+    """
+    with _lock:
+        _counters[name] += amount
+
+
+def get_counter(name):
+    """
+    Get the current value of a counter.
+
+    Args:
+        name (str): Counter name
+
+    Returns:
+        int: Counter value (0 if never incremented)
+    """
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def get_counters(prefix=None):
+    """
+    Get a snapshot of all counters, optionally filtered by prefix.
+
+    Args:
+        prefix (str): Only return counters starting with this prefix (optional)
+
+    Returns:
+        dict: {counter_name: value}
+    """
+    with _lock:
+        return {
+            name: value
+            for name, value in _counters.items()
+            if prefix is None or name.startswith(prefix)
+        }
+
+
+def get_counter_group(prefix):
+    """
+    Get all counters under a dotted prefix, with the prefix stripped.
+
+    Args:
+        prefix (str): Group name, e.g. 'extraction_sandbox'
+
+    Returns:
+        dict: {short_name: value}, e.g. {'timeout': 3}
+    """
+    group = f'{prefix}.'
+    return {
+        name[len(group):]: value
+        for name, value in get_counters(group).items()
+    }
+
+
+def reset_counters(prefix=None):
+    """
+    Reset counters to zero, optionally only those starting with prefix.
+
+    Args:
+        prefix (str): Only reset counters starting with this prefix (optional)
+    """
+    with _lock:
+        for name in list(_counters):
+            if prefix is None or name.startswith(prefix):
+                del _counters[name]
@@ -0,0 +1,216 @@
+"""
+OpenAI Client Registry
+
+Process-wide, thread-safe OpenAI clients (sync and async) with a pooled
+HTTP transport.
+Building a new OpenAI() per call means a new connection pool, a new
+TCP + TLS handshake and a re-read of the environment for every
+generation. The registry builds one client per process and reuses its
+keep-alive connections across requests and threads.
+
+Fork safety: pre-forking servers (gunicorn --preload, uWSGI) may fork
+after a client was created. Connections must never be shared between
+processes, so the registry drops inherited clients in the child
+(without closing them, which would tear down the parent's sockets).
+
+Settings:
+    OPENAI_MAX_CONNECTIONS (int): Pool size per process (default: 20)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS (int): Idle connections kept open (default: 10)
+    OPENAI_KEEPALIVE_EXPIRY (float): Seconds an idle connection is kept (default: 30)
+    OPENAI_TIMEOUT (float): Overall request timeout in seconds (default: 60)
+    OPENAI_CONNECT_TIMEOUT (float): Connect timeout in seconds (default: 5)
+    OPENAI_HTTP2 (bool): Use HTTP/2 when the 'h2' package is installed (default: True)
+    OPENAI_BASE_URL (str): Override the API endpoint (default: OpenAI)
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+
+from django.conf import settings
+from decouple import config
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+try:
+    import httpx
+except ImportError:  # newer openai releases are built on httpx2
+    import httpx2 as httpx
+
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+def http2_available():
+    """HTTP/2 needs the optional 'h2' package"""
+    return importlib.util.find_spec('h2') is not None
+
+
+def get_client_options():
+    """
+    Resolve connection pool and timeout options from settings.
+
+    Returns:
+        dict: {
+            'api_key': str,
+            'base_url': str | None,
+            'limits': httpx.Limits,
+            'timeout': httpx.Timeout,
+            'http2': bool
+        }
+    """
+    return {
+        'api_key': getattr(settings, 'OPENAI_API_KEY', '') or config('OPENAI_API_KEY', default=''),
+        'base_url': getattr(settings, 'OPENAI_BASE_URL', None) or None,
+        'limits': httpx.Limits(
+            max_connections=getattr(settings, 'OPENAI_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=getattr(
+                settings, 'OPENAI_MAX_KEEPALIVE_CONNECTIONS', DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=getattr(settings, 'OPENAI_KEEPALIVE_EXPIRY', DEFAULT_KEEPALIVE_EXPIRY),
+        ),
+        'timeout': httpx.Timeout(
+            getattr(settings, 'OPENAI_TIMEOUT', DEFAULT_TIMEOUT),
+            connect=getattr(settings, 'OPENAI_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+        ),
+        'http2': getattr(settings, 'OPENAI_HTTP2', True) and http2_available(),
+    }
+
+
+def build_openai_client(options=None):
+    """
+    Build a new OpenAI client with a pooled HTTP transport.
+    Prefer get_openai_client(), which reuses one client per process.
+
+    Args:
+        options (dict): Output of get_client_options() (default: from settings)
+
+    Returns:
+        OpenAI: New client
+    """
+    options = options or get_client_options()
+    http_client = DefaultHttpxClient(
+        limits=options['limits'],
+        timeout=options['timeout'],
+        http2=options['http2'],
+    )
+    return OpenAI(
+        api_key=options['api_key'],
+        base_url=options['base_url'],
+        timeout=options['timeout'],
+        http_client=http_client,
+    )
+
+
+def build_async_openai_client(options=None):
+    """
+    Build a new AsyncOpenAI client with a pooled HTTP transport.
+    Prefer get_async_openai_client(), which reuses one client per event loop.
+
+    Args:
+        options (dict): Output of get_client_options() (default: from settings)
+
+    Returns:
+        AsyncOpenAI: New client
+    """
+    options = options or get_client_options()
+    http_client = DefaultAsyncHttpxClient(
+        limits=options['limits'],
+        timeout=options['timeout'],
+        http2=options['http2'],
+    )
+    return AsyncOpenAI(
+        api_key=options['api_key'],
+        base_url=options['base_url'],
+        timeout=options['timeout'],
+        http_client=http_client,
+    )
+
+
+class OpenAIClientRegistry:
+    """
+    Holds one client per process. Creation is guarded by a lock so
+    concurrent first requests don't build duplicate pools.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._pid = os.getpid()
+
+    def get(self, name, factory, scope=None):
+        """
+        Get a named client, building it with factory() on first use.
+
+        Args:
+            name (str): Registry key, e.g. 'sync'
+            factory (callable): Zero-argument function returning a new client
+            scope: Object the client is bound to (e.g. an event loop). A client
+                   registered under a different scope is replaced.
+
+        Returns:
+            The shared client for this process
+        """
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+
+        entry = self._clients.get(name)
+        if entry is not None and entry[0] is scope:
+            return entry[1]
+
+        with self._lock:
+            entry = self._clients.get(name)
+            if entry is None or entry[0] is not scope:
+                entry = (scope, factory())
+                self._clients[name] = entry
+            return entry[1]
+
+    def close(self):
+        """Close all clients and their connection pools (e.g. at shutdown or in tests)"""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for _, client in clients.values():
+            # Async clients are closed with their event loop
+            if isinstance(client, OpenAI):
+                try:
+                    client.close()
+                except Exception:
+                    pass
+
+    def reset_after_fork(self):
+        """
+        Forget clients inherited from the parent process. They are not
+        closed: their sockets still belong to the parent.
+        """
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._pid = os.getpid()
+
+
+_registry = OpenAIClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_registry.reset_after_fork)
+
+
+def get_openai_client():
+    """Get the process-wide OpenAI client (pooled, keep-alive connections)"""
+    return _registry.get('sync', build_openai_client)
+
+
+def get_async_openai_client():
+    """
+    Get the pooled AsyncOpenAI client for the running event loop.
+    Async connection pools can't be shared across event loops, so the client
+    is rebuilt if the loop changes (e.g. async views served under WSGI).
+    """
+    loop = asyncio.get_running_loop()
+    return _registry.get('async', build_async_openai_client, scope=loop)
+
+
+def close_openai_clients():
+    """Close the pooled clients; they are rebuilt lazily on next use"""
+    _registry.close()
@@ -6,17 +6,65 @@ Provides reusable functions for AI generation tasks.
 """
 import os
 import json
-from openai import OpenAI
+import time
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from decouple import config
 
+# Shared, pooled clients (one per process) - see openai_client.py
+from .openai_client import get_openai_client, get_async_openai_client
+from .single_flight import SingleFlight, AsyncSingleFlight, flight_key
+from .token_usage import StreamUsage, usage_from_chunk, resolve_usage, empty_usage
+from .prompt_builder import fit_inputs
+from .prompts import get_prompt_template
 
-def get_openai_client():
-    """Get or create OpenAI client with API key from environment"""
-    return OpenAI(api_key=config('OPENAI_API_KEY'))
 
+DEFAULT_MODEL = "gpt-4.1-nano"
 
-def call_openai(system_prompt, user_message, model="gpt-4.1-nano", temperature=0.7):
+# Model and sampling settings per generation type.
+# prompt_version comes from the prompt registry (prompts.py); bumping it
+# invalidates cached generations.
+GENERATION_SETTINGS = {
+    'tailored_resume': {'model': DEFAULT_MODEL, 'temperature': 0.7},
+    'cover_letter': {'model': DEFAULT_MODEL, 'temperature': 0.8},
+    'interview_prep': {'model': DEFAULT_MODEL, 'temperature': 0.7},
+    'match_score': {'model': DEFAULT_MODEL, 'temperature': 0.3},
+}
+
+
+def get_generation_settings(generation_type):
+    """
+    Get model, temperature and prompt version for a generation type.
+    
+    Returns:
+        dict: {'model': str, 'temperature': float, 'prompt_version': int}
+    """
+    return dict(GENERATION_SETTINGS[generation_type], prompt_version=get_prompt_template(generation_type).version)
+
+
+def _chat_options(generation_type):
+    config = GENERATION_SETTINGS[generation_type]
+    return {
+        'model': config['model'],
+        'temperature': config['temperature'],
+        'prompt_cache_key': get_prompt_template(generation_type).cache_key,
+    }
+
+
+def _fit_inputs(generation_type, resume_text, job_description, usage=None):
+    """Compress and budget the inputs (see prompt_builder.py); records tokens saved in usage"""
+    model = get_generation_settings(generation_type)['model']
+    resume_text, job_description, stats = fit_inputs(generation_type, resume_text, job_description, model=model)
+    if usage is not None:
+        usage['input_tokens_saved'] = stats['tokens_saved']
+    return resume_text, job_description
+
+
+async def _afit_inputs(generation_type, resume_text, job_description, usage=None):
+    """_fit_inputs() off the event loop: normalization may load the boilerplate fingerprints from the database"""
+    return await sync_to_async(_fit_inputs)(generation_type, resume_text, job_description, usage)
+
+
+def call_openai(system_prompt, user_message, model=DEFAULT_MODEL, temperature=0.7):
     """
     Make a call to OpenAI Chat Completions API.
     
@@ -53,63 +101,194 @@ def call_openai(system_prompt, user_message, model="gpt-4.1-nano", temperature=0
         raise Exception(f"OpenAI API error: {str(e)}")
 
 
-def tailor_resume_streaming(resume_text, job_description, examples_prompt):
+# Identical concurrent streams share one upstream call (see single_flight.py)
+_single_flight = SingleFlight()
+_async_single_flight = AsyncSingleFlight()
+
+
+def _single_flight_enabled():
+    return getattr(settings, 'OPENAI_SINGLE_FLIGHT', True)
+
+
+def _cache_routing_options(prompt_cache_key):
+    """Extra request options that route requests sharing a prompt prefix to the same provider cache"""
+    if prompt_cache_key and getattr(settings, 'OPENAI_PROMPT_CACHE_KEY', True):
+        return {'prompt_cache_key': prompt_cache_key}
+    return {}
+
+
+def _open_stream(system_prompt, user_message, model, temperature, prompt_cache_key=None):
     """
-    Tailor a resume to match a specific job description with streaming.
-    Yields chunks of text as they're generated.
+    Start one upstream streaming completion.
+    Yields its text chunks, then a StreamUsage if the API reported usage.
+    """
+    client = get_openai_client()
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=temperature,
+        stream=True,
+        stream_options={"include_usage": True},
+        **_cache_routing_options(prompt_cache_key)
+    )
+    
+    for chunk in stream:
+        # The final usage chunk has no choices
+        if not chunk.choices:
+            usage = usage_from_chunk(chunk)
+            if usage is not None:
+                yield usage
+        elif chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def _aopen_stream(system_prompt, user_message, model, temperature, prompt_cache_key=None):
+    """Async variant of _open_stream() using the pooled AsyncOpenAI client"""
+    client = get_async_openai_client()
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=temperature,
+        stream=True,
+        stream_options={"include_usage": True},
+        **_cache_routing_options(prompt_cache_key)
+    )
+    
+    async for chunk in stream:
+        if not chunk.choices:
+            usage = usage_from_chunk(chunk)
+            if usage is not None:
+                yield usage
+        elif chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _stream_chat(system_prompt, user_message, model=DEFAULT_MODEL, temperature=0.7, prompt_cache_key=None, usage=None):
+    """
+    Stream a chat completion, yielding text chunks as they're generated.
+    An identical request already in flight is joined instead of sent again.
     
     Args:
-        resume_text (str): Original resume content
-        job_description (str): Target job description
-        examples_prompt (str): Few-shot examples for the AI
+        system_prompt (str): Instructions for the AI's behavior
+        user_message (str): The actual user request/content
+        model (str): OpenAI model to use (default: gpt-4.1-nano)
+        temperature (float): Creativity level 0.0-1.0 (default: 0.7)
+        prompt_cache_key (str): Provider cache routing hint (PromptTemplate.cache_key)
+        usage (dict): Filled with the token usage and time to first token once
+                      the stream completes. A caller that joined an in-flight
+                      stream records zero tokens: the upstream call is billed
+                      to the first caller.
     
     Yields:
-        str: Chunks of the tailored resume as they're generated
+        str: Chunks of generated text
     """
-    system_prompt = f"""You are an expert resume writer and career coach. Your task is to tailor resumes to specific job descriptions.
+    def upstream():
+        return _open_stream(system_prompt, user_message, model, temperature, prompt_cache_key)
 
-{examples_prompt}
+    flight = {'coalesced': False}
+    reported = None
+    output = []
+    started = time.perf_counter()
+    first_token_ms = None
 
-Guidelines:
-- Keep the same overall structure and length
-- Emphasize relevant experience and skills from the original resume
-- Use keywords from the job description naturally
-- Maintain truthfulness - don't add experience that isn't there
-- Make it ATS-friendly (Applicant Tracking System)
-- Use strong action verbs
-- Quantify achievements when possible"""
+    try:
+        if _single_flight_enabled():
+            key = flight_key(model, temperature, system_prompt, user_message)
+            stream = _single_flight.stream(key, upstream, info=flight)
+        else:
+            stream = upstream()
 
-    user_message = f"""Please tailor this resume for the following job:
+        for chunk in stream:
+            if isinstance(chunk, StreamUsage):
+                reported = chunk
+                continue
+            if first_token_ms is None:
+                first_token_ms = int((time.perf_counter() - started) * 1000)
+            output.append(chunk)
+            yield chunk
+                
+    except Exception as e:
+        raise Exception(f"OpenAI API error: {str(e)}")
 
-JOB DESCRIPTION:
-{job_description}
+    if usage is not None:
+        if flight['coalesced']:
+            usage.update(empty_usage())
+        else:
+            usage.update(resolve_usage(reported, model, [system_prompt, user_message], ''.join(output)))
+        usage['first_token_ms'] = first_token_ms
 
-ORIGINAL RESUME:
-{resume_text}
 
-Return the tailored resume in a clean, professional format."""
+async def _astream_chat(system_prompt, user_message, model=DEFAULT_MODEL, temperature=0.7, prompt_cache_key=None, usage=None):
+    """Async variant of _stream_chat() using the pooled AsyncOpenAI client"""
+    def upstream():
+        return _aopen_stream(system_prompt, user_message, model, temperature, prompt_cache_key)
+
+    flight = {'coalesced': False}
+    reported = None
+    output = []
+    started = time.perf_counter()
+    first_token_ms = None
 
     try:
-        client = get_openai_client()
-        stream = client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            stream=True
-        )
-        
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        if _single_flight_enabled():
+            key = flight_key(model, temperature, system_prompt, user_message)
+            stream = _async_single_flight.stream(key, upstream, info=flight)
+        else:
+            stream = upstream()
+
+        async for chunk in stream:
+            if isinstance(chunk, StreamUsage):
+                reported = chunk
+                continue
+            if first_token_ms is None:
+                first_token_ms = int((time.perf_counter() - started) * 1000)
+            output.append(chunk)
+            yield chunk
                 
     except Exception as e:
         raise Exception(f"OpenAI API error: {str(e)}")
 
+    if usage is not None:
+        if flight['coalesced']:
+            usage.update(empty_usage())
+        else:
+            usage.update(resolve_usage(reported, model, [system_prompt, user_message], ''.join(output)))
+        usage['first_token_ms'] = first_token_ms
+
 
-def generate_cover_letter(resume_text, job_description):
+def tailor_resume_streaming(resume_text, job_description, usage=None):
+    """
+    Tailor a resume to match a specific job description with streaming.
+    Yields chunks of text as they're generated.
+    
+    Args:
+        resume_text (str): Original resume content
+        job_description (str): Target job description
+        usage (dict): Filled with the token usage once the stream completes
+
+    Yields:
+        str: Chunks of the tailored resume as they're generated
+    """
+    resume_text, job_description = _fit_inputs('tailored_resume', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('tailored_resume').render(resume_text, job_description)
+    yield from _stream_chat(system_prompt, user_message, **_chat_options('tailored_resume'), usage=usage)
+
+
+async def atailor_resume_streaming(resume_text, job_description, usage=None):
+    """Async variant of tailor_resume_streaming() for the ASGI streaming views"""
+    resume_text, job_description = await _afit_inputs('tailored_resume', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('tailored_resume').render(resume_text, job_description)
+    async for chunk in _astream_chat(system_prompt, user_message, **_chat_options('tailored_resume'), usage=usage):
+        yield chunk
+
+
+def generate_cover_letter(resume_text, job_description, usage=None):
     """
     Generate a cover letter using AI with streaming.
     Yields chunks of text as they're generated.
@@ -117,50 +296,25 @@ def generate_cover_letter(resume_text, job_description):
     Args:
         resume_text (str): User's resume content
         job_description (str): Target job description (should include company name)
+        usage (dict): Filled with the token usage once the stream completes
     
     Yields:
         str: Chunks of the cover letter as they're generated
     """
-    system_prompt = """You are an expert cover letter writer. Create compelling, personalized cover letters that:
-- Are concise (3-4 paragraphs)
-- Show enthusiasm for the role
-- Highlight relevant experience from the resume
-- Explain why the candidate is a great fit
-- Are professional but personable
-- Avoid clichés and generic statements
-- Extract the company name from the job description if provided"""
+    resume_text, job_description = _fit_inputs('cover_letter', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('cover_letter').render(resume_text, job_description)
+    yield from _stream_chat(system_prompt, user_message, **_chat_options('cover_letter'), usage=usage)
 
-    user_message = f"""Write a cover letter for this job application:
 
-JOB DESCRIPTION:
-{job_description}
+async def agenerate_cover_letter(resume_text, job_description, usage=None):
+    """Async variant of generate_cover_letter() for the ASGI streaming views"""
+    resume_text, job_description = await _afit_inputs('cover_letter', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('cover_letter').render(resume_text, job_description)
+    async for chunk in _astream_chat(system_prompt, user_message, **_chat_options('cover_letter'), usage=usage):
+        yield chunk
 
-CANDIDATE'S RESUME:
-{resume_text}
 
-Write a compelling cover letter that makes this candidate stand out. If you can identify the company name from the job description, address it appropriately."""
-
-    try:
-        client = get_openai_client()
-        stream = client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.8,
-            stream=True
-        )
-        
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
-                
-    except Exception as e:
-        raise Exception(f"OpenAI API error: {str(e)}")
-
-
-def generate_interview_prep(resume_text, job_description):
+def generate_interview_prep(resume_text, job_description, usage=None):
     """
     Generate interview preparation materials with streaming.
     Yields chunks of text as they're generated.
@@ -168,54 +322,25 @@ def generate_interview_prep(resume_text, job_description):
     Args:
         resume_text (str): User's resume content
         job_description (str): Target job description (should include company info)
+        usage (dict): Filled with the token usage once the stream completes
     
     Yields:
         str: Chunks of interview prep content as they're generated
     """
-    system_prompt = """You are an expert interview coach. Generate a focused interview prep packet that ALWAYS includes:
-1) Exactly 10 questions total, clearly tagged as [Technical] or [Behavioral] (aim ~6/4 split)
-2) For each question: a concise sample answer (2-4 bullet points) grounded in the candidate's resume
-3) Questions the candidate should ask the interviewer (3-5 bullets)
-4) Key talking points and achievements to emphasize (bullets)
-5) Company context: infer company/role themes from the job description only (no external browsing)
-
-Rules:
-- Keep it concise and scannable with headers and bullets.
-- Do not hallucinate experience beyond the resume content.
-- If resume is sparse, give best-effort but note assumptions.
-- If company name is visible in the job description, incorporate it in context and answers."""
-
-    user_message = f"""Generate the full interview prep packet for this position:
+    resume_text, job_description = _fit_inputs('interview_prep', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('interview_prep').render(resume_text, job_description)
+    yield from _stream_chat(system_prompt, user_message, **_chat_options('interview_prep'), usage=usage)
 
-JOB DESCRIPTION:
-{job_description}
 
-CANDIDATE'S RESUME:
-{resume_text}
+async def agenerate_interview_prep(resume_text, job_description, usage=None):
+    """Async variant of generate_interview_prep() for the ASGI streaming views"""
+    resume_text, job_description = await _afit_inputs('interview_prep', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('interview_prep').render(resume_text, job_description)
+    async for chunk in _astream_chat(system_prompt, user_message, **_chat_options('interview_prep'), usage=usage):
+        yield chunk
 
-Remember: exactly 10 questions with tags and sample answers, plus interviewer questions, talking points, and company context inferred from the JD."""
 
-    try:
-        client = get_openai_client()
-        stream = client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            stream=True
-        )
-        
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
-                
-    except Exception as e:
-        raise Exception(f"OpenAI API error: {str(e)}")
-
-
-def match_score_streaming(resume_text, job_description):
+def match_score_streaming(resume_text, job_description, usage=None):
     """
     Compute an AI-driven match score and skill mapping with streaming.
     Yields chunks of text as they're generated.
@@ -223,50 +348,22 @@ def match_score_streaming(resume_text, job_description):
     Args:
         resume_text (str): Candidate resume content
         job_description (str): Job description
+        usage (dict): Filled with the token usage once the stream completes
     
     Yields:
         str: Chunks of the match score report as generated
     """
-    system_prompt = """You are an expert hiring evaluator. Compare a candidate's resume to the job description.
-Return a clean, structured report with ONLY these 3 sections in order:
-
-1) Match Score: XX% (single line at the top; 0-100, weight required skills higher)
-2) Missing Skills: bullet list of gaps only (what they DON'T have)
-3) Matching Skills: bullet list of matches only (what they DO have)
-
-Rules:
-- Be specific; no fluff or generic advice.
-- Do not invent experience not present in the resume.
-- Keep each bullet tight (one line max).
-- NO other sections, headers, or explanations.
-- Start with "Match Score: XX%"."""
+    resume_text, job_description = _fit_inputs('match_score', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('match_score').render(resume_text, job_description)
+    yield from _stream_chat(system_prompt, user_message, **_chat_options('match_score'), usage=usage)
 
-    user_message = f"""Evaluate fit between this job and candidate. Output ONLY: Match Score %, Missing Skills bullets, Matching Skills bullets.
 
-JOB DESCRIPTION:
-{job_description}
-
-CANDIDATE RESUME:
-{resume_text}"""
-
-    try:
-        client = get_openai_client()
-        stream = client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.3,
-            stream=True
-        )
-        
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
-                
-    except Exception as e:
-        raise Exception(f"OpenAI API error: {str(e)}")
+async def amatch_score_streaming(resume_text, job_description, usage=None):
+    """Async variant of match_score_streaming() for the ASGI streaming views"""
+    resume_text, job_description = await _afit_inputs('match_score', resume_text, job_description, usage)
+    system_prompt, user_message = get_prompt_template('match_score').render(resume_text, job_description)
+    async for chunk in _astream_chat(system_prompt, user_message, **_chat_options('match_score'), usage=usage):
+        yield chunk
 
 
 def extract_job_details_from_html(job_content):
@@ -298,7 +395,7 @@ Rules:
     try:
         client = get_openai_client()
         response = client.chat.completions.create(
-            model="gpt-4.1-nano",
+            model=DEFAULT_MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message},
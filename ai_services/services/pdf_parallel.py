@@ -0,0 +1,142 @@
+"""
+Parallel PDF Extraction
+
+Opt-in engine that fans PDF page extraction out across a bounded
+process pool. PyPDF2's page.extract_text() is pure Python and CPU-bound,
+so threads would serialize on the GIL; separate processes do not.
+
+Each worker re-opens the PDF from the raw bytes and extracts a
+contiguous range of pages. Ranges are reassembled in page order.
+
+Settings:
+    PDF_PARALLEL_EXTRACTION (bool): Enable the engine (default: False)
+    PDF_PARALLEL_PAGE_THRESHOLD (int): Minimum page count before going parallel (default: 8)
+    PDF_PARALLEL_MAX_WORKERS (int): Size of the process pool (default: min(4, CPU count))
+"""
+import io
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+from django.conf import settings
+
+
+DEFAULT_PAGE_THRESHOLD = 8
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Split each document into more ranges than workers so a slow page
+# (large embedded fonts, many text objects) doesn't stall one worker
+RANGES_PER_WORKER = 2
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def is_enabled():
+    """Check whether parallel PDF extraction is switched on in settings"""
+    return getattr(settings, 'PDF_PARALLEL_EXTRACTION', False)
+
+
+def get_page_threshold():
+    """Minimum number of pages before extraction is fanned out"""
+    return getattr(settings, 'PDF_PARALLEL_PAGE_THRESHOLD', DEFAULT_PAGE_THRESHOLD)
+
+
+def get_max_workers():
+    """Number of worker processes in the extraction pool"""
+    return getattr(settings, 'PDF_PARALLEL_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+
+def should_parallelize(page_count):
+    """
+    Decide whether a document is worth sending to the process pool.
+
+    Args:
+        page_count (int): Number of pages in the PDF
+
+    Returns:
+        bool: True if the engine is enabled and the document is large enough
+    """
+    return is_enabled() and get_max_workers() > 1 and page_count >= get_page_threshold()
+
+
+def _get_pool(max_workers):
+    """Get or create the shared process pool (recreated if the size changes)"""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # forkserver avoids forking a multi-threaded WSGI worker
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+            _pool_workers = max_workers
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the worker processes (they are restarted lazily on next use)"""
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _pool_workers = None
+
+
+def _extract_page_range(pdf_bytes, start, stop):
+    """
+    Worker entry point: extract text from pages [start, stop).
+
+    Returns:
+        list[str]: One string per page ('' for pages without text)
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+def _page_ranges(page_count, chunks):
+    """Split range(page_count) into at most `chunks` contiguous ranges"""
+    size = max(1, math.ceil(page_count / chunks))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def extract_pages_parallel(pdf_bytes, page_count, max_workers=None):
+    """
+    Extract the text of every page using the process pool.
+
+    Args:
+        pdf_bytes (bytes): Raw PDF content
+        page_count (int): Number of pages in the document
+        max_workers (int): Pool size override (default: PDF_PARALLEL_MAX_WORKERS)
+
+    Returns:
+        list[str]: Page texts in document order
+    """
+    workers = max_workers or get_max_workers()
+    if workers <= 1:
+        # A one-process pool only adds pickling and a second parse of the document
+        return _extract_page_range(pdf_bytes, 0, page_count)
+    ranges = _page_ranges(page_count, workers * RANGES_PER_WORKER)
+
+    try:
+        pool = _get_pool(workers)
+        futures = [pool.submit(_extract_page_range, pdf_bytes, start, stop) for start, stop in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    except BrokenProcessPool:
+        # A worker died (OOM, killed) - drop the pool and finish serially
+        shutdown_pool()
+        return _extract_page_range(pdf_bytes, 0, page_count)
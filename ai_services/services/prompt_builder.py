@@ -0,0 +1,151 @@
+"""
+Prompt Builder
+
+Compresses and budgets the variable inputs (resume, job description)
+before they are interpolated into a prompt.
+
+1. Compression (lossless for the model's purposes): text_normalization's
+   clean_text() - whitespace collapsed and, for job descriptions,
+   repeated lines and sentences and boilerplate dropped (learned ATS
+   template lines, EEO / accommodation statements, benefits lists,
+   privacy and cookie notices)
+2. Budgeting: if the compressed inputs still exceed the generation
+   type's input budget, truncate by priority (the lower-priority input
+   is cut first, down to its floor, at line boundaries).
+
+Settings:
+    PROMPT_INPUT_BUDGETS (dict): Input token budget per generation type
+"""
+from django.conf import settings
+
+from . import metrics
+from .text_normalization import clean_text
+from .token_usage import count_tokens
+
+
+# Input token budget per generation type (resume + job description)
+DEFAULT_INPUT_BUDGETS = {
+    'tailored_resume': 6000,
+    'cover_letter': 4000,
+    'interview_prep': 4000,
+    'match_score': 3000,
+}
+
+# Truncation priority per generation type: higher is kept longer.
+# The floor is the share of the budget an input keeps before the other
+# input is cut further.
+INPUT_PRIORITIES = {
+    'tailored_resume': {'resume': 2, 'job_description': 1},
+    'cover_letter': {'resume': 2, 'job_description': 1},
+    'interview_prep': {'resume': 1, 'job_description': 2},
+    'match_score': {'resume': 1, 'job_description': 2},
+}
+MIN_INPUT_SHARE = 0.25
+
+
+def get_input_budget(generation_type):
+    """Input token budget for a generation type (PROMPT_INPUT_BUDGETS overrides)"""
+    budgets = getattr(settings, 'PROMPT_INPUT_BUDGETS', {})
+    return budgets.get(generation_type, DEFAULT_INPUT_BUDGETS[generation_type])
+
+
+def compress_text(text, strip_boilerplate=True, dedupe=True):
+    """
+    Remove redundant whitespace, repeated lines/sentences and boilerplate.
+
+    Args:
+        text (str): Resume or job description text
+        strip_boilerplate (bool): Also drop learned and EEO/benefits/privacy boilerplate
+        dedupe (bool): Also drop repeated lines and sentences
+
+    Returns:
+        str: Compressed text
+    """
+    return clean_text(text, strip_boilerplate=strip_boilerplate, dedupe=dedupe)
+
+
+def truncate_to_tokens(text, max_tokens, model=None):
+    """
+    Truncate text to at most max_tokens, at line boundaries where possible.
+
+    Returns:
+        str: Text within the token limit
+    """
+    if max_tokens <= 0:
+        return ''
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        line_tokens = count_tokens(line, model) + 1
+        if used + line_tokens > max_tokens:
+            if not kept:
+                # A single huge line (e.g. a flattened scraped page): cut by words
+                words = line.split()
+                while words and count_tokens(' '.join(words), model) > max_tokens:
+                    words = words[:int(len(words) * 0.9)]
+                kept.append(' '.join(words))
+            break
+        kept.append(line)
+        used += line_tokens
+
+    return '\n'.join(kept)
+
+
+def fit_inputs(generation_type, resume_text, job_description, model=None):
+    """
+    Compress both inputs and truncate them by priority to the type's budget.
+
+    Args:
+        generation_type (str): AIGeneration.generation_type
+        resume_text (str): Resume text
+        job_description (str): Job description
+        model (str): Model whose tokenizer to count with
+
+    Returns:
+        tuple: (resume_text, job_description, stats) where stats is
+               {'original_tokens': int, 'final_tokens': int, 'tokens_saved': int, 'truncated': bool}
+    """
+    texts = {'resume': resume_text or '', 'job_description': job_description or ''}
+    original_tokens = sum(count_tokens(text, model) for text in texts.values())
+
+    # Resumes keep their benefits/EEO-like wording (e.g. "led wellness program")
+    # and bullets repeated under several jobs
+    texts['resume'] = compress_text(texts['resume'], strip_boilerplate=False, dedupe=False)
+    texts['job_description'] = compress_text(texts['job_description'])
+
+    tokens = {name: count_tokens(text, model) for name, text in texts.items()}
+    budget = get_input_budget(generation_type)
+    overflow = sum(tokens.values()) - budget
+    truncated = overflow > 0
+
+    if truncated:
+        floor = int(budget * MIN_INPUT_SHARE)
+        priorities = INPUT_PRIORITIES[generation_type]
+        order = sorted(texts, key=lambda name: priorities[name])
+        # First cut the lower-priority input down to its floor, then anything left
+        for min_tokens in (floor, 0):
+            for name in order:
+                if overflow <= 0:
+                    break
+                cut = min(overflow, max(tokens[name] - min_tokens, 0))
+                if cut:
+                    texts[name] = truncate_to_tokens(texts[name], tokens[name] - cut, model)
+                    new_tokens = count_tokens(texts[name], model)
+                    overflow -= tokens[name] - new_tokens
+                    tokens[name] = new_tokens
+
+    final_tokens = sum(tokens.values())
+    tokens_saved = max(original_tokens - final_tokens, 0)
+    metrics.increment('prompt_builder.tokens_saved', tokens_saved)
+    if truncated:
+        metrics.increment('prompt_builder.truncated')
+
+    return texts['resume'], texts['job_description'], {
+        'original_tokens': original_tokens,
+        'final_tokens': final_tokens,
+        'tokens_saved': tokens_saved,
+        'truncated': truncated,
+    }
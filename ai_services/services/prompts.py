@@ -4,6 +4,7 @@ AI Prompts and Few-Shot Examples
 Store all prompt templates and example pairs for AI generation.
 Update these to improve AI output quality.
 """
+import hashlib
 
 
 # Few-shot examples for resume tailoring
@@ -98,3 +99,148 @@ def get_interview_prep_prompt():
         str: Interview prep prompt
     """
     return INTERVIEW_PREP_PROMPT
+
+
+# ---------------------------------------------------------------------------
+# Prompt registry
+#
+# Providers cache the longest previously seen prompt prefix (OpenAI from
+# 1024 tokens on), which cuts time-to-first-token and bills the cached
+# part at a discount. A prefix only hits if it is byte-identical, so each
+# template is laid out as:
+#
+#   system message     static, built once at import
+#   user message       static instructions, then variable content,
+#                      most stable first (the resume is often reused
+#                      across many job descriptions)
+#
+# Bump a template's version whenever its text changes: it invalidates
+# cached generations and lets usage be compared across versions.
+# ---------------------------------------------------------------------------
+
+
+class PromptTemplate:
+    """
+    Versioned prompt for one generation type. The static prefix is
+    precomputed; render() only appends the variable content.
+    """
+
+    def __init__(self, generation_type, version, system_prompt, instructions,
+                 resume_header, job_description_header):
+        self.generation_type = generation_type
+        self.version = version
+        self.system_prompt = system_prompt
+        self.user_prefix = f"{instructions}\n\n{resume_header}\n"
+        self.job_description_header = f"\n\n{job_description_header}\n"
+        self.prefix_hash = hashlib.sha256(
+            f"{self.system_prompt}\x00{self.user_prefix}".encode('utf-8')
+        ).hexdigest()[:12]
+
+    @property
+    def cache_key(self):
+        """Routing hint so requests sharing this prefix land on the same provider cache"""
+        return f"{self.generation_type}-v{self.version}-{self.prefix_hash}"
+
+    def render(self, resume_text, job_description):
+        """
+        Build the messages for one request.
+
+        Returns:
+            tuple: (system_prompt, user_message)
+        """
+        return self.system_prompt, (
+            self.user_prefix + resume_text + self.job_description_header + job_description
+        )
+
+
+PROMPT_REGISTRY = {
+    'tailored_resume': PromptTemplate(
+        'tailored_resume',
+        version=2,
+        system_prompt=f"""You are an expert resume writer and career coach. Your task is to tailor resumes to specific job descriptions.
+
+{get_resume_tailoring_prompt()}
+
+Guidelines:
+- Keep the same overall structure and length
+- Emphasize relevant experience and skills from the original resume
+- Use keywords from the job description naturally
+- Maintain truthfulness - don't add experience that isn't there
+- Make it ATS-friendly (Applicant Tracking System)
+- Use strong action verbs
+- Quantify achievements when possible""",
+        instructions="Please tailor the resume below for the job description that follows it. "
+                     "Return the tailored resume in a clean, professional format.",
+        resume_header="ORIGINAL RESUME:",
+        job_description_header="JOB DESCRIPTION:",
+    ),
+    'cover_letter': PromptTemplate(
+        'cover_letter',
+        version=2,
+        system_prompt="""You are an expert cover letter writer. Create compelling, personalized cover letters that:
+- Are concise (3-4 paragraphs)
+- Show enthusiasm for the role
+- Highlight relevant experience from the resume
+- Explain why the candidate is a great fit
+- Are professional but personable
+- Avoid clichés and generic statements
+- Extract the company name from the job description if provided""",
+        instructions="Write a cover letter for the job application below. "
+                     "Write a compelling cover letter that makes this candidate stand out. "
+                     "If you can identify the company name from the job description, address it appropriately.",
+        resume_header="CANDIDATE'S RESUME:",
+        job_description_header="JOB DESCRIPTION:",
+    ),
+    'interview_prep': PromptTemplate(
+        'interview_prep',
+        version=2,
+        system_prompt="""You are an expert interview coach. Generate a focused interview prep packet that ALWAYS includes:
+1) Exactly 10 questions total, clearly tagged as [Technical] or [Behavioral] (aim ~6/4 split)
+2) For each question: a concise sample answer (2-4 bullet points) grounded in the candidate's resume
+3) Questions the candidate should ask the interviewer (3-5 bullets)
+4) Key talking points and achievements to emphasize (bullets)
+5) Company context: infer company/role themes from the job description only (no external browsing)
+
+Rules:
+- Keep it concise and scannable with headers and bullets.
+- Do not hallucinate experience beyond the resume content.
+- If resume is sparse, give best-effort but note assumptions.
+- If company name is visible in the job description, incorporate it in context and answers.""",
+        instructions="Generate the full interview prep packet for the position below. "
+                     "Remember: exactly 10 questions with tags and sample answers, plus interviewer questions, "
+                     "talking points, and company context inferred from the JD.",
+        resume_header="CANDIDATE'S RESUME:",
+        job_description_header="JOB DESCRIPTION:",
+    ),
+    'match_score': PromptTemplate(
+        'match_score',
+        version=2,
+        system_prompt="""You are an expert hiring evaluator. Compare a candidate's resume to the job description.
+Return a clean, structured report with ONLY these 3 sections in order:
+
+1) Match Score: XX% (single line at the top; 0-100, weight required skills higher)
+2) Missing Skills: bullet list of gaps only (what they DON'T have)
+3) Matching Skills: bullet list of matches only (what they DO have)
+
+Rules:
+- Be specific; no fluff or generic advice.
+- Do not invent experience not present in the resume.
+- Keep each bullet tight (one line max).
+- NO other sections, headers, or explanations.
+- Start with "Match Score: XX%".""",
+        instructions="Evaluate fit between this job and candidate. "
+                     "Output ONLY: Match Score %, Missing Skills bullets, Matching Skills bullets.",
+        resume_header="CANDIDATE RESUME:",
+        job_description_header="JOB DESCRIPTION:",
+    ),
+}
+
+
+def get_prompt_template(generation_type):
+    """
+    Get the registered prompt template for a generation type.
+
+    Returns:
+        PromptTemplate
+    """
+    return PROMPT_REGISTRY[generation_type]
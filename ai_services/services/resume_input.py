@@ -0,0 +1,140 @@
+"""
+Resume Input Resolution
+
+Turns the resume part of an AI request (uploaded file, stored document
+or the user's master resume) into plain text. Shared by the sync DRF
+views and the async streaming views.
+"""
+import os
+
+from documents.models import Document
+from documents.services.text_extraction import get_document_text
+from .resume_parser import extract_text
+from .text_cache import get_cached_text_for_upload
+
+
+ALLOWED_RESUME_EXTENSIONS = ['.pdf', '.docx', '.doc', '.txt']
+MIN_RESUME_LENGTH = 50
+MIN_JOB_DESCRIPTION_LENGTH = 50
+
+
+class ResumeInputError(Exception):
+    """Invalid or unreadable resume input; carries the HTTP status to return"""
+
+    def __init__(self, message, status_code=400):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
+
+
+def extract_uploaded_resume(uploaded_file, file_ext):
+    """
+    Extract text from an uploaded resume, reusing the cached text when the
+    same file bytes were already parsed by any AI endpoint.
+    Parsing runs on the upload buffer directly, with no temp file, either
+    in-process or in the extraction sandbox (DOCUMENT_EXTRACTION_MODE).
+    """
+    return get_cached_text_for_upload(
+        uploaded_file,
+        file_ext,
+        lambda: extract_text(uploaded_file, file_ext),
+    )
+
+
+def resolve_resume_text(user, files, data):
+    """
+    Resolve the resume text for an AI request.
+
+    Sources, in order of precedence:
+    - file: uploaded resume (parsed, cached by content hash)
+    - document_id: a stored Document, using its precomputed text
+    - use_master: the user's latest master resume
+
+    Args:
+        user (User): Requesting user
+        files: request.FILES
+        data: request.data / request.POST
+
+    Returns:
+        str: Resume text
+
+    Raises:
+        ResumeInputError: If no usable resume was provided
+    """
+    uploaded_file = files.get('file')
+    document_id = data.get('document_id')
+    use_master = str(data.get('use_master', '')).lower() in ['true', '1', 'yes']
+
+    try:
+        if uploaded_file:
+            # Validate file extension
+            file_ext = os.path.splitext(uploaded_file.name)[1].lower()
+            if file_ext not in ALLOWED_RESUME_EXTENSIONS:
+                raise ResumeInputError(f'Unsupported file type. Allowed: {", ".join(ALLOWED_RESUME_EXTENSIONS)}')
+            resume_text = extract_uploaded_resume(uploaded_file, file_ext)
+        elif document_id or use_master:
+            documents = Document.objects.filter(user=user)
+            if document_id:
+                document = documents.filter(id=document_id).first()
+            else:
+                document = documents.filter(document_type='resume', is_master=True).order_by('-created_at').first()
+            if document is None:
+                raise ResumeInputError(
+                    'Document not found' if document_id else 'No master resume found',
+                    status_code=404,
+                )
+            resume_text = get_document_text(document)
+        else:
+            raise ResumeInputError('file, document_id or use_master is required')
+    except ResumeInputError:
+        raise
+    except Exception as e:
+        raise ResumeInputError(f'Error reading document: {str(e)}')
+
+    if not resume_text or len(resume_text.strip()) < MIN_RESUME_LENGTH:
+        raise ResumeInputError('Could not extract sufficient text from document')
+
+    return resume_text
+
+
+def validate_job_description(data):
+    """
+    Validate the job_description field of an AI request.
+
+    Returns:
+        str: Stripped job description
+
+    Raises:
+        ResumeInputError: If missing or too short
+    """
+    job_description = (data.get('job_description') or '').strip()
+
+    if not job_description:
+        raise ResumeInputError('job_description is required')
+
+    if len(job_description) < MIN_JOB_DESCRIPTION_LENGTH:
+        raise ResumeInputError('Job description is too short (minimum 50 characters)')
+
+    return job_description
+
+
+def validate_application_id(data):
+    """
+    Validate the optional application_id field of an AI request.
+
+    Returns:
+        int | None: Application id, None if not given
+
+    Raises:
+        ResumeInputError: If it isn't a positive integer
+    """
+    application_id = data.get('application_id')
+    if application_id in (None, ''):
+        return None
+    try:
+        application_id = int(application_id)
+    except (TypeError, ValueError):
+        application_id = 0
+    if application_id <= 0:
+        raise ResumeInputError('application_id must be a positive integer')
+    return application_id
@@ -2,10 +2,25 @@
 Resume Parser Service
 
 Extracts text from various document formats (PDF, DOCX, TXT).
+Works from a filesystem path or directly from an in-memory buffer
+(Django UploadedFile, bytes, memoryview) without touching the disk.
 """
 import PyPDF2
 from docx import Document
+import io
 import os
+import re
+import zipfile
+
+from . import pdf_parallel
+
+
+class PartialText(str):
+    """
+    Text of a document cut short by the extraction sandbox's limits
+    (page cap). Returned to the caller but never cached: the cache key
+    is the file content, which doesn't change when the limits do.
+    """
 
 
 def extract_text_from_pdf(file_path):
@@ -18,20 +33,38 @@ def extract_text_from_pdf(file_path):
     Returns:
         str: Extracted text content
     
+    Raises:
+        Exception: If PDF cannot be read
+    """
+    with open(file_path, 'rb') as file:
+        return extract_text_from_pdf_stream(file)
+
+
+def extract_text_from_pdf_stream(stream):
+    """
+    Extract text from a PDF held in a binary file-like object.
+    
+    Args:
+        stream: Seekable binary stream (open file, BytesIO, UploadedFile)
+    
+    Returns:
+        str: Extracted text content
+    
     Raises:
         Exception: If PDF cannot be read
     """
     try:
-        text_content = []
+        pdf_reader = PyPDF2.PdfReader(stream)
+        page_count = len(pdf_reader.pages)
         
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            for page in pdf_reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_content.append(text)
+        if pdf_parallel.should_parallelize(page_count):
+            # Large documents: fan pages out across the process pool
+            stream.seek(0)
+            page_texts = pdf_parallel.extract_pages_parallel(stream.read(), page_count)
+        else:
+            page_texts = [page.extract_text() for page in pdf_reader.pages]
         
+        text_content = [text for text in page_texts if text]
         return '\n\n'.join(text_content).strip()
     
     except Exception as e:
@@ -48,11 +81,27 @@ def extract_text_from_docx(file_path):
     Returns:
         str: Extracted text content
     
+    Raises:
+        Exception: If DOCX cannot be read
+    """
+    return extract_text_from_docx_stream(file_path)
+
+
+def extract_text_from_docx_stream(stream):
+    """
+    Extract text from a DOCX held in a binary file-like object.
+    
+    Args:
+        stream: Seekable binary stream, or a path (python-docx accepts both)
+    
+    Returns:
+        str: Extracted text content
+    
     Raises:
         Exception: If DOCX cannot be read
     """
     try:
-        doc = Document(file_path)
+        doc = Document(stream)
         text_content = []
         
         for paragraph in doc.paragraphs:
@@ -85,6 +134,25 @@ def extract_text_from_txt(file_path):
         raise Exception(f"Error reading text file: {str(e)}")
 
 
+def extract_text_from_txt_stream(stream):
+    """
+    Extract text from a plain text document held in a binary file-like object.
+    
+    Args:
+        stream: Binary stream
+    
+    Returns:
+        str: Decoded content
+    
+    Raises:
+        Exception: If content is not valid UTF-8
+    """
+    try:
+        return stream.read().decode('utf-8').strip()
+    except Exception as e:
+        raise Exception(f"Error reading text file: {str(e)}")
+
+
 def extract_text_from_document(file_path):
     """
     Auto-detect file type and extract text.
@@ -112,3 +180,129 @@ def extract_text_from_document(file_path):
         return extract_text_from_txt(file_path)
     else:
         raise ValueError(f"Unsupported file type: {ext}. Supported types: .pdf, .docx, .txt")
+
+
+
+def _as_binary_stream(source):
+    """
+    Wrap an in-memory document in a seekable binary stream.
+    Django UploadedFile objects are used directly (rewound, never copied to disk).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    
+    # UploadedFile / InMemoryUploadedFile / any open binary file
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def extract_text_from_buffer(source, file_ext):
+    """
+    Extract text from an in-memory document without writing a temp file.
+    
+    Args:
+        source: bytes, bytearray, memoryview, Django UploadedFile, or binary file-like
+        file_ext (str): File extension used to pick the parser (e.g. '.pdf')
+    
+    Returns:
+        str: Extracted text content
+    
+    Raises:
+        Exception: If file type is not supported or extraction fails
+    """
+    ext = file_ext.lower()
+    stream = _as_binary_stream(source)
+    
+    if ext == '.pdf':
+        return extract_text_from_pdf_stream(stream)
+    elif ext in ['.docx', '.doc']:
+        return extract_text_from_docx_stream(stream)
+    elif ext == '.txt':
+        return extract_text_from_txt_stream(stream)
+    else:
+        raise ValueError(f"Unsupported file type: {ext}. Supported types: .pdf, .docx, .txt")
+
+
+def extract_text_from_upload(uploaded_file):
+    """
+    Extract text from a Django UploadedFile, detecting the type from its name.
+    
+    Args:
+        uploaded_file: Django UploadedFile (InMemoryUploadedFile or TemporaryUploadedFile)
+    
+    Returns:
+        str: Extracted text content
+    """
+    _, ext = os.path.splitext(uploaded_file.name.lower())
+    return extract_text_from_buffer(uploaded_file, ext)
+
+
+def get_page_count(source, file_ext):
+    """
+    Count the pages of an in-memory document without extracting its text.
+    
+    PDFs are counted from the page tree; DOCX files report the page count
+    Word saved in docProps/app.xml. Plain text has no pages.
+    
+    Args:
+        source: bytes, memoryview, Django UploadedFile, or binary file-like
+        file_ext (str): File extension (e.g. '.pdf')
+    
+    Returns:
+        int | None: Number of pages, or None if unknown
+    """
+    ext = file_ext.lower()
+    stream = _as_binary_stream(source)
+    
+    try:
+        if ext == '.pdf':
+            return len(PyPDF2.PdfReader(stream).pages)
+        if ext in ['.docx', '.doc']:
+            with zipfile.ZipFile(stream) as archive:
+                app_xml = archive.read('docProps/app.xml').decode('utf-8')
+            match = re.search(r'<Pages>(\d+)</Pages>', app_xml)
+            return int(match.group(1)) if match else None
+    except Exception:
+        return None
+    return None
+
+
+def extract_text(source, file_ext):
+    """
+    Extract text from an in-memory document using DOCUMENT_EXTRACTION_MODE.
+    
+    'inprocess' parses in the calling process; 'sandbox' parses in an isolated
+    worker with time, memory and page limits (see extraction_sandbox.py).
+    Either way the text is normalized here (text_normalization.clean_text,
+    boilerplate and repeated lines kept): PDF extraction leaves stray
+    spacing and bullet glyphs.
+    
+    Args:
+        source: bytes, memoryview, Django UploadedFile, or binary file-like
+        file_ext (str): File extension used to pick the parser (e.g. '.pdf')
+    
+    Returns:
+        str: Extracted text content (a PartialText if the sandbox truncated it)
+    
+    Raises:
+        ExtractionLimitError: If the sandbox timed out, hit its memory cap or failed
+    """
+    # Imported here: the sandbox workers import this module without Django set up
+    from .extraction_sandbox import (
+        COMPLETE_STATUSES,
+        STATUS_TRUNCATED,
+        ExtractionLimitError,
+        extract_text_sandboxed,
+        get_extraction_mode,
+    )
+    from .text_normalization import clean_text
+    
+    if get_extraction_mode() != 'sandbox':
+        return clean_text(extract_text_from_buffer(source, file_ext), strip_boilerplate=False, dedupe=False)
+    
+    result = extract_text_sandboxed(source, file_ext)
+    if result['status'] not in COMPLETE_STATUSES:
+        raise ExtractionLimitError(result)
+    text = clean_text(result['text'], strip_boilerplate=False, dedupe=False)
+    return PartialText(text) if result['status'] == STATUS_TRUNCATED else text
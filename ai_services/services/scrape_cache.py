@@ -0,0 +1,248 @@
+"""
+Scrape Cache
+
+Shares extracted job details across users. The same LinkedIn/Indeed
+posting is pasted by many people, usually with different tracking
+parameters; each paste used to cost a fetch, a parse and an LLM call.
+
+- canonicalize_job_url() reduces a job URL to one key per posting: tracking
+  parameters and fragments are dropped, and the boards whose URLs carry a
+  job id (LinkedIn, Indeed, Glassdoor, Greenhouse, Lever) are rewritten to
+  their id form.
+- The final scrape-job payload is stored under that key (ScrapedJobCache)
+  and served from a single indexed read while fresh
+  (SCRAPE_CACHE_TTL_HOURS).
+- After that it is still served for SCRAPE_CACHE_STALE_HOURS while one
+  background thread re-scrapes the posting (stale-while-revalidate); the
+  row is claimed with a conditional update so concurrent requests don't
+  start several refreshes.
+
+Failed scrapes are not cached. Counters (metrics.py):
+    scrape_cache.hits / stale / misses / bypassed
+    scrape_cache.refreshes / refresh_errors / store_errors
+"""
+import logging
+import re
+import threading
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import ScrapedJobCache
+from .job_scraper import scrape_job_details
+from .metrics import increment
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = 12
+DEFAULT_STALE_HOURS = 72
+# A revalidation that hasn't finished after this long may be retried
+REVALIDATE_TIMEOUT = timedelta(minutes=5)
+MAX_CANONICAL_URL_LENGTH = 500  # ScrapedJobCache.canonical_url
+
+# Query parameters that identify the visitor or campaign, not the posting
+TRACKING_PARAMS = frozenset([
+    'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi',
+    'ref', 'refid', 'referer', 'referrer', 'trk', 'trkinfo', 'trackingid', 'lipi',
+    'gh_src', 'lever-source', 'lever-origin', 'lever-via',
+    'from', 'tk', 'vjs', 'advn', 'adid', 'sjdu', 'cmp', 'jrtk', 'ao', 'src', 'source',
+])
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hs_')
+
+LINKEDIN_JOB_PATH = re.compile(r'/jobs/view/(?:[^/]*?-)?(\d+)(?:/|$)')
+LEVER_JOB_PATH = re.compile(r'^/([^/]+)/([0-9a-f-]{36})(?:/apply)?/?$', re.IGNORECASE)
+GREENHOUSE_JOB_PATH = re.compile(r'^/([^/]+)/jobs/(\d+)/?$')
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+
+def _board_url(host, path, params):
+    """Id form of a job board URL, or None if the URL doesn't carry a job id"""
+    if _host_matches(host, 'linkedin.com'):
+        job_id = params.get('currentJobId')
+        match = LINKEDIN_JOB_PATH.search(path)
+        if match:
+            job_id = match.group(1)
+        if job_id and job_id.isdigit():
+            return f'https://www.linkedin.com/jobs/view/{job_id}/'
+
+    elif 'indeed.' in host:
+        job_id = params.get('jk') or params.get('vjk')
+        if job_id:
+            if host.startswith('m.'):
+                host = 'www.' + host[2:]
+            return f'https://{host}/viewjob?jk={job_id.lower()}'
+
+    elif 'glassdoor.' in host:
+        job_id = params.get('jl') or params.get('jobListingId')
+        if job_id and job_id.isdigit():
+            return f'https://{host}/job-listing/?jl={job_id}'
+
+    elif _host_matches(host, 'greenhouse.io'):
+        match = GREENHOUSE_JOB_PATH.match(path)
+        if match:
+            return f'https://boards.greenhouse.io/{match.group(1).lower()}/jobs/{match.group(2)}'
+
+    elif _host_matches(host, 'lever.co'):
+        match = LEVER_JOB_PATH.match(path)
+        if match:
+            return f'https://jobs.lever.co/{match.group(1).lower()}/{match.group(2).lower()}'
+
+    return None
+
+
+def canonicalize_job_url(url):
+    """
+    Reduce a job URL to one key per posting.
+
+    Args:
+        url (str): Job posting URL as submitted
+
+    Returns:
+        str | None: Canonical URL, or None if the URL can't be cached
+            (not http(s), or too long for the key)
+    """
+    parsed = urlparse((url or '').strip())
+    if parsed.scheme.lower() not in ('http', 'https') or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower().rstrip('.')
+    path = re.sub(r'/{2,}', '/', parsed.path or '/')
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+
+    canonical = _board_url(host, path, dict(params))
+    if canonical is None:
+        if host.startswith('www.'):
+            host = host[4:]
+        if parsed.port and parsed.port not in (80, 443):
+            host = f'{host}:{parsed.port}'
+        if len(path) > 1:
+            path = path.rstrip('/')
+        query = urlencode(sorted((k, v) for k, v in params if not _is_tracking_param(k)))
+        # http and https serve the same posting; the key ignores the scheme
+        canonical = f'https://{host}{path}' + (f'?{query}' if query else '')
+
+    if len(canonical) > MAX_CANONICAL_URL_LENGTH:
+        return None
+    return canonical
+
+
+def scrape_cache_enabled():
+    return getattr(settings, 'SCRAPE_CACHE_ENABLED', True)
+
+
+def _store(canonical_url, details):
+    """Store a fresh payload. Best-effort: the caller already has its result."""
+    now = timezone.now()
+    fresh_until = now + timedelta(hours=getattr(settings, 'SCRAPE_CACHE_TTL_HOURS', DEFAULT_TTL_HOURS))
+    payload = {key: value for key, value in details.items() if key not in ('fetch', 'cache')}
+    try:
+        ScrapedJobCache.objects.update_or_create(
+            canonical_url=canonical_url,
+            defaults={
+                'payload': payload,
+                'extraction': details.get('extraction', ''),
+                'fetched_at': now,
+                'fresh_until': fresh_until,
+                'stale_until': fresh_until + timedelta(
+                    hours=getattr(settings, 'SCRAPE_CACHE_STALE_HOURS', DEFAULT_STALE_HOURS)
+                ),
+                'refreshing_since': None,
+            },
+        )
+    except Exception:
+        increment('scrape_cache.store_errors')
+
+
+def _revalidate(canonical_url, job_url):
+    """Background thread: re-scrape a stale entry"""
+    try:
+        _store(canonical_url, scrape_job_details(job_url))
+        increment('scrape_cache.refreshes')
+    except Exception as e:
+        increment('scrape_cache.refresh_errors')
+        logger.warning("Revalidating %s failed: %s", canonical_url, e)
+        # Let the next request retry instead of waiting for REVALIDATE_TIMEOUT
+        ScrapedJobCache.objects.filter(canonical_url=canonical_url).update(refreshing_since=None)
+    finally:
+        connection.close()
+
+
+def _start_revalidation(entry, job_url):
+    """Claim a stale entry and refresh it in the background (at most one refresh at a time)"""
+    now = timezone.now()
+    claimed = ScrapedJobCache.objects.filter(id=entry.id).filter(
+        Q(refreshing_since__isnull=True) | Q(refreshing_since__lt=now - REVALIDATE_TIMEOUT)
+    ).update(refreshing_since=now)
+    if claimed:
+        threading.Thread(
+            target=_revalidate, args=(entry.canonical_url, job_url), daemon=True, name='scrape-revalidate'
+        ).start()
+
+
+def _payload_for(entry, job_url, cache_status, now):
+    """The cached payload, addressed to the URL this request submitted"""
+    payload = dict(entry.payload)
+    cached_url = payload.get('job_url')
+    if payload.get('tracking_info') == f'Track your application at: {cached_url}':
+        payload['tracking_info'] = f'Track your application at: {job_url}'
+    payload['job_url'] = job_url
+    payload['cache'] = {
+        'status': cache_status,
+        'age_seconds': int((now - entry.fetched_at).total_seconds()),
+    }
+    return payload
+
+
+def get_job_details(job_url, refresh=False):
+    """
+    Job details for a URL, from the shared cache when possible
+    (scrape_job_details() otherwise).
+
+    Args:
+        job_url (str): URL of the job posting
+        refresh (bool): Skip the cache lookup and re-scrape (the result is stored)
+
+    Returns:
+        dict: scrape_job_details() result plus
+            'cache': {'status': 'hit' | 'stale' | 'miss' | 'bypass', 'age_seconds': int}
+            Cached results have no 'fetch' timings.
+
+    Raises:
+        Exception: If scraping or extraction fails
+    """
+    canonical_url = canonicalize_job_url(job_url) if scrape_cache_enabled() else None
+    if canonical_url is None:
+        increment('scrape_cache.bypassed')
+        details = scrape_job_details(job_url)
+        details['cache'] = {'status': 'bypass', 'age_seconds': 0}
+        return details
+
+    if not refresh:
+        now = timezone.now()
+        entry = ScrapedJobCache.objects.filter(canonical_url=canonical_url, stale_until__gt=now).first()
+        if entry is not None:
+            if entry.fresh_until > now:
+                increment('scrape_cache.hits')
+                return _payload_for(entry, job_url, 'hit', now)
+            increment('scrape_cache.stale')
+            _start_revalidation(entry, job_url)
+            return _payload_for(entry, job_url, 'stale', now)
+
+    increment('scrape_cache.misses')
+    details = scrape_job_details(job_url)
+    _store(canonical_url, details)
+    details['cache'] = {'status': 'miss', 'age_seconds': 0}
+    return details
@@ -0,0 +1,508 @@
+"""
+Scraper HTTP Client
+
+Shared HTTP layer for the job scraper:
+
+- one requests.Session per process, with per-host keep-alive connection
+  pools (re-scraping a board reuses its TCP + TLS connection)
+- bounded retries with exponential backoff and jitter on connection
+  errors and 429/5xx, honouring Retry-After up to SCRAPER_MAX_RETRY_AFTER
+  seconds; a longer Retry-After, or a retry that would start more than
+  SCRAPER_RETRY_DEADLINE seconds into the fetch, ends the retries (the
+  429/5xx is returned as is)
+- gzip/deflate negotiation, plus brotli when the 'brotli' package is installed
+- an on-disk HTTP cache keyed by URL that stores ETag/Last-Modified and
+  revalidates with If-None-Match/If-Modified-Since, so re-scraping an
+  unchanged posting is a 304 with no body
+- per-phase timings (dns, connect, tls, ttfb, download) for every fetch
+- streamed bodies: read in chunks up to a size cap, and handed to the
+  caller's stop_reading callback so the download can end as soon as the
+  part of the page that is needed has arrived (see job_scraper.ExtractionWatcher)
+
+Settings:
+    SCRAPER_POOL_CONNECTIONS (int): Hosts with a pool kept per process (default: 20)
+    SCRAPER_POOL_MAXSIZE (int): Connections per host (default: 10)
+    SCRAPER_MAX_RETRIES (int): Retries after the first attempt (default: 3)
+    SCRAPER_BACKOFF_FACTOR (float): Backoff base in seconds (default: 0.5)
+    SCRAPER_BACKOFF_JITTER (float): Random extra backoff in seconds (default: 0.5)
+    SCRAPER_MAX_RETRY_AFTER (float): Longest Retry-After waited for, in seconds (default: 5)
+    SCRAPER_RETRY_DEADLINE (float): No retry starts later than this into a fetch, in seconds (default: 20)
+    SCRAPER_HTTP_CACHE_DIR (str): Cache directory, empty to disable (default: BASE_DIR/.cache/scraper)
+    SCRAPER_MAX_PAGE_BYTES (int): Decoded body size at which a download is cut off (default: 3 MB)
+"""
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, InvalidHeader, MaxRetryError, ResponseError
+from urllib3.util import Retry, make_headers
+
+from .metrics import increment
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_POOL_CONNECTIONS = 20
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_JITTER = 0.5
+DEFAULT_MAX_RETRY_AFTER = 5.0
+DEFAULT_RETRY_DEADLINE = 20.0
+DEFAULT_MAX_PAGE_BYTES = 3 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_timings = threading.local()
+
+
+def _phase_timings():
+    """Timings of the fetch running on this thread (None outside fetch())"""
+    return getattr(_timings, 'current', None)
+
+
+def _add_phase(name, started):
+    timings = _phase_timings()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    Connection that records DNS and TCP connect time separately.
+    The host is resolved once here and the addresses are tried in order
+    (as urllib3 does), so an unreachable first record (e.g. IPv6 without
+    a route) falls back to the next; TLS still verifies (and sends SNI
+    for) the original host name.
+    """
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            addresses = list(dict.fromkeys(
+                info[4][0] for info in socket.getaddrinfo(dns_host, self.port, 0, socket.SOCK_STREAM)
+            ))
+        except OSError:
+            addresses = [dns_host]  # the connect below raises urllib3's NameResolutionError
+        _add_phase('dns_ms', started)
+
+        started = time.perf_counter()
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError:
+                    # Also NewConnectionError (refused, unreachable)
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+            _add_phase('connect_ms', started)
+
+
+class TimedHTTPSConnection(HTTPSConnection, TimedHTTPConnection):
+    """HTTPS variant; the TLS handshake is recorded as its own phase"""
+
+    def connect(self):
+        timings = _phase_timings()
+        before = dict(timings) if timings is not None else None
+        started = time.perf_counter()
+        super().connect()
+        if timings is not None:
+            spent = (time.perf_counter() - started) * 1000
+            tcp = sum(timings.get(k, 0.0) - before.get(k, 0.0) for k in ('dns_ms', 'connect_ms'))
+            timings['tls_ms'] = timings.get('tls_ms', 0.0) + max(spent - tcp, 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class BoundedRetry(Retry):
+    """
+    Retry that won't hold a worker thread for long: a response whose
+    Retry-After exceeds max_retry_after, or a retry whose wait would end
+    past the fetch's deadline (set by fetch()), is not retried.
+    """
+
+    def __init__(self, *args, max_retry_after=DEFAULT_MAX_RETRY_AFTER, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kwargs):
+        kwargs.setdefault('max_retry_after', self.max_retry_after)
+        return super().new(**kwargs)
+
+    def _next_wait(self, response):
+        """Seconds sleep() would wait before the next attempt"""
+        if self.respect_retry_after_header and response is not None:
+            try:
+                retry_after = self.get_retry_after(response)
+            except InvalidHeader:
+                retry_after = None
+            if retry_after is not None:
+                return retry_after
+        return self.get_backoff_time()
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        wait = retry._next_wait(response)
+        deadline = getattr(_timings, 'deadline', None)
+        if wait > self.max_retry_after or (deadline is not None and time.monotonic() + wait > deadline):
+            increment('scraper_http.retries_abandoned')
+            reason = error or ResponseError(f'not retrying: next attempt in {wait:.1f}s')
+            raise MaxRetryError(_pool, url, reason) from reason
+        return retry
+
+
+def build_retry():
+    """Retry policy for idempotent scraper requests"""
+    return BoundedRetry(
+        total=getattr(settings, 'SCRAPER_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+        backoff_factor=getattr(settings, 'SCRAPER_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+        backoff_jitter=getattr(settings, 'SCRAPER_BACKOFF_JITTER', DEFAULT_BACKOFF_JITTER),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        max_retry_after=getattr(settings, 'SCRAPER_MAX_RETRY_AFTER', DEFAULT_MAX_RETRY_AFTER),
+        raise_on_status=False,
+    )
+
+
+def build_session():
+    """
+    Build a new scraper session.
+    Prefer get_session(), which reuses one session per process.
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(
+        pool_connections=getattr(settings, 'SCRAPER_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS),
+        pool_maxsize=getattr(settings, 'SCRAPER_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+        max_retries=build_retry(),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        # gzip, deflate (+ br when urllib3 can decode it)
+        **make_headers(accept_encoding=True),
+    })
+    return session
+
+
+_session_lock = threading.Lock()
+_session = {'pid': None, 'session': None}
+
+
+def get_session():
+    """Process-wide scraper session (rebuilt in forked children)"""
+    if _session['session'] is None or _session['pid'] != os.getpid():
+        with _session_lock:
+            if _session['session'] is None or _session['pid'] != os.getpid():
+                _session['session'] = build_session()
+                _session['pid'] = os.getpid()
+    return _session['session']
+
+
+class HTTPCache:
+    """
+    On-disk cache of GET responses that carry a validator (ETag or
+    Last-Modified). Each URL is stored as <sha256>.json (validators,
+    final URL, headers) plus <sha256>.body (the decoded body).
+    Writes are atomic, so concurrent scrapers never read a torn entry.
+    """
+
+    STORED_HEADERS = ('content-type', 'etag', 'last-modified')
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.json'), os.path.join(self.directory, f'{key}.body')
+
+    def get(self, url):
+        """
+        Cached entry of a URL.
+
+        Returns:
+            dict | None: {'url', 'status_code', 'headers', 'stored_at', 'body': bytes}
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, entry):
+        """Conditional request headers for a cached entry"""
+        headers = {}
+        if entry and entry['headers'].get('etag'):
+            headers['If-None-Match'] = entry['headers']['etag']
+        if entry and entry['headers'].get('last-modified'):
+            headers['If-Modified-Since'] = entry['headers']['last-modified']
+        return headers
+
+    def _write(self, path, data):
+        handle, temporary = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def store(self, url, response, body):
+        """
+        Store a 200 response if it has a validator and allows storing.
+
+        Returns:
+            bool: True if stored
+        """
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        if not (headers.get('etag') or headers.get('last-modified')):
+            return False
+        if 'no-store' in response.headers.get('cache-control', '').lower():
+            return False
+
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': headers,
+            'stored_at': time.time(),
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write(body_path, body)
+            self._write(meta_path, json.dumps(entry).encode('utf-8'))
+        except OSError:
+            increment('scraper_http.cache_write_errors')
+            return False
+        return True
+
+    def refresh(self, url, entry, response):
+        """Record a 304: keep the body, take any updated validators"""
+        for name in self.STORED_HEADERS:
+            if name in response.headers and name != 'content-type':
+                entry['headers'][name] = response.headers[name]
+        entry['stored_at'] = time.time()
+        meta_path, _ = self._paths(url)
+        meta = {k: v for k, v in entry.items() if k != 'body'}
+        try:
+            self._write(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError:
+            increment('scraper_http.cache_write_errors')
+
+
+def get_http_cache():
+    """
+    Cache configured by SCRAPER_HTTP_CACHE_DIR.
+
+    Returns:
+        HTTPCache | None: None if caching is disabled
+    """
+    default = os.path.join(getattr(settings, 'BASE_DIR', tempfile.gettempdir()), '.cache', 'scraper')
+    directory = getattr(settings, 'SCRAPER_HTTP_CACHE_DIR', default)
+    return HTTPCache(str(directory)) if directory else None
+
+
+class FetchResult:
+    """
+    A fetched page.
+
+    Attributes:
+        url (str): Final URL (after redirects)
+        status_code (int): Upstream status (304 when served from a revalidated cache entry)
+        content (bytes): Decoded body
+        headers (dict): Response headers
+        from_cache (bool): Body came from the on-disk cache
+        timings (dict): Milliseconds per phase: dns_ms, connect_ms, tls_ms
+            (0 on a reused connection), ttfb_ms, download_ms, total_ms, plus retries
+        download (dict): {
+            'bytes_read': int - Bytes received (as sent, i.e. compressed),
+            'content_length': int | None - Announced body size,
+            'bytes_saved': int | None - Announced bytes never downloaded (None if unknown),
+            'stopped': None | 'extracted' | 'max_bytes' - Why reading ended before the end of the body
+        }
+    """
+
+    def __init__(self, url, status_code, content, headers, from_cache, timings, download):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.timings = timings
+        self.download = download
+
+
+def _read_body(response, max_bytes, stop_reading):
+    """
+    Read a streamed response in chunks (decoded), up to max_bytes.
+
+    Args:
+        response (requests.Response): Response opened with stream=True
+        max_bytes (int): Decoded size limit (0: unlimited)
+        stop_reading (callable): Called with each chunk; True ends the download
+
+    Returns:
+        tuple: (body bytes, stop reason: None | 'extracted' | 'max_bytes', bytes received)
+    """
+    chunks = []
+    size = 0
+    stopped = None
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if max_bytes and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                stopped = 'max_bytes'
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if stop_reading is not None and stop_reading(chunk):
+                if getattr(response.raw, 'length_remaining', None) == 0:
+                    # Everything has arrived already: keep the whole (cacheable) body
+                    stop_reading = None
+                    continue
+                stopped = 'extracted'
+                break
+        received = response.raw.tell()
+    finally:
+        # A body left unread closes the connection instead of returning it to the pool
+        response.close()
+    return b''.join(chunks), stopped, received
+
+
+def fetch(url, timeout=10, use_cache=True, stop_reading=None, max_bytes=None):
+    """
+    GET a page through the shared session and HTTP cache, streaming the body.
+
+    A body cut short (by stop_reading or max_bytes) is returned as far as it
+    was read and is not stored in the HTTP cache.
+
+    Args:
+        url (str): Page URL
+        timeout (float): Connect and read timeout in seconds
+        use_cache (bool): Revalidate against / store in the on-disk cache
+        stop_reading (callable): Called with each decoded chunk; return True to stop downloading
+        max_bytes (int): Decoded size limit (default: SCRAPER_MAX_PAGE_BYTES, 0 for none)
+
+    Returns:
+        FetchResult
+
+    Raises:
+        requests.RequestException: On network errors or a non-2xx final status
+    """
+    cache = get_http_cache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'SCRAPER_MAX_PAGE_BYTES', DEFAULT_MAX_PAGE_BYTES)
+
+    timings = {'dns_ms': 0.0, 'connect_ms': 0.0, 'tls_ms': 0.0}
+    _timings.current = timings
+    _timings.deadline = time.monotonic() + getattr(settings, 'SCRAPER_RETRY_DEADLINE', DEFAULT_RETRY_DEADLINE)
+    started = time.perf_counter()
+    try:
+        response = get_session().get(
+            url,
+            headers=cache.validators(entry) if cache else None,
+            timeout=timeout,
+            stream=True,
+        )
+        headers_at = time.perf_counter()
+        retries = response.raw.retries
+        timings['retries'] = len(retries.history) if retries else 0
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            cache.refresh(url, entry, response)
+            content, from_cache = entry['body'], True
+            stopped, received = None, 0
+            increment('scraper_http.not_modified')
+        else:
+            response.raise_for_status()
+            content, stopped, received = _read_body(response, max_bytes, stop_reading)
+            from_cache = False
+            if cache and stopped is None:
+                cache.store(url, response, content)
+        finished = time.perf_counter()
+    finally:
+        _timings.current = None
+        _timings.deadline = None
+
+    timings['ttfb_ms'] = max((headers_at - started) * 1000 - timings['dns_ms'] - timings['connect_ms'] - timings['tls_ms'], 0.0)
+    timings['download_ms'] = (finished - headers_at) * 1000
+    timings['total_ms'] = (finished - started) * 1000
+    timings = {k: round(v, 2) if isinstance(v, float) else v for k, v in timings.items()}
+
+    increment('scraper_http.fetches')
+    increment('scraper_http.retries', timings['retries'])
+    if timings['connect_ms'] == 0:
+        increment('scraper_http.connections_reused')
+
+    try:
+        content_length = int(response.headers.get('content-length'))
+    except (TypeError, ValueError):
+        content_length = None
+    if from_cache:
+        bytes_saved = content_length
+    elif stopped is None:
+        bytes_saved = 0
+    else:
+        bytes_saved = max(content_length - received, 0) if content_length is not None else None
+    increment('scraper_http.bytes_read', received)
+    increment('scraper_http.bytes_saved', bytes_saved or 0)
+    if stopped:
+        increment(f'scraper_http.stopped_{stopped}')
+
+    return FetchResult(
+        url=entry['url'] if from_cache else response.url,
+        status_code=response.status_code,
+        content=content,
+        headers=dict(response.headers),
+        from_cache=from_cache,
+        timings=timings,
+        download={
+            'bytes_read': received,
+            'content_length': content_length,
+            'bytes_saved': bytes_saved,
+            'stopped': stopped,
+        },
+    )
@@ -0,0 +1,206 @@
+"""
+Single-Flight Streams
+
+Coalesces identical in-flight generations (double-clicks, retries, several
+open tabs) onto one upstream OpenAI stream.
+
+The first caller for a key starts the upstream stream in a background
+pump; every caller, including the first, subscribes to it. A subscriber
+that joins late first replays the chunks already emitted, then follows
+live. The pump keeps running when a subscriber disconnects, so the others
+still get the full output; if the pump itself is cancelled (async), its
+subscribers get a FlightCancelled error rather than a silently cut
+stream. The flight is forgotten once the stream ends; reuse after that
+is the generation cache's job (generation_cache.py).
+
+Counters (metrics.py):
+    single_flight.upstream: Upstream streams started
+    single_flight.coalesced: Callers that joined an in-flight stream
+"""
+import asyncio
+import hashlib
+import json
+import threading
+
+from . import metrics
+
+
+def flight_key(*parts):
+    """
+    Hash the inputs that fully determine an upstream request.
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class FlightCancelled(Exception):
+    """The shared upstream stream was cancelled before it finished"""
+
+
+class _Flight:
+    """Chunks emitted so far by one upstream stream"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+
+
+class SingleFlight:
+    """Thread-based single-flight group for the sync streaming views"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def stream(self, key, factory, info=None):
+        """
+        Stream the output for key, sharing an in-flight upstream if there is one.
+
+        Args:
+            key (str): Request identity, see flight_key()
+            factory (callable): Zero-argument function returning the upstream chunk iterator
+            info (dict): Filled with {'coalesced': bool} for the caller
+
+        Yields:
+            str: Chunks, from the first one
+        """
+        info = info if info is not None else {}
+        with self._lock:
+            flight = self._flights.get(key)
+            info['coalesced'] = flight is not None
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                metrics.increment('single_flight.upstream')
+                threading.Thread(
+                    target=self._pump, args=(key, flight, factory), daemon=True, name='single-flight'
+                ).start()
+            else:
+                metrics.increment('single_flight.coalesced')
+
+        yield from self._subscribe(flight)
+
+    def in_flight(self):
+        """Number of upstream streams currently running"""
+        return len(self._flights)
+
+    def _pump(self, key, flight, factory):
+        try:
+            for chunk in factory():
+                with flight.condition:
+                    flight.chunks.append(chunk)
+                    flight.condition.notify_all()
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    def _subscribe(self, flight):
+        position = 0
+        while True:
+            with flight.condition:
+                while position >= len(flight.chunks) and not flight.done:
+                    flight.condition.wait()
+                pending = flight.chunks[position:]
+                position += len(pending)
+                finished = flight.done and position >= len(flight.chunks)
+
+            yield from pending
+
+            if finished:
+                if flight.error is not None:
+                    raise flight.error
+                return
+
+
+class _AsyncFlight:
+    """Async counterpart of _Flight, bound to one event loop"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Condition()
+        # The event loop only keeps weak references to tasks
+        self.task = None
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for the async streaming views.
+    Flights are tracked per event loop, since their tasks can't be awaited across loops.
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+    def stream(self, key, factory, info=None):
+        """
+        Async variant of SingleFlight.stream().
+
+        Args:
+            key (str): Request identity, see flight_key()
+            factory (callable): Zero-argument function returning the upstream async iterator
+            info (dict): Filled with {'coalesced': bool} for the caller
+
+        Returns:
+            Async iterator of chunks
+        """
+        info = info if info is not None else {}
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get((loop, key))
+        info['coalesced'] = flight is not None
+        if flight is None:
+            flight = _AsyncFlight()
+            self._flights[(loop, key)] = flight
+            metrics.increment('single_flight.upstream')
+            flight.task = loop.create_task(self._pump(loop, key, flight, factory))
+        else:
+            metrics.increment('single_flight.coalesced')
+
+        return self._subscribe(flight)
+
+    async def _pump(self, loop, key, flight, factory):
+        try:
+            async for chunk in factory():
+                async with flight.changed:
+                    flight.chunks.append(chunk)
+                    flight.changed.notify_all()
+        except asyncio.CancelledError:
+            flight.error = FlightCancelled('The upstream stream was cancelled')
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            if self._flights.get((loop, key)) is flight:
+                del self._flights[(loop, key)]
+            async with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+    async def _subscribe(self, flight):
+        position = 0
+        while True:
+            async with flight.changed:
+                await flight.changed.wait_for(lambda: position < len(flight.chunks) or flight.done)
+                pending = flight.chunks[position:]
+                position += len(pending)
+                finished = flight.done and position >= len(flight.chunks)
+
+            for chunk in pending:
+                yield chunk
+
+            if finished:
+                if flight.error is not None:
+                    raise flight.error
+                return
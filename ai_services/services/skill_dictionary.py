@@ -0,0 +1,214 @@
+"""
+Skill Dictionary
+
+Normalized skill names with their common spellings, and a multi-pattern
+matcher (Aho-Corasick) that finds all of them in one pass over a text.
+
+Used to:
+- index the skills named in each job description (ApplicationSkill rows,
+  maintained on save, see signals.py)
+- normalize the free-form, comma-separated UserProfile.skills
+
+Canonical names follow the local match engine's term format (lowercase,
+multi-word skills space-separated), so both agree on what a skill is.
+"""
+import re
+import threading
+from collections import deque
+
+from .local_match import KNOWN_SKILLS
+
+
+# Canonical skill -> other spellings. Every KNOWN_SKILLS entry is a
+# canonical skill; entries without aliases only match their own name.
+SKILL_ALIASES = {
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'go': ['golang'],
+    'c++': ['cpp'],
+    'c#': ['csharp', 'c sharp'],
+    'node.js': ['nodejs', 'node js'],
+    'react': ['react.js', 'reactjs'],
+    'vue': ['vue.js', 'vuejs'],
+    'angular': ['angularjs', 'angular.js'],
+    'next.js': ['nextjs'],
+    'postgresql': ['postgres', 'psql'],
+    'mongodb': ['mongo'],
+    'elasticsearch': ['elastic search', 'opensearch'],
+    'kubernetes': ['k8s'],
+    'aws': ['amazon web services'],
+    'gcp': ['google cloud platform'],
+    'google cloud': [],
+    'azure': ['microsoft azure'],
+    'ci/cd': ['cicd', 'ci cd', 'continuous integration', 'continuous delivery', 'continuous deployment'],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'machine learning': ['ml'],
+    'natural language': ['nlp', 'natural language processing'],
+    'rest': ['restful', 'rest api', 'rest apis'],
+    'graphql': ['graph ql'],
+    'sql': ['t-sql', 'pl/sql'],
+    'power bi': ['powerbi'],
+    'unit testing': ['unit tests'],
+    'tensorflow': ['tensor flow'],
+    'pytorch': ['torch'],
+}
+
+# Everyday words that are also skill names: accepted as an entry of a
+# skill list, but not searched for in running text ("go live", "the rest")
+AMBIGUOUS_SPELLINGS = frozenset(['go', 'rest'])
+
+# Characters that continue a word (a match must not be glued to them)
+WORD_CHARACTERS = re.compile(r'[a-z0-9_]')
+SPLIT_PATTERN = re.compile(r'[,;\n|]+')
+
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace (the form the matcher runs on)"""
+    return ' '.join((text or '').lower().split())
+
+
+def _build_alias_map():
+    aliases = {}
+    for skill in KNOWN_SKILLS:
+        aliases[normalize_text(skill)] = skill
+    for skill, spellings in SKILL_ALIASES.items():
+        aliases[normalize_text(skill)] = skill
+        for spelling in spellings:
+            aliases[normalize_text(spelling)] = skill
+    return aliases
+
+
+ALIAS_TO_SKILL = _build_alias_map()
+CANONICAL_SKILLS = frozenset(ALIAS_TO_SKILL.values())
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over all skill spellings.
+
+    Matching is linear in the text length regardless of the number of
+    skills. Matches must start and end on word boundaries, so "java" is
+    not found inside "javascript" and "go" not inside "good".
+    """
+
+    def __init__(self, aliases):
+        self.transitions = [{}]
+        self.fail = [0]
+        # Per state: [(pattern length, canonical skill)]
+        self.outputs = [[]]
+
+        for pattern, skill in aliases.items():
+            state = 0
+            for character in pattern:
+                next_state = self.transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][character] = next_state
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append((len(pattern), skill))
+
+        # Breadth-first: failure links and inherited outputs
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and character not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(character, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def _is_boundary(self, text, index):
+        return index < 0 or index >= len(text) or not WORD_CHARACTERS.match(text[index])
+
+    def find(self, text):
+        """
+        Count the skills named in a text.
+
+        Args:
+            text (str): Any text (job description, skill list)
+
+        Returns:
+            dict: canonical skill -> occurrences
+        """
+        text = normalize_text(text)
+        matches = []
+        state = 0
+        for index, character in enumerate(text):
+            while state and character not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(character, 0)
+            for length, skill in self.outputs[state]:
+                start = index - length + 1
+                # A trailing "." ends the sentence, not the skill ("node.js." -> node.js)
+                if self._is_boundary(text, start - 1) and self._is_boundary(text, index + 1):
+                    matches.append((start, index + 1, skill))
+
+        # Leftmost-longest: "react.js" is react, not react + js
+        found = {}
+        covered_until = 0
+        for start, end, skill in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start < covered_until:
+                continue
+            found[skill] = found.get(skill, 0) + 1
+            covered_until = end
+        return found
+
+
+_matcher_lock = threading.Lock()
+_matcher = None
+
+
+def get_skill_matcher():
+    """Process-wide matcher over the skill dictionary (built on first use)"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher({
+                    alias: skill for alias, skill in ALIAS_TO_SKILL.items() if alias not in AMBIGUOUS_SPELLINGS
+                })
+    return _matcher
+
+
+def extract_skill_counts(text):
+    """
+    Canonical skills named in a text, with occurrence counts.
+
+    Returns:
+        dict: skill -> count
+    """
+    return get_skill_matcher().find(text)
+
+
+def normalize_skill(name):
+    """
+    Canonical name of one skill spelling.
+
+    Returns:
+        str | None: None if the name is not in the dictionary
+    """
+    return ALIAS_TO_SKILL.get(normalize_text(name).strip(' .'))
+
+
+def parse_skill_list(text):
+    """
+    Normalize a free-form skill list ("Python, k8s / Postgres; React.js").
+    Entries that are not dictionary skills are matched as text, so
+    "5 years of AWS" still yields "aws".
+
+    Returns:
+        set: Canonical skills
+    """
+    skills = set()
+    for entry in SPLIT_PATTERN.split(text or ''):
+        skill = normalize_skill(entry)
+        if skill:
+            skills.add(skill)
+        elif entry.strip():
+            skills.update(extract_skill_counts(entry))
+    return skills
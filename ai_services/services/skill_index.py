@@ -0,0 +1,219 @@
+"""
+Skill Index
+
+Skill -> application inverted index over job descriptions (ApplicationSkill
+rows), so "which of my saved jobs need Kubernetes" and "which skills do my
+jobs ask for that my profile lacks" are index lookups instead of a scan
+plus string matching over every job description.
+
+- ApplicationSkill: one row per (application, canonical skill), read
+  through the (user, skill, application) index.
+- SkillDemand: per-user count of applications naming each skill, updated
+  with the same deltas, so top-skill queries read a few rows.
+
+Both are updated incrementally when an application is saved or deleted
+(signals.py): the description is matched once with the skill dictionary's
+Aho-Corasick matcher and only the difference is written. Existing rows can
+be built with the build_skill_index management command.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from ..models import ApplicationSkill, SkillDemand
+from .skill_dictionary import extract_skill_counts, normalize_skill, parse_skill_list
+
+
+def _apply_demand_deltas(user_id, deltas):
+    """
+    Add per-skill (applications, mentions) deltas to a user's SkillDemand rows.
+    Rows that drop to zero applications are removed.
+    """
+    deltas = {skill: delta for skill, delta in deltas.items() if delta != (0, 0)}
+    if not deltas:
+        return
+
+    SkillDemand.objects.bulk_create(
+        [SkillDemand(user_id=user_id, skill=skill) for skill in deltas],
+        ignore_conflicts=True,
+    )
+    for skill, (applications, mentions) in deltas.items():
+        SkillDemand.objects.filter(user_id=user_id, skill=skill).update(
+            applications=F('applications') + applications,
+            mentions=F('mentions') + mentions,
+        )
+    SkillDemand.objects.filter(user_id=user_id, skill__in=list(deltas), applications__lte=0).delete()
+
+
+def index_application_skills(application):
+    """
+    Update the indexed skills of one application to match its job description.
+
+    Returns:
+        dict: skill -> occurrences now indexed
+    """
+    found = extract_skill_counts(application.job_description or '')
+    existing = {
+        row.skill: row for row in ApplicationSkill.objects.filter(application_id=application.id)
+    }
+
+    stale = [row for skill, row in existing.items() if skill not in found]
+    added = [
+        ApplicationSkill(application_id=application.id, user_id=application.user_id, skill=skill, occurrences=count)
+        for skill, count in found.items() if skill not in existing
+    ]
+    changed = [
+        row for skill, row in existing.items() if skill in found and row.occurrences != found[skill]
+    ]
+    if not (stale or added or changed):
+        return found
+
+    deltas = {row.skill: (-1, -row.occurrences) for row in stale}
+    deltas.update({row.skill: (1, row.occurrences) for row in added})
+    deltas.update({row.skill: (0, found[row.skill] - row.occurrences) for row in changed})
+    for row in changed:
+        row.occurrences = found[row.skill]
+
+    with transaction.atomic():
+        if stale:
+            ApplicationSkill.objects.filter(id__in=[row.id for row in stale]).delete()
+        if added:
+            ApplicationSkill.objects.bulk_create(added)
+        if changed:
+            ApplicationSkill.objects.bulk_update(changed, ['occurrences'])
+        _apply_demand_deltas(application.user_id, deltas)
+    return found
+
+
+def remove_application_skills(application):
+    """
+    Take a deleted application out of the demand counts.
+    (Its ApplicationSkill rows go with it by cascade.)
+    """
+    rows = ApplicationSkill.objects.filter(application_id=application.id).values_list('skill', 'occurrences')
+    _apply_demand_deltas(application.user_id, {skill: (-1, -occurrences) for skill, occurrences in rows})
+
+
+def refresh_skill_demand(user_ids):
+    """
+    Recompute SkillDemand from the index for some users.
+
+    Args:
+        user_ids (iterable): Users to recompute
+    """
+    user_ids = list(user_ids)
+    totals = (
+        ApplicationSkill.objects.filter(user_id__in=user_ids)
+        .values('user_id', 'skill')
+        .annotate(applications=Count('id'), mentions=Sum('occurrences'))
+    )
+    with transaction.atomic():
+        SkillDemand.objects.filter(user_id__in=user_ids).delete()
+        SkillDemand.objects.bulk_create([SkillDemand(**row) for row in totals], batch_size=1000)
+
+
+def rebuild_skill_index(applications, batch_size=1000):
+    """
+    Rebuild the index for many applications (backfill / dictionary change).
+
+    Args:
+        applications (QuerySet): JobApplication rows to index
+        batch_size (int): Applications per transaction
+
+    Returns:
+        tuple: (applications indexed, skill rows written)
+    """
+    indexed = written = 0
+    batch = []
+    user_ids = set()
+
+    def flush():
+        nonlocal written
+        rows = []
+        for application in batch:
+            for skill, count in extract_skill_counts(application.job_description or '').items():
+                rows.append(ApplicationSkill(
+                    application_id=application.id, user_id=application.user_id,
+                    skill=skill, occurrences=count,
+                ))
+        with transaction.atomic():
+            ApplicationSkill.objects.filter(application_id__in=[a.id for a in batch]).delete()
+            ApplicationSkill.objects.bulk_create(rows, batch_size=batch_size)
+        written += len(rows)
+        batch.clear()
+
+    for application in applications.only('id', 'user_id', 'job_description').iterator(chunk_size=batch_size):
+        batch.append(application)
+        user_ids.add(application.user_id)
+        indexed += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    refresh_skill_demand(user_ids)
+    return indexed, written
+
+
+def get_profile_skills(user):
+    """
+    Canonical skills of the user's profile (UserProfile.skills is free-form text).
+
+    Returns:
+        set
+    """
+    profile = getattr(user, 'profile', None)
+    return parse_skill_list(profile.skills if profile else '')
+
+
+def applications_with_skill(user, skill):
+    """
+    The user's applications whose job description names a skill.
+
+    Args:
+        user (User): Owner of the applications
+        skill (str): Any spelling of the skill ("k8s", "Kubernetes")
+
+    Returns:
+        tuple: (canonical skill | None, QuerySet of ApplicationSkill with application
+                and company loaded, newest application first)
+    """
+    canonical = normalize_skill(skill)
+    if canonical is None:
+        return None, ApplicationSkill.objects.none()
+    rows = (
+        ApplicationSkill.objects.filter(user=user, skill=canonical)
+        .select_related('application__company')
+        .order_by('-application_id')
+    )
+    return canonical, rows
+
+
+def get_skill_demand(user, status=None, limit=20, missing_only=False):
+    """
+    Skills most requested across the user's applications.
+
+    Args:
+        user (User): Owner of the applications
+        status (str): Only count applications with this status (optional;
+            aggregates the index instead of reading the rollup)
+        limit (int): Number of skills to return
+        missing_only (bool): Skip skills the user's profile already lists
+
+    Returns:
+        list: [{'skill': str, 'applications': int, 'mentions': int, 'in_profile': bool}]
+    """
+    profile_skills = get_profile_skills(user)
+
+    if status:
+        rows = (
+            ApplicationSkill.objects.filter(user=user, application__status=status)
+            .values('skill')
+            .annotate(applications=Count('application_id'), mentions=Sum('occurrences'))
+        )
+    else:
+        rows = SkillDemand.objects.filter(user=user).values('skill', 'applications', 'mentions')
+    if missing_only:
+        rows = rows.exclude(skill__in=profile_skills)
+
+    demand = rows.order_by('-applications', '-mentions', 'skill')[:limit]
+    return [{**row, 'in_profile': row['skill'] in profile_skills} for row in demand]
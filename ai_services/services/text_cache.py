@@ -0,0 +1,221 @@
+"""
+Extracted Text Cache
+
+Content-addressed cache of text extracted from uploaded resumes.
+Users typically upload the same resume to every AI endpoint, so the
+text is keyed by a SHA-256 hash of the file bytes and reused:
+
+1. In-process LRU (bounded by total characters stored)
+2. ExtractedTextCache table (bounded by row count, least recently used evicted)
+3. On a miss, the parser runs once and both layers are filled, unless
+   the parser returned partial text (resume_parser.PartialText)
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ExtractedTextCache
+from . import metrics
+from .resume_parser import PartialText
+
+
+DEFAULT_MAX_CHARS = 32 * 1024 * 1024
+DEFAULT_MAX_ROWS = 5000
+
+
+class LRUTextCache:
+    """
+    Thread-safe LRU mapping of cache key -> extracted text.
+    Evicts the least recently used entries once the total number of
+    stored characters exceeds max_chars.
+    """
+
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS):
+        self.max_chars = max_chars
+        self.current_chars = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def set(self, key, text):
+        # Never cache a single entry bigger than the whole cache
+        if len(text) > self.max_chars:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_chars -= len(previous)
+
+            self._entries[key] = text
+            self.current_chars += len(text)
+
+            while self.current_chars > self.max_chars and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_chars -= len(evicted)
+                metrics.increment('text_cache.evictions')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_chars = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_memory_cache = LRUTextCache(
+    max_chars=getattr(settings, 'EXTRACTED_TEXT_CACHE_MAX_CHARS', DEFAULT_MAX_CHARS)
+)
+
+
+def hash_uploaded_file(uploaded_file):
+    """
+    Compute the SHA-256 hash of an uploaded file without loading it all at once.
+
+    Args:
+        uploaded_file: Django UploadedFile
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(content_hash, file_type):
+    return f"{content_hash}{file_type}"
+
+
+def _prune_table():
+    """Delete least recently used rows once the table exceeds its row limit"""
+    max_rows = getattr(settings, 'EXTRACTED_TEXT_CACHE_MAX_ROWS', DEFAULT_MAX_ROWS)
+    stale_ids = list(
+        ExtractedTextCache.objects.order_by('-last_used_at')
+        .values_list('id', flat=True)[max_rows:]
+    )
+    if stale_ids:
+        ExtractedTextCache.objects.filter(id__in=stale_ids).delete()
+        metrics.increment('text_cache.evictions', len(stale_ids))
+
+
+def get_or_extract_text(content_hash, file_type, extract, file_size=0):
+    """
+    Return cached text for a document, running the extractor only on a miss.
+
+    Args:
+        content_hash (str): SHA-256 of the uploaded bytes
+        file_type (str): Lowercase file extension (e.g. '.pdf')
+        extract (callable): Zero-argument function that parses the document
+        file_size (int): Upload size in bytes, stored for admin visibility
+
+    Returns:
+        str: Extracted text content
+
+    Raises:
+        Exception: Whatever the extractor raises (failures are not cached)
+    """
+    key = _cache_key(content_hash, file_type)
+
+    text = _memory_cache.get(key)
+    if text is not None:
+        metrics.increment('text_cache.memory_hits')
+        return text
+
+    entry = ExtractedTextCache.objects.filter(
+        content_hash=content_hash, file_type=file_type
+    ).first()
+    if entry is not None:
+        # auto_now on last_used_at is only applied by save(), so bump it explicitly
+        ExtractedTextCache.objects.filter(id=entry.id).update(
+            hit_count=F('hit_count') + 1,
+            last_used_at=timezone.now(),
+        )
+        _memory_cache.set(key, entry.extracted_text)
+        metrics.increment('text_cache.db_hits')
+        return entry.extracted_text
+
+    metrics.increment('text_cache.misses')
+    text = extract()
+    if isinstance(text, PartialText):
+        # Truncated by extraction limits; raised limits must re-extract it
+        metrics.increment('text_cache.partial_uncached')
+        return text
+
+    ExtractedTextCache.objects.update_or_create(
+        content_hash=content_hash,
+        file_type=file_type,
+        defaults={'extracted_text': text, 'file_size': file_size},
+    )
+    _prune_table()
+    _memory_cache.set(key, text)
+
+    return text
+
+
+def get_cached_text_for_upload(uploaded_file, file_type, extract):
+    """
+    Hash an uploaded file and return its cached text, extracting on a miss.
+
+    Args:
+        uploaded_file: Django UploadedFile
+        file_type (str): Lowercase file extension (e.g. '.pdf')
+        extract (callable): Zero-argument function that parses the upload
+
+    Returns:
+        str: Extracted text content
+    """
+    content_hash = hash_uploaded_file(uploaded_file)
+    return get_or_extract_text(content_hash, file_type, extract, file_size=uploaded_file.size or 0)
+
+
+def get_cache_stats():
+    """
+    Get hit/miss counters and size information for the text cache.
+
+    Returns:
+        dict: {
+            'memory_hits': int,
+            'db_hits': int,
+            'misses': int,
+            'evictions': int,
+            'partial_uncached': int,
+            'hit_ratio': float (0-1),
+            'memory_entries': int,
+            'memory_chars': int,
+            'stored_entries': int
+        }
+    """
+    memory_hits = metrics.get_counter('text_cache.memory_hits')
+    db_hits = metrics.get_counter('text_cache.db_hits')
+    misses = metrics.get_counter('text_cache.misses')
+    lookups = memory_hits + db_hits + misses
+
+    return {
+        'memory_hits': memory_hits,
+        'db_hits': db_hits,
+        'misses': misses,
+        'evictions': metrics.get_counter('text_cache.evictions'),
+        'partial_uncached': metrics.get_counter('text_cache.partial_uncached'),
+        'hit_ratio': round((memory_hits + db_hits) / lookups, 4) if lookups else 0.0,
+        'memory_entries': len(_memory_cache),
+        'memory_chars': _memory_cache.current_chars,
+        'stored_entries': ExtractedTextCache.objects.count(),
+    }
+
+
+def clear_memory_cache():
+    """Drop the in-process layer (the backing table is left intact)"""
+    _memory_cache.clear()
@@ -0,0 +1,267 @@
+"""
+Text Normalization
+
+One pipeline for the free text that flows into storage and prompts:
+scraped job descriptions (job_scraper), extracted resume text
+(resume_parser) and the prompt inputs of every generation (prompt_builder).
+
+clean_text() makes a single pass over the lines of a text:
+- invisible characters dropped, runs of spaces/tabs collapsed, bullet
+  glyphs written as "- "; line breaks and single blank lines between
+  paragraphs are kept
+- optionally, lines and sentences that repeat earlier ones are dropped
+  (short ones, headings and bullets, may repeat). Off for resumes, where
+  the same bullet under two jobs is content, not a repeat
+- optionally, boilerplate is dropped:
+  - learned: lines whose fingerprint was seen in many postings from
+    several companies (ATS templates: EEO statements, cookie banners,
+    "About our benefits"), see learn_fingerprints()
+  - rules: sentences matching EEO / legal / privacy patterns, and
+    benefits lists (two or more benefit-specific phrases: "dental and
+    vision", "401(k)", "gym membership"; a bare "vision" or "equity" is
+    role content)
+
+Fingerprints are learned from the stored job descriptions with the
+learn_boilerplate management command and cached per process.
+
+Settings:
+    BOILERPLATE_MIN_POSTINGS (int): Postings a line must appear in to be boilerplate (default: 5)
+    BOILERPLATE_MIN_COMPANIES (int): Distinct companies among those postings (default: 3)
+    BOILERPLATE_FINGERPRINT_TTL (int): Seconds before the cached set is reloaded (default: 3600)
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from ..models import BoilerplateFingerprint
+from . import metrics
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_POSTINGS = 5
+DEFAULT_MIN_COMPANIES = 3
+DEFAULT_FINGERPRINT_TTL = 3600
+# Shorter lines (headings, skills bullets) are never learned as boilerplate
+MIN_FINGERPRINT_CHARS = 80
+# Shorter lines and sentences may legitimately repeat
+MIN_DUPLICATE_CHARS = 20
+
+# A sentence matching any of these is legal/HR boilerplate
+BOILERPLATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'equal (employment )?opportunity',
+    r'\bEEO\b',
+    r'affirmative action',
+    r'without regard to (race|color|religion|sex|age|national origin)',
+    r'(sexual orientation|gender identity|veteran status|genetic information)',
+    r'reasonable accommodations?',
+    r'\bE-?Verify\b',
+    r'(privacy|cookie) (policy|notice|settings)',
+    r'we use cookies',
+    r'pay transparency',
+    r'background check',
+]]
+
+# A sentence with two or more of these is a benefits list. Only phrases
+# that name a benefit: "vision", "equity" or "wellness" alone are often
+# about the role ("our vision is...", "equity research")
+BENEFIT_PHRASES = [re.compile(p, re.IGNORECASE) for p in [
+    r'\b401\(?k\)?',
+    r'\b(medical|dental|vision|health|life|disability) (insurance|coverage|plans?|benefits|care)\b',
+    r'\b(medical|dental|vision)(,? (and |& )?(medical|dental|vision))+\b',
+    r'\bpaid (time off|holidays|vacation|parental leave|sick leave)\b', r'\bPTO\b',
+    r'\b(parental|maternity|paternity) leave\b',
+    r'\b(wellness|gym|fitness|learning) (stipend|allowance|reimbursement|membership|budget)s?\b',
+    r'\bstock options?\b', r'\bRSUs?\b', r'\bequity (grants?|packages?|awards?|compensation)\b',
+    r'\btuition (reimbursement|assistance)\b', r'\bcommuter (benefits?|subsid(y|ies)|stipends?)\b',
+]]
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9•\-*])')
+_INLINE_SPACE = re.compile(r'[ \t\u00a0\u2000-\u200a\u202f\u3000]+')
+_INVISIBLE = re.compile(r'[\u200b-\u200d\u2060\ufeff\u00ad]')
+_BULLET = re.compile(r'^(?:[\u2022\u00b7\u25aa\u25cf\u25e6\u2023\u2219\u2013]|\*(?=\s))\s*')
+_WORD = re.compile(r'\w+')
+
+_fingerprint_lock = threading.Lock()
+_fingerprint_cache = {'fingerprints': None, 'loaded_at': 0.0}
+
+
+def is_boilerplate(sentence):
+    """True if a sentence is EEO/legal boilerplate or a benefits list"""
+    if any(pattern.search(sentence) for pattern in BOILERPLATE_PATTERNS):
+        return True
+    return sum(1 for phrase in BENEFIT_PHRASES if phrase.search(sentence)) >= 2
+
+
+def line_key(line):
+    """A line's words, lowercased: the form lines are compared and fingerprinted in"""
+    return ' '.join(_WORD.findall(line.lower()))
+
+
+def fingerprint(key):
+    """64-bit fingerprint of a line key (hex)"""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def load_fingerprints():
+    """
+    Fingerprints of the lines learned as boilerplate, by the current thresholds.
+
+    Returns:
+        frozenset
+    """
+    try:
+        return frozenset(
+            BoilerplateFingerprint.objects.filter(
+                postings__gte=getattr(settings, 'BOILERPLATE_MIN_POSTINGS', DEFAULT_MIN_POSTINGS),
+                companies__gte=getattr(settings, 'BOILERPLATE_MIN_COMPANIES', DEFAULT_MIN_COMPANIES),
+            ).values_list('fingerprint', flat=True)
+        )
+    except DatabaseError as e:
+        # Normalization must keep working without the table (e.g. before migrating)
+        logger.warning("Could not load boilerplate fingerprints: %s", e)
+        return frozenset()
+
+
+def get_fingerprints():
+    """Process-wide learned fingerprint set, reloaded after BOILERPLATE_FINGERPRINT_TTL seconds"""
+    ttl = getattr(settings, 'BOILERPLATE_FINGERPRINT_TTL', DEFAULT_FINGERPRINT_TTL)
+    if _fingerprint_cache['fingerprints'] is None or time.monotonic() - _fingerprint_cache['loaded_at'] > ttl:
+        with _fingerprint_lock:
+            if _fingerprint_cache['fingerprints'] is None or time.monotonic() - _fingerprint_cache['loaded_at'] > ttl:
+                _fingerprint_cache['fingerprints'] = load_fingerprints()
+                _fingerprint_cache['loaded_at'] = time.monotonic()
+    return _fingerprint_cache['fingerprints']
+
+
+def reset_fingerprints():
+    """Drop the cached fingerprint set (reloaded on next use)"""
+    with _fingerprint_lock:
+        _fingerprint_cache['fingerprints'] = None
+
+
+def clean_text(text, strip_boilerplate=True, fingerprints=None, stats=None, dedupe=True):
+    """
+    Normalize whitespace and (optionally) drop repeats and boilerplate, in one pass.
+
+    Args:
+        text (str): Job description, resume or other free text
+        strip_boilerplate (bool): Drop learned and rule-based boilerplate
+            (False for resumes: "led the wellness program" is content there)
+        fingerprints (set): Learned boilerplate fingerprints (default: get_fingerprints())
+        stats (dict): Filled with {'chars_in', 'chars_out', 'duplicates',
+            'boilerplate', 'learned_boilerplate'} for the caller
+        dedupe (bool): Drop lines and sentences repeating earlier ones
+            (False for resumes: two jobs may share a bullet)
+
+    Returns:
+        str: Normalized text, lines and paragraph breaks kept
+    """
+    if strip_boilerplate and fingerprints is None:
+        fingerprints = get_fingerprints()
+    counts = {'duplicates': 0, 'boilerplate': 0, 'learned_boilerplate': 0}
+    seen_lines = set()
+    seen_sentences = set()
+    lines = []
+
+    for raw_line in (text or '').splitlines():
+        line = _INLINE_SPACE.sub(' ', _INVISIBLE.sub('', raw_line)).strip()
+        if not line:
+            if lines and lines[-1] != '':
+                lines.append('')
+            continue
+        line = _BULLET.sub('- ', line)
+
+        key = line_key(line)
+        if dedupe and len(key) > MIN_DUPLICATE_CHARS:
+            if key in seen_lines:
+                counts['duplicates'] += 1
+                continue
+            seen_lines.add(key)
+        if strip_boilerplate and len(key) >= MIN_FINGERPRINT_CHARS and fingerprint(key) in fingerprints:
+            counts['learned_boilerplate'] += 1
+            continue
+
+        kept = []
+        for sentence in _SENTENCE_SPLIT.split(line):
+            sentence_key = sentence.lower()
+            if dedupe and len(sentence_key) > MIN_DUPLICATE_CHARS and sentence_key in seen_sentences:
+                counts['duplicates'] += 1
+                continue
+            if strip_boilerplate and is_boilerplate(sentence):
+                counts['boilerplate'] += 1
+                continue
+            seen_sentences.add(sentence_key)
+            kept.append(sentence)
+        if kept:
+            lines.append(' '.join(kept))
+
+    cleaned = '\n'.join(lines).strip()
+    metrics.increment('text_normalization.chars_removed', max(len(text or '') - len(cleaned), 0))
+    metrics.increment('text_normalization.learned_boilerplate_lines', counts['learned_boilerplate'])
+    if stats is not None:
+        stats.update(counts, chars_in=len(text or ''), chars_out=len(cleaned))
+    return cleaned
+
+
+def learn_fingerprints(postings):
+    """
+    Count, per line fingerprint, the postings and companies it appears in.
+
+    Args:
+        postings (iterable): (description text, company key) pairs;
+            identical descriptions are counted once
+
+    Returns:
+        dict: fingerprint -> {'postings': int, 'companies': set, 'sample': str}
+    """
+    seen_documents = set()
+    learned = defaultdict(lambda: {'postings': 0, 'companies': set(), 'sample': ''})
+    for text, company in postings:
+        document_key = fingerprint(line_key(text or ''))
+        if document_key in seen_documents:
+            continue
+        seen_documents.add(document_key)
+
+        lines = {}
+        for raw_line in (text or '').splitlines():
+            key = line_key(raw_line)
+            if len(key) >= MIN_FINGERPRINT_CHARS:
+                lines.setdefault(fingerprint(key), raw_line.strip())
+        for line_fingerprint, line in lines.items():
+            entry = learned[line_fingerprint]
+            entry['postings'] += 1
+            entry['companies'].add(company)
+            entry['sample'] = entry['sample'] or line[:300]
+    return learned
+
+
+def store_fingerprints(learned, min_postings=2):
+    """
+    Replace the stored fingerprints with newly learned ones. Lines seen in
+    fewer than min_postings postings are not kept (thresholds for use are
+    applied when loading, so they can change without relearning).
+
+    Returns:
+        int: Fingerprints stored
+    """
+    rows = [
+        BoilerplateFingerprint(
+            fingerprint=line_fingerprint,
+            postings=entry['postings'],
+            companies=len(entry['companies']),
+            sample=entry['sample'],
+        )
+        for line_fingerprint, entry in learned.items() if entry['postings'] >= min_postings
+    ]
+    with transaction.atomic():
+        BoilerplateFingerprint.objects.all().delete()
+        BoilerplateFingerprint.objects.bulk_create(rows, batch_size=1000)
+    reset_fingerprints()
+    return len(rows)
@@ -0,0 +1,233 @@
+"""
+Token Usage
+
+Token accounting for streaming generations.
+
+Streams are requested with stream_options={"include_usage": True}, so
+OpenAI sends a final chunk (with no choices) carrying the real usage.
+When that chunk is missing (stream cut short, proxy or provider without
+usage support), the counts are estimated locally: with tiktoken if it is
+installed, otherwise with a ~4 characters per token heuristic.
+
+Usage dicts have the shape:
+    {
+        'prompt_tokens': int,
+        'completion_tokens': int,
+        'cached_tokens': int,
+        'estimated': bool,
+        'input_tokens_saved': int (set by the prompt builder),
+        'first_token_ms': int | None (set by the streaming call)
+    }
+"""
+import math
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+try:
+    import tiktoken
+except ImportError:  # optional; fall back to the character heuristic
+    tiktoken = None
+
+
+CHARS_PER_TOKEN = 4
+# Per-message framing tokens added by the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encodings = {}
+
+
+@dataclass(frozen=True)
+class StreamUsage:
+    """
+    Usage reported by the final chunk of a stream.
+    Travels through the chunk iterators alongside the text chunks.
+    """
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int = 0
+
+
+def usage_from_chunk(chunk):
+    """
+    Read the usage of a streamed chunk.
+
+    Returns:
+        StreamUsage | None: None if the chunk carries no usage
+    """
+    usage = getattr(chunk, 'usage', None)
+    if usage is None:
+        return None
+
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return StreamUsage(
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        cached_tokens=getattr(details, 'cached_tokens', None) or 0,
+    )
+
+
+def _get_encoding(model):
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding('o200k_base')
+    return _encodings[model]
+
+
+def count_tokens(text, model=None):
+    """
+    Count (or estimate) the tokens in text.
+
+    Args:
+        text (str): Text to count
+        model (str): Model whose tokenizer to use, if tiktoken is installed
+
+    Returns:
+        int: Token count
+    """
+    if not text:
+        return 0
+    if tiktoken is not None:
+        try:
+            return len(_get_encoding(model or 'gpt-4o').encode(text))
+        except Exception:
+            pass
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def empty_usage():
+    return {'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0, 'estimated': False}
+
+
+def resolve_usage(reported, model, prompt_parts, output_text):
+    """
+    Build the usage dict for one generation.
+
+    Args:
+        reported (StreamUsage | None): Usage from the final stream chunk
+        model (str): Model used
+        prompt_parts (list): Message contents sent to the model
+        output_text (str): Generated text
+
+    Returns:
+        dict: Usage dict (estimated=True when reported is None)
+    """
+    if reported is not None:
+        return {
+            'prompt_tokens': reported.prompt_tokens,
+            'completion_tokens': reported.completion_tokens,
+            'cached_tokens': reported.cached_tokens,
+            'estimated': False,
+        }
+
+    prompt_tokens = sum(count_tokens(part, model) + MESSAGE_OVERHEAD_TOKENS for part in prompt_parts)
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': count_tokens(output_text, model),
+        'cached_tokens': 0,
+        'estimated': True,
+    }
+
+
+def get_usage_summary(generations, days=30):
+    """
+    Aggregate token usage per day and per generation type.
+    Runs as GROUP BY queries over the (user, created_at) index.
+
+    Args:
+        generations (QuerySet): AIGeneration rows to aggregate (e.g. one user's)
+        days (int): Window size, counted back from today
+
+    Returns:
+        dict: {
+            'days': int,
+            'totals': {...},
+            'by_day': [{'date': date, ...}],
+            'by_type': [{'generation_type': str, ...}],
+            'by_prompt_version': [{'generation_type': str, 'prompt_version': int,
+                                   'cached_token_ratio': float, 'avg_first_token_ms': float, ...}]
+        }
+    """
+    since = timezone.now() - timedelta(days=days)
+    window = generations.filter(created_at__gte=since)
+    sums = {
+        'generations': Count('id'),
+        'prompt_tokens': Sum('prompt_tokens', default=0),
+        'completion_tokens': Sum('completion_tokens', default=0),
+        'cached_tokens': Sum('cached_tokens', default=0),
+        'total_tokens': Sum('tokens_used', default=0),
+        'input_tokens_saved': Sum('input_tokens_saved', default=0),
+        'estimated': Count('id', filter=Q(tokens_estimated=True)),
+    }
+
+    return {
+        'days': days,
+        'totals': window.aggregate(**sums),
+        'by_day': list(
+            window.annotate(date=TruncDate('created_at'))
+            .values('date').annotate(**sums).order_by('date')
+        ),
+        'by_type': list(
+            window.values('generation_type').annotate(**sums).order_by('generation_type')
+        ),
+        'by_prompt_version': get_prompt_cache_stats(window),
+    }
+
+
+def get_prompt_cache_stats(generations):
+    """
+    Provider prompt-cache effectiveness per generation type and prompt version.
+    Compares cached input tokens and time to first token across template
+    versions (cache hits and coalesced requests made no upstream call and are excluded).
+
+    Returns:
+        list: [{'generation_type': str, 'prompt_version': int, 'generations': int,
+                'prompt_tokens': int, 'cached_tokens': int, 'cached_token_ratio': float,
+                'avg_first_token_ms': float | None}]
+    """
+    rows = (
+        generations.filter(cache_hit=False, prompt_tokens__gt=0)
+        .values('generation_type', 'prompt_version')
+        .annotate(
+            generations=Count('id'),
+            prompt_tokens=Sum('prompt_tokens', default=0),
+            cached_tokens=Sum('cached_tokens', default=0),
+            avg_first_token_ms=Avg('first_token_ms'),
+        )
+        .order_by('generation_type', 'prompt_version')
+    )
+
+    stats = []
+    for row in rows:
+        row['cached_token_ratio'] = round(row['cached_tokens'] / row['prompt_tokens'], 4) if row['prompt_tokens'] else 0.0
+        if row['avg_first_token_ms'] is not None:
+            row['avg_first_token_ms'] = round(row['avg_first_token_ms'], 1)
+        stats.append(row)
+    return stats
+
+
+def get_usage_by_user(generations, days=30):
+    """
+    Aggregate token usage per user (admin reporting).
+
+    Returns:
+        list: [{'user_id': int, 'user__username': str, 'generations': int, ...}]
+    """
+    since = timezone.now() - timedelta(days=days)
+    return list(
+        generations.filter(created_at__gte=since)
+        .values('user_id', 'user__username')
+        .annotate(
+            generations=Count('id'),
+            prompt_tokens=Sum('prompt_tokens', default=0),
+            completion_tokens=Sum('completion_tokens', default=0),
+            cached_tokens=Sum('cached_tokens', default=0),
+            total_tokens=Sum('tokens_used', default=0),
+        )
+        .order_by('-total_tokens')
+    )
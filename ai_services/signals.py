@@ -0,0 +1,45 @@
+"""
+Signal handlers keeping derived AI data in sync with its sources.
+"""
+import logging
+
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from applications.models import JobApplication
+from .services.batch_ranking import refresh_term_vector
+from .services.skill_index import index_application_skills, remove_application_skills
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=JobApplication)
+def refresh_job_term_vector(sender, instance, raw=False, **kwargs):
+    """Re-tokenize the job description when an application is saved (no-op if unchanged)"""
+    if raw:
+        return
+    try:
+        refresh_term_vector(instance)
+    except Exception as e:
+        # Ranking backfills missing vectors; never fail the application save
+        logger.warning("Term vector refresh failed for application %s: %s", instance.pk, e)
+
+
+@receiver(post_save, sender=JobApplication)
+def update_skill_index(sender, instance, raw=False, **kwargs):
+    """Re-index the skills named in the job description when an application is saved"""
+    if raw:
+        return
+    try:
+        index_application_skills(instance)
+    except Exception as e:
+        logger.warning("Skill indexing failed for application %s: %s", instance.pk, e)
+
+
+@receiver(pre_delete, sender=JobApplication)
+def remove_from_skill_demand(sender, instance, **kwargs):
+    """Drop a deleted application from the skill demand counts"""
+    try:
+        remove_application_skills(instance)
+    except Exception as e:
+        logger.warning("Skill demand update failed for application %s: %s", instance.pk, e)
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase, override_settings
+
+from ai_services.management.commands._openai_stub import OpenAIStubServer
+from ai_services.models import AIGeneration
+from ai_services.services import application_pack
+from ai_services.services.application_pack import DEFAULT_ARTIFACTS, stream_application_pack
+from ai_services.services.openai_client import close_openai_clients
+
+
+RESUME = "Jane Doe\nSenior Python developer with Django, PostgreSQL and Docker experience. Built REST APIs."
+JOB_DESCRIPTION = "Backend engineer: Python, Django, AWS and Kubernetes to build scalable APIs."
+
+
+class ApplicationPackTests(TransactionTestCase):
+    # Worker threads write the generations on their own connections
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = OpenAIStubServer(reply='Stub artifact output', latency=0.01).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user('packer')
+        close_openai_clients()
+        self.addCleanup(close_openai_clients)
+        settings_override = override_settings(
+            OPENAI_BASE_URL=self.server.base_url, OPENAI_API_KEY='sk-test',
+            GENERATION_CACHE_ENABLED=False, GENERATION_WRITE_BEHIND=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def run_pack(self, artifacts=None):
+        events = list(stream_application_pack(self.user, RESUME, JOB_DESCRIPTION, artifacts=artifacts))
+        self.assertEqual(events[0]['event'], 'start')
+        self.assertEqual(events[-1]['event'], 'complete')
+        self.assertNotIn('complete', [event['event'] for event in events[:-1]])
+        return events[1:-1]
+
+    def test_every_artifact_streams_and_ends_once(self):
+        events = self.run_pack()
+
+        for artifact in DEFAULT_ARTIFACTS:
+            with self.subTest(artifact=artifact):
+                own = [event for event in events if event['artifact'] == artifact]
+                self.assertEqual([event['event'] for event in own][-1], 'done')
+                self.assertEqual(sum(1 for event in own if event['event'] in ('done', 'error')), 1)
+                text = ''.join(event['data'] for event in own if event['event'] == 'chunk')
+                self.assertEqual(text.strip(), 'Stub artifact output')
+
+        generations = AIGeneration.objects.filter(user=self.user)
+        self.assertEqual(sorted(generations.values_list('generation_type', flat=True)), sorted(DEFAULT_ARTIFACTS))
+        done_ids = {event['generation_id'] for event in events if event['event'] == 'done'}
+        self.assertEqual(done_ids, set(generations.values_list('id', flat=True)))
+
+    def test_failed_artifact_reports_an_error_and_the_rest_complete(self):
+        def failing(resume_text, job_description, usage=None):
+            raise RuntimeError('upstream unavailable')
+            yield
+
+        with mock.patch.dict(application_pack.ARTIFACT_STREAMS, {'cover_letter': failing}):
+            events = self.run_pack(['match_score', 'cover_letter'])
+
+        endings = {event['artifact']: event for event in events if event['event'] in ('done', 'error')}
+        self.assertEqual(len([e for e in events if e['event'] in ('done', 'error')]), 2)
+        self.assertEqual(endings['cover_letter'], {
+            'event': 'error', 'artifact': 'cover_letter', 'error': 'upstream unavailable',
+        })
+        self.assertEqual(endings['match_score']['event'], 'done')
+        self.assertEqual(list(AIGeneration.objects.values_list('generation_type', flat=True)), ['match_score'])
@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ai_services.management.commands._openai_stub import OpenAIStubServer
+from ai_services.models import AIGeneration
+from ai_services.services.openai_client import close_openai_clients
+from ai_services.services.text_normalization import reset_fingerprints
+
+
+RESUME = b"Jane Doe\nSenior Python developer with Django, PostgreSQL and Docker experience. Built REST APIs.\n"
+JOB_DESCRIPTION = "We are hiring a backend engineer with Python, Django, AWS and Kubernetes skills to build scalable APIs."
+
+
+class AsyncStreamingViewTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = OpenAIStubServer(reply='Match Score: 77% - strong backend fit').start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user('streamer')
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        # Fingerprints not loaded yet: the first request reads them from the database
+        reset_fingerprints()
+        close_openai_clients()
+
+    def tearDown(self):
+        close_openai_clients()
+
+    async def test_streams_the_generation_and_records_it(self):
+        with override_settings(OPENAI_BASE_URL=self.server.base_url, OPENAI_API_KEY='sk-test',
+                               GENERATION_WRITE_BEHIND=False):
+            response = await AsyncClient().post(
+                '/api/ai/async/match-score/',
+                {'file': SimpleUploadedFile('resume.txt', RESUME, content_type='text/plain'),
+                 'job_description': JOB_DESCRIPTION},
+                headers=self.headers,
+            )
+            body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('[ERROR', body)
+        self.assertIn('Match Score: 77%', body)
+        self.assertEqual(await AIGeneration.objects.filter(user=self.user).acount(), 1)
+
+    async def test_requires_authentication(self):
+        response = await AsyncClient().post('/api/ai/async/match-score/', {'job_description': JOB_DESCRIPTION})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_rejects_a_non_numeric_application_id(self):
+        response = await AsyncClient().post(
+            '/api/ai/async/match-score/',
+            {'file': SimpleUploadedFile('resume.txt', RESUME, content_type='text/plain'),
+             'job_description': JOB_DESCRIPTION, 'application_id': 'abc'},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 400)
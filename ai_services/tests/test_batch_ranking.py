@@ -0,0 +1,69 @@
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from applications.models import Company, JobApplication
+from ai_services.models import JobTermVector
+from ai_services.services.batch_ranking import get_user_matrix, invalidate_user_matrix, rank_applications
+from ai_services.services.local_match import combine_score, combine_scores, reset_idf_model
+
+
+RESUME = "Backend developer: Python, Django, PostgreSQL and Docker. Built REST APIs for payments."
+
+
+class UserMatrixTests(TestCase):
+
+    def setUp(self):
+        reset_idf_model()
+        self.user = User.objects.create_user('ranker')
+        self.company = Company.objects.create(name='Acme')
+        self.addCleanup(invalidate_user_matrix, self.user.id)
+        self.backend = self.add('Backend Engineer', 'Build payment APIs with Python, Django and PostgreSQL.')
+        self.frontend = self.add('Frontend Engineer', 'Build dashboards with React, TypeScript and CSS.')
+
+    def add(self, position, job_description):
+        return JobApplication.objects.create(
+            user=self.user, company=self.company, position=position, job_description=job_description,
+        )
+
+    def test_matrix_is_reused_until_vectors_change(self):
+        matrix = get_user_matrix(self.user)
+        self.assertIs(get_user_matrix(self.user), matrix)
+
+        added = self.add('Data Engineer', 'Build pipelines with Python, Spark and Airflow.')
+        rebuilt = get_user_matrix(self.user)
+        self.assertIsNot(rebuilt, matrix)
+        self.assertIn(added.id, rebuilt.application_ids)
+
+        self.frontend.job_description = 'Build payment APIs with Python, Django, PostgreSQL and Docker.'
+        self.frontend.save()
+        self.assertIsNot(get_user_matrix(self.user), rebuilt)
+
+    def test_deleted_application_drops_out_of_the_ranking(self):
+        self.assertEqual(len(rank_applications(self.user, RESUME)[0]), 2)
+        self.backend.delete()
+        ranking, _, _ = rank_applications(self.user, RESUME)
+        self.assertEqual([row['application_id'] for row in ranking], [self.frontend.id])
+
+    def test_missing_vectors_are_backfilled(self):
+        JobTermVector.objects.filter(user=self.user).delete()
+        ranking, _, _ = rank_applications(self.user, RESUME)
+        self.assertEqual(ranking[0]['application_id'], self.backend.id)
+        self.assertEqual(JobTermVector.objects.filter(user=self.user).count(), 2)
+
+    @override_settings(RANKING_MATRIX_CACHE_SIZE=1)
+    def test_least_recently_used_matrix_is_evicted(self):
+        other = User.objects.create_user('other')
+        self.addCleanup(invalidate_user_matrix, other.id)
+        matrix = get_user_matrix(self.user)
+        get_user_matrix(other)
+        self.assertIsNot(get_user_matrix(self.user), matrix)
+
+
+class CombineScoresTests(SimpleTestCase):
+
+    def test_matches_combine_score(self):
+        coverage = np.array([np.nan, 0.0, 0.5, 1.0, 0.25, np.nan])
+        similarity = np.array([0.0, 0.1, 0.2, 0.9, 0.125, 0.35])
+        expected = [combine_score(None if np.isnan(c) else c, s) for c, s in zip(coverage, similarity)]
+        self.assertEqual(combine_scores(coverage, similarity).tolist(), expected)
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from applications.models import Company, JobApplication
+from ai_services.services.bulk_import import find_duplicates, parse_urls, stream_bulk_import
+
+
+def job_details(url):
+    return {
+        'job_url': url,
+        'company_name': 'Acme Robotics',
+        'position': 'Backend Engineer',
+        'description': 'Build APIs with Python and Django.',
+        'location': 'Remote',
+        'salary_range': None,
+        'extraction': 'structured',
+        'cache': {'status': 'miss'},
+    }
+
+
+class BulkImportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('importer')
+        self.saved = JobApplication.objects.create(
+            user=self.user,
+            company=Company.objects.create(name='Initech'),
+            position='SRE',
+            application_url='https://boards.greenhouse.io/initech/jobs/1234',
+        )
+
+    def test_parse_urls_keeps_repeats(self):
+        self.assertEqual(
+            parse_urls('https://example.com/a\nhttps://example.com/a https://example.com/b'),
+            ['https://example.com/a', 'https://example.com/a', 'https://example.com/b'],
+        )
+        with self.assertRaises(ValueError):
+            parse_urls(['ftp://example.com/a'])
+
+    def test_duplicates_match_by_canonical_url(self):
+        urls = [
+            'http://boards.greenhouse.io/initech/jobs/1234?utm_source=linkedin',
+            'https://www.example.com/jobs/42?utm_campaign=spring',
+            'https://example.com/jobs/42/',
+            'https://example.com/jobs/43',
+        ]
+        pending, duplicates = find_duplicates(self.user, urls)
+        self.assertEqual(pending, [urls[1], urls[3]])
+        self.assertEqual(duplicates, [(urls[0], self.saved.pk), (urls[2], None)])
+
+    @override_settings(BULK_IMPORT_PER_DOMAIN_INTERVAL=0)
+    def test_stream_reports_every_submitted_url(self):
+        urls = parse_urls([
+            'https://example.com/jobs/42',
+            'https://example.com/jobs/42',
+            'https://boards.greenhouse.io/initech/jobs/1234?gh_src=abc',
+        ])
+        with mock.patch('ai_services.services.bulk_import.get_job_details', side_effect=job_details) as fetched:
+            events = list(stream_bulk_import(self.user, urls))
+
+        self.assertEqual(fetched.call_count, 1)
+        self.assertEqual(events[0], {'event': 'start', 'total': 3, 'duplicates': 2})
+        self.assertEqual(
+            [(e['url'], e['application_id']) for e in events if e['event'] == 'duplicate'],
+            [(urls[1], None), (urls[2], self.saved.pk)],
+        )
+        self.assertEqual(events[-1]['event'], 'complete')
+        self.assertEqual((events[-1]['created'], events[-1]['duplicates']), (1, 2))
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 2)
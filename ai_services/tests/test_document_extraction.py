@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from documents.models import Document
+from documents.services import text_extraction
+from documents.services.text_extraction import _extract_in_background, get_document_text
+
+
+RESUME = b"Jane Doe\nSenior Python developer with Django and PostgreSQL experience.\n"
+
+
+class DocumentExtractionClaimTests(TransactionTestCase):
+    # The background extraction runs on its own connection
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.document = Document.objects.create(
+            user=User.objects.create_user('uploader'), document_type='resume', file_name='resume.txt',
+            file=SimpleUploadedFile('resume.txt', RESUME),
+        )
+        real_extract = text_extraction.extract_document_text
+        self.calls = []
+        self.claimed = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+        def counted(document):
+            self.calls.append(threading.current_thread().name)
+            self.claimed.set()
+            self.release.wait(5)
+            return real_extract(document)
+
+        patcher = mock.patch.object(text_extraction, 'extract_document_text', side_effect=counted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reader_waits_for_the_background_extraction(self):
+        self.release.clear()
+        worker = threading.Thread(target=_extract_in_background, args=(self.document.id,), name='background')
+        worker.start()
+        self.assertTrue(self.claimed.wait(5))
+        threading.Timer(0.2, self.release.set).start()
+
+        # The caller's instance still says 'pending'
+        self.assertIn('Senior Python developer', get_document_text(self.document))
+        worker.join(5)
+
+        self.assertEqual(self.calls, ['background'])
+        self.assertEqual(Document.objects.get(id=self.document.id).extraction_status, 'ready')
+
+    def test_background_skips_a_document_already_claimed(self):
+        self.assertIn('Senior Python developer', get_document_text(self.document))
+        _extract_in_background(self.document.id)
+        self.assertEqual(len(self.calls), 1)
+
+    @override_settings(DOCUMENT_EXTRACTION_CLAIM_TIMEOUT=60)
+    def test_stale_claim_is_taken_over(self):
+        Document.objects.filter(id=self.document.id).update(
+            extraction_status='extracting', extracted_at=timezone.now() - timedelta(minutes=5),
+        )
+        self.document.refresh_from_db()
+
+        self.assertIn('Senior Python developer', get_document_text(self.document))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.document.extraction_status, 'ready')
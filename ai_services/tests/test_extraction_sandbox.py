@@ -0,0 +1,53 @@
+from django.test import SimpleTestCase
+
+from ai_services.services.extraction_sandbox import (
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TRUNCATED,
+    ExtractionSandbox,
+)
+from ai_services.tests.test_pdf_parallel import blank_pdf
+
+
+RESUME = b"Jane Doe\nSenior Python developer with Django and PostgreSQL experience.\n"
+
+
+class ExtractionSandboxTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sandbox = ExtractionSandbox(size=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sandbox.shutdown()
+        super().tearDownClass()
+
+    def extract(self, data, file_ext, max_pages=10):
+        return self.sandbox.extract(data, file_ext, timeout=30, max_pages=max_pages, max_rss_bytes=0)
+
+    def test_text_document(self):
+        result = self.extract(RESUME, '.txt')
+        self.assertEqual(result['status'], STATUS_OK)
+        self.assertIn('Senior Python developer', result['text'])
+
+    def test_page_cutoff_truncates(self):
+        result = self.extract(blank_pdf(5), '.pdf', max_pages=2)
+        self.assertEqual(result['status'], STATUS_TRUNCATED)
+        self.assertEqual((result['pages_extracted'], result['page_count']), (2, 5))
+
+    def test_parser_error_keeps_the_worker(self):
+        worker = self.sandbox._workers[0]
+        result = self.extract(b'not a pdf', '.pdf')
+        self.assertEqual(result['status'], STATUS_ERROR)
+        self.assertIs(self.sandbox._workers[0], worker)
+
+    def test_dead_worker_is_replaced(self):
+        worker = self.sandbox._workers[0]
+        worker.process.kill()
+        worker.process.join()
+
+        self.assertEqual(self.extract(RESUME, '.txt')['status'], STATUS_ERROR)
+        self.assertIsNot(self.sandbox._workers[0], worker)
+        self.assertEqual(self.extract(RESUME, '.txt')['status'], STATUS_OK)
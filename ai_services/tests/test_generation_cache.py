@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from ai_services.services import openai_service
+from ai_services.services.generation_cache import build_cache_key, cached_stream
+
+
+RESUME = "Jane Doe\nSenior Python developer, Django and PostgreSQL."
+JOB_DESCRIPTION = "Backend engineer: Python, Django, Kubernetes."
+
+
+def run(generation_type, output, reuse=None, resume=RESUME):
+    info = {}
+    calls = []
+
+    def factory():
+        calls.append(1)
+        yield from output
+
+    chunks = list(cached_stream(generation_type, resume, JOB_DESCRIPTION, factory, reuse=reuse, info=info))
+    return ''.join(chunks), info['cache_hit'], len(calls)
+
+
+class GenerationCacheTests(TestCase):
+
+    def test_key_ignores_whitespace_but_not_content(self):
+        key = build_cache_key('match_score', RESUME, JOB_DESCRIPTION)
+        reformatted = "Jane  Doe\n\n Senior Python developer,  Django and PostgreSQL. "
+        self.assertEqual(key, build_cache_key('match_score', reformatted, JOB_DESCRIPTION))
+        self.assertNotEqual(key, build_cache_key('match_score', RESUME + " Go.", JOB_DESCRIPTION))
+        self.assertNotEqual(key, build_cache_key('cover_letter', RESUME, JOB_DESCRIPTION))
+
+    def test_key_changes_with_the_model(self):
+        key = build_cache_key('match_score', RESUME, JOB_DESCRIPTION)
+        changed = {**openai_service.GENERATION_SETTINGS['match_score'], 'model': 'other-model'}
+        with mock.patch.dict(openai_service.GENERATION_SETTINGS, {'match_score': changed}):
+            self.assertNotEqual(key, build_cache_key('match_score', RESUME, JOB_DESCRIPTION))
+
+    def test_default_policy_reuses_unless_declined(self):
+        self.assertEqual(run('match_score', ['Score: ', '80%']), ('Score: 80%', False, 1))
+        self.assertEqual(run('match_score', ['Score: 55%']), ('Score: 80%', True, 0))
+        self.assertEqual(run('match_score', ['Score: 55%'], reuse=False), ('Score: 55%', False, 1))
+
+    def test_opt_in_policy_reuses_only_when_asked(self):
+        run('cover_letter', ['Dear hiring manager'])
+        self.assertEqual(run('cover_letter', ['Hello'])[1:], (False, 1))
+        self.assertEqual(run('cover_letter', ['Again'], reuse=True), ('Hello', True, 0))
+
+    @override_settings(GENERATION_CACHE_ENABLED=False)
+    def test_disabled_cache_always_generates(self):
+        run('match_score', ['Score: 80%'])
+        self.assertEqual(run('match_score', ['Score: 55%']), ('Score: 55%', False, 1))
@@ -0,0 +1,78 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import TransactionTestCase
+
+from ai_services.models import AIGeneration
+from ai_services.services.generation_records import build_generation, save_generation
+from ai_services.services.generation_writer import GenerationWriter
+from ai_services.services.metrics import get_counter_group
+
+
+def lost():
+    return get_counter_group('generation_writer').get('lost', 0)
+
+
+class GenerationWriterTests(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('writer')
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        # Stopped right away: the tests drive _write() and _replay_spool() themselves
+        self.writer = GenerationWriter(retries=1, spool_dir=spool_dir.name)
+        self.writer.stop()
+
+    def generation(self, **fields):
+        return build_generation(**{
+            'user': self.user,
+            'generation_type': 'cover_letter',
+            'resume_text': 'Python developer',
+            'job_description': 'Backend engineer',
+            'output_text': 'Dear hiring manager',
+            **fields,
+        })
+
+    def test_invalid_row_is_dropped_without_retrying(self):
+        before = lost()
+        with mock.patch('ai_services.services.generation_writer.time.sleep') as slept:
+            written = self.writer._write([self.generation(), self.generation(application_id='abc')])
+
+        self.assertTrue(written)
+        slept.assert_not_called()
+        self.assertEqual(AIGeneration.objects.count(), 1)
+        self.assertEqual(lost() - before, 1)
+        self.assertEqual(self.writer.spool_files(), [])
+
+    def test_unavailable_database_spools_then_replays(self):
+        batch = [self.generation(), self.generation(output_text='Second letter')]
+        created_at = batch[0].created_at
+        with mock.patch.object(AIGeneration.objects, 'bulk_create', side_effect=OperationalError('down')), \
+                mock.patch('ai_services.services.generation_writer.time.sleep'):
+            self.assertFalse(self.writer._write(batch))
+        self.assertEqual(len(self.writer.spool_files()), 1)
+        self.assertEqual(AIGeneration.objects.count(), 0)
+
+        self.writer._replay_spool()
+        self.assertEqual(self.writer.spool_files(), [])
+        self.assertEqual(
+            sorted(AIGeneration.objects.values_list('output_text', flat=True)),
+            ['Dear hiring manager', 'Second letter'],
+        )
+        # Spooled timestamps keep millisecond precision
+        self.assertAlmostEqual(
+            AIGeneration.objects.order_by('id').first().created_at, created_at, delta=timedelta(milliseconds=1),
+        )
+
+    def test_failed_save_is_logged_and_counted(self):
+        before = lost()
+        with self.assertLogs('ai_services.services.generation_records', 'ERROR'):
+            saved = save_generation(
+                user=self.user, application_id='abc', generation_type='cover_letter',
+                resume_text='Python developer', job_description='Backend engineer', output_text='Dear hiring manager',
+            )
+        self.assertIsNone(saved)
+        self.assertEqual(lost() - before, 1)
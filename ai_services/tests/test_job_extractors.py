@@ -0,0 +1,76 @@
+from unittest import skipIf
+from urllib.parse import urlparse
+
+from django.test import SimpleTestCase, override_settings
+
+from ai_services.management.commands.benchmark_extractors import score
+from ai_services.management.commands.benchmark_job_parsing import DEFAULT_FIXTURE_DIR, load_fixtures, replay_stream
+from ai_services.services.job_extractors import get_extractor, registry
+from ai_services.services.job_scraper import _parse_lxml, lxml_html
+
+
+class ExtractorRoutingTests(SimpleTestCase):
+
+    def test_hosts_route_by_longest_registered_suffix(self):
+        cases = {
+            'www.linkedin.com': 'linkedin',
+            'uk.linkedin.com': 'linkedin',
+            'boards.greenhouse.io': 'greenhouse',
+            'jobs.lever.co': 'lever',
+            'acme.wd5.myworkdayjobs.com': 'workday',
+            'ACME.WD1.MYWORKDAYJOBS.COM.': 'workday',
+            'careers.example.com': 'generic',
+            'notlinkedin.com': 'generic',
+            '': 'generic',
+            None: 'generic',
+        }
+        for host, name in cases.items():
+            with self.subTest(host=host):
+                self.assertEqual(get_extractor(host).name, name)
+
+    def test_fallback_cascade_ends_at_generic(self):
+        chain = registry.cascade(registry.get('workday'))
+        self.assertEqual([extractor.name for extractor in chain], ['workday', 'generic'])
+        self.assertEqual(registry.cascade(registry.get('generic')), [registry.get('generic')])
+
+
+@skipIf(lxml_html is None, 'lxml is not installed')
+class ExtractorFixtureTests(SimpleTestCase):
+
+    def test_fixture_pages_are_routed_and_extracted(self):
+        for name, entry, content in load_fixtures(DEFAULT_FIXTURE_DIR):
+            with self.subTest(page=name):
+                extractor = get_extractor(urlparse(entry['url']).hostname)
+                if 'extractor' in entry:
+                    self.assertEqual(extractor.name, entry['extractor'])
+                result = registry.extract(_parse_lxml(content), extractor)
+                self.assertEqual([field for field, ok in score(result, entry) if not ok], [])
+
+
+@skipIf(lxml_html is None, 'lxml is not installed')
+class EarlyStopTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.fixtures = {name: (entry, content) for name, entry, content in load_fixtures(DEFAULT_FIXTURE_DIR)}
+
+    def replay(self, name):
+        entry, content = self.fixtures[name]
+        result, read, _ = replay_stream(content, entry['url'])
+        return result, read, len(content)
+
+    def test_json_ld_after_the_description_is_still_read(self):
+        result, read, size = self.replay('greenhouse_jsonld_footer.html')
+        self.assertEqual(read, size)
+        self.assertTrue(result['structured']['confident'])
+
+    def test_json_ld_before_the_description_still_stops_early(self):
+        result, read, size = self.replay('greenhouse_jsonld_sre.html')
+        self.assertLess(read, size)
+        self.assertTrue(result['structured']['confident'])
+
+    @override_settings(SCRAPER_STRUCTURED_FAST_PATH=False)
+    def test_without_the_fast_path_json_ld_is_not_waited_for(self):
+        _, read, size = self.replay('greenhouse_jsonld_footer.html')
+        self.assertLess(read, size)
@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from applications.models import Company, JobApplication
+from ai_services.services.batch_ranking import compute_term_vector, rank_applications
+from ai_services.services import local_match
+from ai_services.services.local_match import (
+    IDFModel,
+    extract_job_terms,
+    get_idf_model,
+    reset_idf_model,
+    score_match,
+)
+
+
+RESUME = "Backend developer: Python, Django, PostgreSQL and Docker. Built REST APIs for payments."
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer to build payment APIs with Python, Django and Kubernetes.\n"
+    "Acme is an equal opportunity employer and does not discriminate on the basis of veteran status.\n"
+    "We offer dental, vision and 401(k) matching."
+)
+
+
+class LocalMatchTests(TestCase):
+
+    def setUp(self):
+        reset_idf_model()
+        self.user = User.objects.create_user('ranker')
+        company = Company.objects.create(name='Acme')
+        self.application = JobApplication.objects.create(
+            user=self.user, company=company, position='Backend Engineer', job_description=JOB_DESCRIPTION,
+        )
+
+    def test_boilerplate_is_not_a_missing_term(self):
+        result = score_match(RESUME, JOB_DESCRIPTION)
+        for term in ('equal', 'employer', 'veteran', 'dental'):
+            self.assertNotIn(term, result['missing_terms'])
+        self.assertIn('kubernetes', result['missing_skills'])
+        self.assertIn('python', result['matching_skills'])
+
+    def test_term_vector_uses_the_same_normalization(self):
+        terms, skills = compute_term_vector(JOB_DESCRIPTION)
+        self.assertEqual(set(terms), set(extract_job_terms(JOB_DESCRIPTION)))
+        self.assertNotIn('employer', terms)
+        self.assertEqual(skills, ['django', 'kubernetes', 'python'])
+
+    def test_ranking_agrees_with_fast_mode(self):
+        ranking, _, _ = rank_applications(self.user, RESUME)
+        self.assertEqual(ranking[0]['application_id'], self.application.id)
+        self.assertEqual(ranking[0]['score'], score_match(RESUME, JOB_DESCRIPTION)['score'])
+
+    def test_idf_model_uses_the_job_normalization(self):
+        model = IDFModel([JOB_DESCRIPTION])
+        self.assertEqual(set(model.document_frequency), set(extract_job_terms(JOB_DESCRIPTION)))
+
+
+class IDFModelCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        reset_idf_model()
+        self.addCleanup(reset_idf_model)
+
+    def test_requests_are_served_while_the_full_model_builds(self):
+        release = threading.Event()
+        warm = IDFModel([JOB_DESCRIPTION])
+        full = IDFModel([JOB_DESCRIPTION, RESUME])
+
+        def build(limit=None):
+            if limit == 1:
+                return warm
+            release.wait(5)
+            return full
+
+        with mock.patch.object(local_match, 'IDF_WARM_DOCS', 1), \
+                mock.patch.object(local_match, 'build_idf_model', side_effect=build):
+            self.assertIs(get_idf_model(), warm)
+            # The full build is blocked: callers keep getting the warm model
+            self.assertIs(get_idf_model(), warm)
+            release.set()
+            deadline = time.monotonic() + 5
+            while get_idf_model() is warm and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertIs(get_idf_model(), full)
@@ -0,0 +1,21 @@
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ai_services.services import openai_client
+
+
+class ClientOptionsTests(SimpleTestCase):
+
+    @override_settings(OPENAI_API_KEY='')
+    def test_missing_key_does_not_raise(self):
+        environ = {name: value for name, value in os.environ.items() if name != 'OPENAI_API_KEY'}
+        with mock.patch.dict(os.environ, environ, clear=True):
+            self.assertEqual(openai_client.get_client_options()['api_key'], '')
+
+    @override_settings(OPENAI_API_KEY='sk-settings', OPENAI_BASE_URL='http://127.0.0.1:9/v1')
+    def test_options_come_from_settings(self):
+        options = openai_client.get_client_options()
+        self.assertEqual(options['api_key'], 'sk-settings')
+        self.assertEqual(options['base_url'], 'http://127.0.0.1:9/v1')
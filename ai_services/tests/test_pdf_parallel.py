@@ -0,0 +1,34 @@
+import io
+from unittest import mock
+
+import PyPDF2
+from django.test import SimpleTestCase, override_settings
+
+from ai_services.services import pdf_parallel
+
+
+def blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class PdfParallelTests(SimpleTestCase):
+
+    @override_settings(PDF_PARALLEL_EXTRACTION=True, PDF_PARALLEL_MAX_WORKERS=1)
+    def test_single_worker_is_never_parallel(self):
+        self.assertFalse(pdf_parallel.should_parallelize(100))
+
+    def test_single_worker_extracts_serially_without_a_pool(self):
+        with mock.patch.object(pdf_parallel, '_get_pool') as get_pool:
+            pages = pdf_parallel.extract_pages_parallel(blank_pdf(3), 3, max_workers=1)
+        get_pool.assert_not_called()
+        self.assertEqual(pages, ['', '', ''])
+
+    def test_page_ranges_cover_every_page_once(self):
+        ranges = pdf_parallel._page_ranges(10, 4)
+        covered = [page for start, stop in ranges for page in range(start, stop)]
+        self.assertEqual(covered, list(range(10)))
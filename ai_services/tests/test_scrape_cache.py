@@ -0,0 +1,102 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ai_services.models import ScrapedJobCache
+from ai_services.services.scrape_cache import canonicalize_job_url, get_job_details
+
+
+LEVER_ID = '0f4c7d2e-1a2b-4c3d-8e9f-0a1b2c3d4e5f'
+
+
+class CanonicalizeJobUrlTests(SimpleTestCase):
+
+    def assertSameKey(self, canonical, *urls):
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_job_url(url), canonical)
+
+    def test_tracking_params_fragment_scheme_and_www_are_ignored(self):
+        self.assertSameKey(
+            'https://example.com/careers/jobs/42?team=platform',
+            'https://example.com/careers/jobs/42?team=platform',
+            'http://www.example.com/careers/jobs/42/?utm_source=linkedin&team=platform&gclid=abc',
+            'https://EXAMPLE.com//careers/jobs/42?ref=feed&team=platform#apply',
+        )
+
+    def test_linkedin_urls_use_the_job_id(self):
+        self.assertSameKey(
+            'https://www.linkedin.com/jobs/view/3812345678/',
+            'https://www.linkedin.com/jobs/view/3812345678/?trk=public_jobs&refId=abc',
+            'https://uk.linkedin.com/jobs/view/senior-backend-engineer-at-acme-3812345678',
+            'https://www.linkedin.com/jobs/collections/recommended/?currentJobId=3812345678',
+        )
+
+    def test_indeed_urls_use_the_job_key(self):
+        self.assertSameKey(
+            'https://www.indeed.com/viewjob?jk=a1b2c3d4e5f6a7b8',
+            'https://www.indeed.com/viewjob?jk=A1B2C3D4E5F6A7B8&from=serp&vjs=3',
+            'https://m.indeed.com/jobs?q=python&vjk=a1b2c3d4e5f6a7b8',
+        )
+
+    def test_greenhouse_and_lever_urls(self):
+        self.assertSameKey(
+            'https://boards.greenhouse.io/acme/jobs/4012345',
+            'https://boards.greenhouse.io/Acme/jobs/4012345?gh_src=abc',
+            'https://job-boards.greenhouse.io/acme/jobs/4012345/',
+        )
+        self.assertSameKey(
+            f'https://jobs.lever.co/acme/{LEVER_ID}',
+            f'https://jobs.lever.co/acme/{LEVER_ID}/apply?lever-source=LinkedIn',
+        )
+
+    def test_uncacheable_urls(self):
+        self.assertIsNone(canonicalize_job_url('ftp://example.com/job'))
+        self.assertIsNone(canonicalize_job_url('not a url'))
+        self.assertIsNone(canonicalize_job_url('https://example.com/' + 'a' * 600))
+
+
+def scraped(url):
+    return {
+        'job_url': url,
+        'company_name': 'Acme',
+        'position': 'Backend Engineer',
+        'description': 'Build APIs.',
+        'tracking_info': f'Track your application at: {url}',
+        'extraction': 'structured',
+        'fetch': {'total_ms': 120},
+    }
+
+
+@mock.patch('ai_services.services.scrape_cache.scrape_job_details', side_effect=scraped)
+class GetJobDetailsTests(TestCase):
+
+    def test_repeat_paste_is_served_from_the_cache(self, scrape):
+        first = get_job_details('https://www.linkedin.com/jobs/view/3812345678/?trk=a')
+        second = get_job_details('https://www.linkedin.com/jobs/view/3812345678/?trk=b')
+
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual((first['cache']['status'], second['cache']['status']), ('miss', 'hit'))
+        self.assertEqual(second['job_url'], 'https://www.linkedin.com/jobs/view/3812345678/?trk=b')
+        self.assertEqual(second['tracking_info'], 'Track your application at: ' + second['job_url'])
+        self.assertNotIn('fetch', second)
+
+    def test_stale_entry_is_served_and_refreshed_once(self, scrape):
+        url = 'https://boards.greenhouse.io/acme/jobs/4012345'
+        get_job_details(url)
+        ScrapedJobCache.objects.update(fresh_until=timezone.now() - timedelta(minutes=1))
+
+        with mock.patch('ai_services.services.scrape_cache.threading.Thread') as thread:
+            first = get_job_details(url)
+            second = get_job_details(url)
+
+        self.assertEqual((first['cache']['status'], second['cache']['status']), ('stale', 'stale'))
+        self.assertEqual(thread.call_count, 1)
+        self.assertIsNotNone(ScrapedJobCache.objects.get().refreshing_since)
+
+    def test_uncacheable_url_bypasses_the_cache(self, scrape):
+        details = get_job_details('https://example.com/' + 'a' * 600)
+        self.assertEqual(details['cache']['status'], 'bypass')
+        self.assertFalse(ScrapedJobCache.objects.exists())
@@ -0,0 +1,85 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from ai_services.services import scraper_http
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the queued (status, headers) responses, then 200s"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        status, headers = server.responses.pop(0) if server.responses else (200, {})
+        body = b'<html><body>ok</body></html>'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(SCRAPER_BACKOFF_FACTOR=0, SCRAPER_BACKOFF_JITTER=0, SCRAPER_MAX_RETRY_AFTER=2)
+class FetchRetryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.requests = 0
+        self.server.responses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/job'
+        scraper_http._session['session'] = None
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        scraper_http._session['session'] = None
+
+    def test_short_retry_after_is_retried(self):
+        self.server.responses = [(503, {'Retry-After': '1'})]
+        result = scraper_http.fetch(self.url, use_cache=False)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_long_retry_after_is_not_waited_for(self):
+        self.server.responses = [(503, {'Retry-After': '3600'})]
+        started = time.monotonic()
+        with self.assertRaises(requests.HTTPError) as raised:
+            scraper_http.fetch(self.url, use_cache=False)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(raised.exception.response.status_code, 503)
+        self.assertEqual(self.server.requests, 1)
+
+    @override_settings(SCRAPER_RETRY_DEADLINE=0.5)
+    def test_no_retry_past_the_deadline(self):
+        self.server.responses = [(503, {'Retry-After': '1'})]
+        with self.assertRaises(requests.HTTPError):
+            scraper_http.fetch(self.url, use_cache=False)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_falls_back_to_the_next_address(self):
+        # 127.0.0.2 is on loopback too, but nothing listens there
+        real_getaddrinfo = socket.getaddrinfo
+
+        def getaddrinfo(host, port, *args, **kwargs):
+            if host != 'multi.test':
+                return real_getaddrinfo(host, port, *args, **kwargs)
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.2', port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port)),
+            ]
+
+        with mock.patch('socket.getaddrinfo', getaddrinfo):
+            result = scraper_http.fetch(f'http://multi.test:{self.server.server_port}/job', use_cache=False)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(self.server.requests, 1)
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from ai_services.services.single_flight import AsyncSingleFlight, FlightCancelled, SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def test_concurrent_callers_share_one_upstream(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            yield 'a'
+            release.wait(5)
+            yield 'b'
+
+        first_info, second_info = {}, {}
+        first = group.stream('key', factory, info=first_info)
+        self.assertEqual(next(first), 'a')
+        second = group.stream('key', factory, info=second_info)
+        release.set()
+        self.assertEqual(list(second), ['a', 'b'])
+        self.assertEqual(list(first), ['b'])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((first_info['coalesced'], second_info['coalesced']), (False, True))
+
+    def test_upstream_error_reaches_every_subscriber(self):
+        group = SingleFlight()
+
+        def factory():
+            yield 'a'
+            raise ValueError('upstream failed')
+
+        with self.assertRaises(ValueError):
+            list(group.stream('key', factory))
+
+
+class AsyncSingleFlightTests(SimpleTestCase):
+
+    def test_late_subscriber_replays_then_follows(self):
+        async def run():
+            group = AsyncSingleFlight()
+            release = asyncio.Event()
+
+            async def factory():
+                yield 'a'
+                await release.wait()
+                yield 'b'
+
+            first = group.stream('key', factory)
+            self.assertEqual(await first.__anext__(), 'a')
+            second = group.stream('key', factory)
+            release.set()
+            return [chunk async for chunk in second], [chunk async for chunk in first]
+
+        self.assertEqual(asyncio.run(run()), (['a', 'b'], ['b']))
+
+    def test_cancelled_pump_is_an_error_for_subscribers(self):
+        async def run():
+            group = AsyncSingleFlight()
+
+            async def factory():
+                yield 'a'
+                await asyncio.sleep(60)
+                yield 'b'
+
+            stream = group.stream('key', factory)
+            self.assertEqual(await stream.__anext__(), 'a')
+            flight = group._flights[(asyncio.get_running_loop(), 'key')]
+            self.assertIsNotNone(flight.task)
+            flight.task.cancel()
+            with self.assertRaises(FlightCancelled):
+                await stream.__anext__()
+
+        asyncio.run(run())
@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from applications.models import Company, JobApplication
+from ai_services.models import ApplicationSkill, SkillDemand
+from ai_services.services.skill_dictionary import SkillMatcher, extract_skill_counts, parse_skill_list
+from ai_services.services.skill_index import rebuild_skill_index, refresh_skill_demand
+
+
+class SkillMatcherTests(SimpleTestCase):
+
+    def test_words_inside_other_words_are_not_skills(self):
+        self.assertEqual(extract_skill_counts('JavaScript and TypeScript'), {'javascript': 1, 'typescript': 1})
+        self.assertEqual(extract_skill_counts('Java, not JavaScript'), {'java': 1, 'javascript': 1})
+        self.assertEqual(extract_skill_counts('Scalable systems, Gorgeous UIs'), {})
+
+    def test_aliases_resolve_leftmost_longest(self):
+        self.assertEqual(extract_skill_counts('React.js with Node.js and k8s'),
+                         {'react': 1, 'node.js': 1, 'kubernetes': 1})
+        self.assertEqual(extract_skill_counts('Experience with continuous integration'), {'ci/cd': 1})
+
+    def test_trailing_period_ends_the_sentence_not_the_skill(self):
+        self.assertEqual(extract_skill_counts('We run on node.js.'), {'node.js': 1})
+        self.assertEqual(extract_skill_counts('Backend in Python. Frontend in Vue.'), {'python': 1, 'vue': 1})
+
+    def test_ambiguous_words_only_count_in_skill_lists(self):
+        self.assertEqual(extract_skill_counts('Go live with the rest of the team'), {})
+        self.assertEqual(parse_skill_list('Go, REST; Postgres | React.js'), {'go', 'rest', 'postgresql', 'react'})
+
+    def test_failure_links_find_overlapping_patterns(self):
+        matcher = SkillMatcher({'abcd': 'long', 'bc': 'inner', 'cde': 'tail'})
+        self.assertEqual(matcher.find('abcde'), {})
+        self.assertEqual(matcher.find('x abcd y'), {'long': 1})
+        self.assertEqual(matcher.find('ab cde'), {'tail': 1})
+
+
+class SkillDemandTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('indexer')
+        self.company = Company.objects.create(name='Acme')
+
+    def demand(self):
+        return {row.skill: (row.applications, row.mentions) for row in SkillDemand.objects.filter(user=self.user)}
+
+    def assertDemandMatchesIndex(self):
+        incremental = self.demand()
+        refresh_skill_demand([self.user.id])
+        self.assertEqual(incremental, self.demand())
+        return incremental
+
+    def test_save_edit_delete_keep_demand_in_step(self):
+        first = JobApplication.objects.create(
+            user=self.user, company=self.company, position='Backend',
+            job_description='Python and Django. More Python. Postgres.',
+        )
+        second = JobApplication.objects.create(
+            user=self.user, company=self.company, position='Platform',
+            job_description='Python, Kubernetes and AWS.',
+        )
+        self.assertEqual(self.assertDemandMatchesIndex()['python'], (2, 3))
+
+        first.job_description = 'Django and Kubernetes.'
+        first.save()
+        demand = self.assertDemandMatchesIndex()
+        self.assertEqual((demand['python'], demand['kubernetes']), ((1, 1), (2, 2)))
+        self.assertNotIn('postgresql', demand)
+
+        second.delete()
+        self.assertEqual(self.assertDemandMatchesIndex(), {'django': (1, 1), 'kubernetes': (1, 1)})
+
+    def test_rebuild_matches_incremental_index(self):
+        JobApplication.objects.create(
+            user=self.user, company=self.company, position='Data', job_description='Spark, Airflow and SQL.',
+        )
+        incremental = self.demand()
+        ApplicationSkill.objects.all().delete()
+        SkillDemand.objects.all().delete()
+
+        self.assertEqual(rebuild_skill_index(JobApplication.objects.all()), (1, 3))
+        self.assertEqual(self.demand(), incremental)
@@ -0,0 +1,45 @@
+from django.test import TestCase
+
+from ai_services.models import ExtractedTextCache
+from ai_services.services import text_cache
+from ai_services.services.resume_parser import PartialText
+
+
+class TextCacheTests(TestCase):
+
+    def setUp(self):
+        text_cache.clear_memory_cache()
+
+    def test_extracts_once_then_serves_from_cache(self):
+        calls = []
+
+        def extract():
+            calls.append(1)
+            return 'resume text'
+
+        self.assertEqual(text_cache.get_or_extract_text('a' * 64, '.pdf', extract), 'resume text')
+        self.assertEqual(text_cache.get_or_extract_text('a' * 64, '.pdf', extract), 'resume text')
+        text_cache.clear_memory_cache()
+        self.assertEqual(text_cache.get_or_extract_text('a' * 64, '.pdf', extract), 'resume text')
+        self.assertEqual(len(calls), 1)
+
+    def test_partial_text_is_not_cached(self):
+        calls = []
+
+        def extract():
+            calls.append(1)
+            return PartialText('first pages only')
+
+        for _ in range(2):
+            self.assertEqual(text_cache.get_or_extract_text('b' * 64, '.pdf', extract), 'first pages only')
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(ExtractedTextCache.objects.filter(content_hash='b' * 64).exists())
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = text_cache.LRUTextCache(max_chars=10)
+        cache.set('a', 'xxxx')
+        cache.set('b', 'yyyy')
+        cache.get('a')
+        cache.set('c', 'zzzz')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'xxxx')
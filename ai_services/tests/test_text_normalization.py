@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from ai_services.services.resume_parser import extract_text
+from ai_services.services.text_normalization import clean_text, is_boilerplate
+
+
+RESUME = """Acme Corp - Backend Engineer
+• Built REST APIs in Python and Django for internal tools
+• Led the wellness program committee
+
+Globex - Software Engineer
+• Built REST APIs in Python and Django for internal tools
+""".encode('utf-8')
+
+
+class CleanTextTests(SimpleTestCase):
+
+    def test_resume_keeps_bullets_repeated_under_several_jobs(self):
+        text = extract_text(RESUME, '.txt')
+        self.assertEqual(text.count('- Built REST APIs in Python and Django for internal tools'), 2)
+        self.assertIn('wellness program', text)
+
+    def test_job_description_drops_repeats(self):
+        text = "Design and build payment APIs.\nDesign and build payment APIs.\nShip weekly."
+        self.assertEqual(clean_text(text, fingerprints=frozenset()), "Design and build payment APIs.\nShip weekly.")
+
+    def test_benefits_lists_are_boilerplate(self):
+        for sentence in [
+            "We offer medical, dental and vision insurance and a 401(k) match.",
+            "Perks include unlimited PTO and a monthly gym membership.",
+            "Competitive salary, equity grants and paid parental leave.",
+        ]:
+            with self.subTest(sentence=sentence):
+                self.assertTrue(is_boilerplate(sentence))
+
+    def test_role_content_is_not_benefits(self):
+        for sentence in [
+            "Our vision is to build the leading equity research platform for analysts.",
+            "You will own the wellness app's gym check-in flow.",
+            "Help shape the vision for our dental imaging product.",
+        ]:
+            with self.subTest(sentence=sentence):
+                self.assertFalse(is_boilerplate(sentence))
+                self.assertEqual(clean_text(sentence, fingerprints=frozenset()), sentence)
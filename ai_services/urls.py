@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # AI Generation endpoints
@@ -7,11 +7,26 @@ urlpatterns = [
     path('generate-cover-letter/', views.generate_cover_letter_view, name='generate-cover-letter'),
     path('generate-interview-prep/', views.generate_interview_prep_view, name='generate-interview-prep'),
     path('match-score/', views.match_score_view, name='match-score'),
+    path('application-pack/', views.application_pack_view, name='application-pack'),
+    path('rank-applications/', views.rank_applications_view, name='rank-applications'),
+    path('skills/applications/', views.skill_applications_view, name='skill-applications'),
+    path('skills/demand/', views.skill_demand_view, name='skill-demand'),
+    
+    # Async streaming variants (served by the ASGI stack)
+    path('async/tailor-resume/', async_views.tailor_resume_async_view, name='tailor-resume-async'),
+    path('async/generate-cover-letter/', async_views.generate_cover_letter_async_view, name='generate-cover-letter-async'),
+    path('async/generate-interview-prep/', async_views.generate_interview_prep_async_view, name='generate-interview-prep-async'),
+    path('async/match-score/', async_views.match_score_async_view, name='match-score-async'),
     
     # Job scraping endpoint
     path('scrape-job/', views.scrape_job_url_view, name='scrape-job'),
+    path('bulk-import/', views.bulk_import_jobs_view, name='bulk-import'),
     
     # Generation history
     path('generations/', views.list_generations_view, name='list-generations'),
     path('generations/<int:pk>/', views.generation_detail_view, name='generation-detail'),
+    path('usage/', views.usage_summary_view, name='usage-summary'),
+
+    # Service metrics
+    path('metrics/', views.ai_metrics_view, name='ai-metrics'),
 ]
@@ -1,28 +1,56 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from django.http import StreamingHttpResponse
 from documents.models import Document
+from applications.models import JobApplication
 from .models import AIGeneration
 from .serializers import AIGenerationSerializer
-from .services.resume_parser import extract_text_from_document
 from .services.openai_service import (
     tailor_resume_streaming,
     generate_cover_letter,
     generate_interview_prep,
     match_score_streaming,
-    extract_job_details_from_html,
 )
-from .services.job_scraper import scrape_job_description, clean_job_description
-from .services.prompts import get_resume_tailoring_prompt, get_interview_prep_prompt
-import tempfile
-import os
+from .services.generation_cache import cached_stream, parse_reuse_flag, get_generation_cache_stats
+from .services.generation_records import record_generation
+from .services.token_usage import get_usage_summary, get_usage_by_user
+from .services.job_scraper import get_extraction_stats
+from .services.scrape_cache import get_job_details
+from .services.resume_input import (
+    ResumeInputError,
+    resolve_resume_text,
+    validate_application_id,
+    validate_job_description,
+)
+from .services.local_match import score_match
+from .services.batch_ranking import RANKING_ORDERINGS, rank_applications, skill_breakdown
+from .services.skill_index import applications_with_skill, get_skill_demand
+from .services.application_pack import stream_application_pack, parse_artifacts, format_ndjson, format_sse
+from .services.bulk_import import parse_urls, stream_bulk_import
+from .services.text_cache import get_cache_stats
+from .services.metrics import get_counter_group
+from .services.generation_writer import get_writer_stats
 import json
+import time
 import requests
 from bs4 import BeautifulSoup
 
 
+def _get_resume_text(request):
+    """
+    Resolve the resume text for an AI request (file, document_id or use_master).
+
+    Returns:
+        tuple: (resume_text, None) on success, (None, Response) on error
+    """
+    try:
+        return resolve_resume_text(request.user, request.FILES, request.data), None
+    except ResumeInputError as e:
+        return None, Response({'error': e.message}, status=e.status_code)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def scrape_job_url_view(request):
@@ -30,43 +58,84 @@ def scrape_job_url_view(request):
     Scrape a job URL, clean the content, and extract structured details via OpenAI.
 
     POST /api/ai/scrape-job/
-    Body: { "job_url": "https://..." }
+    Body: { "job_url": "https://...", "refresh": false }
+    
+    The response includes "fetch": {"from_cache": bool, "timings": {...}} with
+    per-phase fetch timings in milliseconds, and "extraction": "structured" when
+    the page's JSON-LD JobPosting was complete and the LLM extractor was skipped
+    (otherwise "llm").
+    
+    Results are shared across users by canonical job URL: "cache": {"status":
+    "hit" | "stale" | "miss" | "bypass", "age_seconds": int} tells where this one
+    came from (cached results have no "fetch"). refresh=true re-scrapes.
     """
     job_url = request.data.get('job_url')
     if not job_url:
         return Response({'error': 'job_url is required'}, status=status.HTTP_400_BAD_REQUEST)
+    refresh = str(request.data.get('refresh', '')).lower() in ['true', '1', 'yes']
 
     try:
-        scraped = scrape_job_description(job_url)
-        raw_description = scraped.get('description', '') or ''
-        cleaned_description = clean_job_description(raw_description)
-
-        combined_content = (
-            f"Title: {scraped.get('title', '')}\n"
-            f"Company: {scraped.get('company', '')}\n"
-            f"URL: {job_url}\n"
-            f"Description:\n{cleaned_description}"
-        )
-
-        ai_result = extract_job_details_from_html(combined_content)
-
-        response_data = {
-              'job_url': job_url,
-              'company_name': ai_result.get('company_name') or scraped.get('company') or '',
-              'position': ai_result.get('position') or scraped.get('title') or '',
-              'location': ai_result.get('location') or '',
-              'salary_range': ai_result.get('salary_range') or '',
-              'description': ai_result.get('description') or cleaned_description or '',
-              # Add tracking info (link or instructions)
-              'tracking_info': ai_result.get('tracking_info') or f'Track your application at: {job_url}'
-        }
-
+        response_data = get_job_details(job_url, refresh=refresh)
         return Response(response_data, status=status.HTTP_200_OK)
 
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_import_jobs_view(request):
+    """
+    Import several job URLs as job applications, streaming progress.
+    URLs are fetched concurrently (politely, per domain) and extracted like
+    scrape-job; URLs already saved by the user are reported as duplicates.
+    
+    POST /api/ai/bulk-import/
+    Headers: Authorization: Bearer TOKEN
+    Body (JSON):
+        urls: ["https://...", ...] or "one URL per line" (required, max 50)
+        status: saved (optional, status of the new applications)
+        stream_format: ndjson | sse (optional, default: ndjson)
+    
+    Returns: Streaming events, one per line (ndjson) or per SSE message:
+        {"event": "start", "total": 3, "duplicates": 1}
+        {"event": "duplicate", "url": "...", "application_id": 4}
+        {"event": "extracted", "url": "...", "position": "...", "company_name": "...", "extraction": "llm", "cache": "miss", "elapsed_ms": 850}
+        {"event": "created", "url": "...", "application_id": 12}
+        {"event": "error", "url": "...", "error": "..."}
+        {"event": "complete", "created": 1, "failed": 1, "duplicates": 1, "elapsed_ms": 2100}
+    """
+    try:
+        urls = parse_urls(request.data.get('urls'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    application_status = request.data.get('status', 'saved')
+    if application_status not in dict(JobApplication.STATUS_CHOICES):
+        return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    stream_format = request.data.get('stream_format', 'ndjson')
+    if stream_format not in ['ndjson', 'sse']:
+        return Response(
+            {'error': 'stream_format must be ndjson or sse'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    formatter = format_sse if stream_format == 'sse' else format_ndjson
+    
+    def generate_stream():
+        for event in stream_bulk_import(request.user, urls, application_status):
+            yield formatter(event)
+    
+    response = StreamingHttpResponse(
+        generate_stream(),
+        content_type='text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def tailor_resume_direct_view(request):
@@ -77,33 +146,22 @@ def tailor_resume_direct_view(request):
     POST /api/ai/tailor-resume/
     Headers: Authorization: Bearer TOKEN
     Body: form-data
-        file: resume.pdf (required)
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
         job_description: "..." (required)
         application_id: 10 (optional)
+        reuse_cached: true / false (optional, serve an identical earlier result)
     
     Returns: Streaming response with tailored resume
     """
-    # 1. Validate file upload
-    if 'file' not in request.FILES:
-        return Response(
-            {'error': 'file is required'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    uploaded_file = request.FILES['file']
-    
-    # Validate file extension
-    allowed_extensions = ['.pdf', '.docx', '.doc', '.txt']
-    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
-    if file_ext not in allowed_extensions:
-        return Response(
-            {'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # 2. Get job description
+    # 1. Get job description
     job_description = request.data.get('job_description', '').strip()
-    application_id = request.data.get('application_id')
+    try:
+        application_id = validate_application_id(request.data)
+    except ResumeInputError as e:
+        return Response({'error': e.message}, status=e.status_code)
+    reuse = parse_reuse_flag(request.data.get('reuse_cached'))
     
     if not job_description:
         return Response(
@@ -117,60 +175,40 @@ def tailor_resume_direct_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # 3. Extract text from uploaded file
-    temp_file = None
-    try:
-        # Create temporary file with proper extension
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-        for chunk in uploaded_file.chunks():
-            temp_file.write(chunk)
-        temp_file.close()
-        
-        # Extract text from temporary file
-        resume_text = extract_text_from_document(temp_file.name)
-        if not resume_text or len(resume_text.strip()) < 50:
-            return Response(
-                {'error': 'Could not extract sufficient text from document'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    except Exception as e:
-        return Response(
-            {'error': f'Error reading document: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+    # 2. Get resume text (upload, stored document or master resume)
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
     
-    # 4. Stream the AI response
+    # 3. Stream the AI response
     def generate_stream():
         """Generator function that yields AI-generated chunks"""
         full_response = []
+        cache_info = {}
+        usage = {}
         
         try:
-            examples_prompt = get_resume_tailoring_prompt()
-            
-            for chunk in tailor_resume_streaming(resume_text, job_description, examples_prompt):
+            for chunk in cached_stream(
+                'tailored_resume', resume_text, job_description,
+                lambda: tailor_resume_streaming(resume_text, job_description, usage=usage),
+                reuse=reuse, info=cache_info,
+            ):
                 full_response.append(chunk)
                 # Send chunk to client
                 yield chunk
             
-            # After streaming completes, save to database in background
+            # After streaming completes, save to database
             final_text = ''.join(full_response)
-            try:
-                AIGeneration.objects.create(
-                    user=request.user,
-                    application_id=application_id,
-                    generation_type='tailored_resume',
-                    input_resume=resume_text[:5000],
-                    job_description=job_description[:5000],
-                    output_text=final_text,
-                    model_used='gpt-4.1-nano',
-                    tokens_used=None  # Can't track with streaming
-                )
-            except:
-                pass  # Don't fail the response if saving fails
+            record_generation(
+                user=request.user,
+                application_id=application_id,
+                generation_type='tailored_resume',
+                resume_text=resume_text,
+                job_description=job_description,
+                output_text=final_text,
+                cache_hit=cache_info['cache_hit'],
+                usage=usage,
+            )
                 
         except Exception as e:
             yield f"\n\n[ERROR: {str(e)}]"
@@ -196,33 +234,22 @@ def generate_cover_letter_view(request):
     POST /api/ai/generate-cover-letter/
     Headers: Authorization: Bearer TOKEN
     Body: form-data
-        file: resume.pdf (required)
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
         job_description: "..." (required)
         application_id: 10 (optional)
+        reuse_cached: true / false (optional, serve an identical earlier result)
     
     Returns: Streaming response with cover letter
     """
-    # 1. Validate file upload
-    if 'file' not in request.FILES:
-        return Response(
-            {'error': 'file is required'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    uploaded_file = request.FILES['file']
-    
-    # Validate file extension
-    allowed_extensions = ['.pdf', '.docx', '.doc', '.txt']
-    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
-    if file_ext not in allowed_extensions:
-        return Response(
-            {'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # 2. Get job description
+    # 1. Get job description
     job_description = request.data.get('job_description', '').strip()
-    application_id = request.data.get('application_id')
+    try:
+        application_id = validate_application_id(request.data)
+    except ResumeInputError as e:
+        return Response({'error': e.message}, status=e.status_code)
+    reuse = parse_reuse_flag(request.data.get('reuse_cached'))
     
     if not job_description:
         return Response(
@@ -236,58 +263,40 @@ def generate_cover_letter_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # 3. Extract text from uploaded file
-    temp_file = None
-    try:
-        # Create temporary file with proper extension
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-        for chunk in uploaded_file.chunks():
-            temp_file.write(chunk)
-        temp_file.close()
-        
-        # Extract text from temporary file
-        resume_text = extract_text_from_document(temp_file.name)
-        if not resume_text or len(resume_text.strip()) < 50:
-            return Response(
-                {'error': 'Could not extract sufficient text from document'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    except Exception as e:
-        return Response(
-            {'error': f'Error reading document: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+    # 2. Get resume text (upload, stored document or master resume)
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
     
-    # 4. Stream the AI response
+    # 3. Stream the AI response
     def generate_stream():
         """Generator function that yields AI-generated chunks"""
         full_response = []
+        cache_info = {}
+        usage = {}
         
         try:
-            for chunk in generate_cover_letter(resume_text, job_description):
+            for chunk in cached_stream(
+                'cover_letter', resume_text, job_description,
+                lambda: generate_cover_letter(resume_text, job_description, usage=usage),
+                reuse=reuse, info=cache_info,
+            ):
                 full_response.append(chunk)
                 # Send chunk to client
                 yield chunk
             
-            # After streaming completes, save to database in background
+            # After streaming completes, save to database
             final_text = ''.join(full_response)
-            try:
-                AIGeneration.objects.create(
-                    user=request.user,
-                    application_id=application_id,
-                    generation_type='cover_letter',
-                    input_resume=resume_text[:5000],
-                    job_description=job_description[:5000],
-                    output_text=final_text,
-                    model_used='gpt-4.1-nano',
-                    tokens_used=None  # Can't track with streaming
-                )
-            except:
-                pass  # Don't fail the response if saving fails
+            record_generation(
+                user=request.user,
+                application_id=application_id,
+                generation_type='cover_letter',
+                resume_text=resume_text,
+                job_description=job_description,
+                output_text=final_text,
+                cache_hit=cache_info['cache_hit'],
+                usage=usage,
+            )
                 
         except Exception as e:
             yield f"\n\n[ERROR: {str(e)}]"
@@ -313,33 +322,22 @@ def generate_interview_prep_view(request):
     POST /api/ai/generate-interview-prep/
     Headers: Authorization: Bearer TOKEN
     Body: form-data
-        file: resume.pdf (required)
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
         job_description: "..." (required)
         application_id: 10 (optional)
+        reuse_cached: true / false (optional, serve an identical earlier result)
     
     Returns: Streaming response with interview prep materials
     """
-    # 1. Validate file upload
-    if 'file' not in request.FILES:
-        return Response(
-            {'error': 'file is required'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    uploaded_file = request.FILES['file']
-    
-    # Validate file extension
-    allowed_extensions = ['.pdf', '.docx', '.doc', '.txt']
-    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
-    if file_ext not in allowed_extensions:
-        return Response(
-            {'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # 2. Get job description
+    # 1. Get job description
     job_description = request.data.get('job_description', '').strip()
-    application_id = request.data.get('application_id')
+    try:
+        application_id = validate_application_id(request.data)
+    except ResumeInputError as e:
+        return Response({'error': e.message}, status=e.status_code)
+    reuse = parse_reuse_flag(request.data.get('reuse_cached'))
     
     if not job_description:
         return Response(
@@ -353,58 +351,40 @@ def generate_interview_prep_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # 3. Extract text from uploaded file
-    temp_file = None
-    try:
-        # Create temporary file with proper extension
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-        for chunk in uploaded_file.chunks():
-            temp_file.write(chunk)
-        temp_file.close()
-        
-        # Extract text from temporary file
-        resume_text = extract_text_from_document(temp_file.name)
-        if not resume_text or len(resume_text.strip()) < 50:
-            return Response(
-                {'error': 'Could not extract sufficient text from document'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    except Exception as e:
-        return Response(
-            {'error': f'Error reading document: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+    # 2. Get resume text (upload, stored document or master resume)
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
     
-    # 4. Stream the AI response
+    # 3. Stream the AI response
     def generate_stream():
         """Generator function that yields AI-generated chunks"""
         full_response = []
+        cache_info = {}
+        usage = {}
         
         try:
-            for chunk in generate_interview_prep(resume_text, job_description):
+            for chunk in cached_stream(
+                'interview_prep', resume_text, job_description,
+                lambda: generate_interview_prep(resume_text, job_description, usage=usage),
+                reuse=reuse, info=cache_info,
+            ):
                 full_response.append(chunk)
                 # Send chunk to client
                 yield chunk
             
-            # After streaming completes, save to database in background
+            # After streaming completes, save to database
             final_text = ''.join(full_response)
-            try:
-                AIGeneration.objects.create(
-                    user=request.user,
-                    application_id=application_id,
-                    generation_type='interview_prep',
-                    input_resume=resume_text[:5000],
-                    job_description=job_description[:5000],
-                    output_text=final_text,
-                    model_used='gpt-4.1-nano',
-                    tokens_used=None  # Can't track with streaming
-                )
-            except:
-                pass  # Don't fail the response if saving fails
+            record_generation(
+                user=request.user,
+                application_id=application_id,
+                generation_type='interview_prep',
+                resume_text=resume_text,
+                job_description=job_description,
+                output_text=final_text,
+                cache_hit=cache_info['cache_hit'],
+                usage=usage,
+            )
                 
         except Exception as e:
             yield f"\n\n[ERROR: {str(e)}]"
@@ -430,34 +410,33 @@ def match_score_view(request):
     POST /api/ai/match-score/
     Headers: Authorization: Bearer TOKEN
     Body: form-data
-        file: resume.pdf (required)
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
         job_description: "..." (required)
         application_id: 10 (optional)
+        reuse_cached: true / false (optional, serve an identical earlier result)
+        mode: detailed | fast (optional, default: detailed)
     
-    Returns: Streaming response with score, matched/missing skills
+    Returns: Streaming response with score, matched/missing skills.
+    With mode=fast: JSON from the local scorer (no LLM call), e.g.
+        {"mode": "fast", "score": 72, "matching_skills": [...], "missing_skills": [...], ...}
     """
-    # 1. Validate file upload
-    if 'file' not in request.FILES:
-        return Response(
-            {'error': 'file is required'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
-    uploaded_file = request.FILES['file']
-
-    # Validate file extension
-    allowed_extensions = ['.pdf', '.docx', '.doc', '.txt']
-    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
-    if file_ext not in allowed_extensions:
+    # 1. Get job description
+    job_description = request.data.get('job_description', '').strip()
+    try:
+        application_id = validate_application_id(request.data)
+    except ResumeInputError as e:
+        return Response({'error': e.message}, status=e.status_code)
+    reuse = parse_reuse_flag(request.data.get('reuse_cached'))
+    mode = request.data.get('mode', 'detailed')
+    
+    if mode not in ['detailed', 'fast']:
         return Response(
-            {'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'},
+            {'error': 'mode must be detailed or fast'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # 2. Get job description
-    job_description = request.data.get('job_description', '').strip()
-    application_id = request.data.get('application_id')
-
     if not job_description:
         return Response(
             {'error': 'job_description is required'},
@@ -470,52 +449,41 @@ def match_score_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # 3. Extract text from uploaded file
-    temp_file = None
-    try:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-        for chunk in uploaded_file.chunks():
-            temp_file.write(chunk)
-        temp_file.close()
-
-        resume_text = extract_text_from_document(temp_file.name)
-        if not resume_text or len(resume_text.strip()) < 50:
-            return Response(
-                {'error': 'Could not extract sufficient text from document'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    except Exception as e:
-        return Response(
-            {'error': f'Error reading document: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    finally:
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+    # 2. Get resume text (upload, stored document or master resume)
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
+
+    # Fast mode: deterministic local score, no LLM call
+    if mode == 'fast':
+        return Response({'mode': 'fast', **score_match(resume_text, job_description)})
 
-    # 4. Stream the AI response
+    # 3. Stream the AI response
     def generate_stream():
         full_response = []
+        cache_info = {}
+        usage = {}
 
         try:
-            for chunk in match_score_streaming(resume_text, job_description):
+            for chunk in cached_stream(
+                'match_score', resume_text, job_description,
+                lambda: match_score_streaming(resume_text, job_description, usage=usage),
+                reuse=reuse, info=cache_info,
+            ):
                 full_response.append(chunk)
                 yield chunk
 
             final_text = ''.join(full_response)
-            try:
-                AIGeneration.objects.create(
-                    user=request.user,
-                    application_id=application_id,
-                    generation_type='match_score',
-                    input_resume=resume_text[:5000],
-                    job_description=job_description[:5000],
-                    output_text=final_text,
-                    model_used='gpt-4.1-nano',
-                    tokens_used=None
-                )
-            except:
-                pass
+            record_generation(
+                user=request.user,
+                application_id=application_id,
+                generation_type='match_score',
+                resume_text=resume_text,
+                job_description=job_description,
+                output_text=final_text,
+                cache_hit=cache_info['cache_hit'],
+                usage=usage,
+            )
 
         except Exception as e:
             yield f"\n\n[ERROR: {str(e)}]"
@@ -530,6 +498,246 @@ def match_score_view(request):
     return response
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def application_pack_view(request):
+    """
+    Generate tailored resume, cover letter, interview prep and match score
+    concurrently from one upload, multiplexed over a single stream.
+    
+    POST /api/ai/application-pack/
+    Headers: Authorization: Bearer TOKEN
+    Body: form-data
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
+        job_description: "..." (required)
+        application_id: 10 (optional)
+        artifacts: "match_score,cover_letter" (optional, default: all four)
+        stream_format: ndjson | sse (optional, default: ndjson)
+        reuse_cached: true / false (optional, serve identical earlier results)
+    
+    Returns: Streaming response of events tagged with their artifact:
+        {"event": "start", "artifacts": [...]}
+        {"event": "chunk", "artifact": "cover_letter", "data": "..."}
+        {"event": "done", "artifact": "cover_letter", "generation_id": 12, ...}
+        {"event": "error", "artifact": "...", "error": "..."}
+        {"event": "complete", "elapsed_ms": 8400}
+    """
+    # 1. Get job description and options
+    reuse = parse_reuse_flag(request.data.get('reuse_cached'))
+    stream_format = request.data.get('stream_format', 'ndjson')
+    
+    try:
+        job_description = validate_job_description(request.data)
+        application_id = validate_application_id(request.data)
+        artifacts = parse_artifacts(request.data.get('artifacts'))
+    except ResumeInputError as e:
+        return Response({'error': e.message}, status=e.status_code)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if stream_format not in ['ndjson', 'sse']:
+        return Response(
+            {'error': 'stream_format must be ndjson or sse'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # 2. Get resume text once for all artifacts
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
+    
+    # 3. Stream all artifacts concurrently
+    format_event = format_sse if stream_format == 'sse' else format_ndjson
+    
+    def generate_stream():
+        for event in stream_application_pack(
+            request.user, resume_text, job_description,
+            artifacts=artifacts, application_id=application_id, reuse=reuse,
+        ):
+            yield format_event(event)
+    
+    response = StreamingHttpResponse(
+        generate_stream(),
+        content_type='text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def rank_applications_view(request):
+    """
+    Rank all of the user's saved job applications against one resume.
+    Uses the precomputed term vectors of the job descriptions (no LLM call),
+    scored the same way as match-score mode=fast.
+    
+    POST /api/ai/rank-applications/
+    Headers: Authorization: Bearer TOKEN
+    Body: form-data
+        file: resume.pdf (one of file / document_id / use_master)
+        document_id: 5 (use a stored document's precomputed text)
+        use_master: true (use the user's master resume)
+        ordering: -score (default) | score | -similarity | similarity | -application_id | application_id
+        status: applied (optional, only applications with this status)
+        page: 1 (optional)
+        page_size: 20 (optional, max 100)
+    
+    Returns:
+        {"count": 42, "page": 1, "page_size": 20, "elapsed_ms": 3.1,
+         "results": [{"application_id": 7, "position": "...", "company": "...", "status": "saved",
+                      "score": 81, "similarity": 0.41, "skill_coverage": 0.8,
+                      "matching_skills": [...], "missing_skills": [...]}]}
+    """
+    ordering = request.data.get('ordering', '-score')
+    if ordering not in RANKING_ORDERINGS:
+        return Response(
+            {'error': f'ordering must be one of: {", ".join(RANKING_ORDERINGS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        page = max(int(request.data.get('page', 1)), 1)
+        page_size = min(max(int(request.data.get('page_size', 20)), 1), 100)
+    except (TypeError, ValueError):
+        return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    application_status = request.data.get('status')
+    if application_status and application_status not in dict(JobApplication.STATUS_CHOICES):
+        return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    resume_text, error_response = _get_resume_text(request)
+    if error_response:
+        return error_response
+    
+    started = time.perf_counter()
+    application_ids = None
+    if application_status:
+        application_ids = JobApplication.objects.filter(
+            user=request.user, status=application_status
+        ).values_list('id', flat=True)
+    
+    ranking, matrix, scored = rank_applications(
+        request.user, resume_text, ordering=ordering, application_ids=application_ids
+    )
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    page_rows = ranking[(page - 1) * page_size:page * page_size]
+    applications = JobApplication.objects.select_related('company').in_bulk(
+        [row['application_id'] for row in page_rows]
+    )
+    
+    results = []
+    for row in page_rows:
+        application = applications.get(row['application_id'])
+        if application is None:
+            continue
+        matching_skills, missing_skills = skill_breakdown(matrix, row.pop('_row'), scored['resume_terms'])
+        results.append({
+            'application_id': application.id,
+            'position': application.position,
+            'company': application.company.name,
+            'status': application.status,
+            **row,
+            'matching_skills': matching_skills,
+            'missing_skills': missing_skills,
+        })
+    
+    return Response({
+        'count': len(ranking),
+        'page': page,
+        'page_size': page_size,
+        'elapsed_ms': elapsed_ms,
+        'results': results,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def skill_applications_view(request):
+    """
+    The user's applications whose job description names a skill.
+    Served from the skill index (no job description scan).
+    
+    GET /api/ai/skills/applications/?skill=k8s
+    
+    Query params:
+    - skill: Skill name, any common spelling (required)
+    - status: Filter by application status (optional)
+    - page, page_size: Pagination (default: 1, 20; max page_size: 100)
+    
+    Newest applications first.
+    """
+    skill = request.query_params.get('skill', '').strip()
+    if not skill:
+        return Response({'error': 'skill is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    canonical, rows = applications_with_skill(request.user, skill)
+    if canonical is None:
+        return Response({'error': f'Unknown skill: {skill}'}, status=status.HTTP_404_NOT_FOUND)
+    
+    application_status = request.query_params.get('status')
+    if application_status:
+        rows = rows.filter(application__status=application_status)
+    
+    try:
+        page = max(int(request.query_params.get('page', 1)), 1)
+        page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+    except ValueError:
+        return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'skill': canonical,
+        'count': rows.count(),
+        'page': page,
+        'page_size': page_size,
+        'results': [
+            {
+                'application_id': row.application_id,
+                'position': row.application.position,
+                'company': row.application.company.name,
+                'status': row.application.status,
+                'mentions': row.occurrences,
+            }
+            for row in rows[(page - 1) * page_size:page * page_size]
+        ],
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def skill_demand_view(request):
+    """
+    Skills most requested across the user's applications, compared with the
+    skills on their profile.
+    
+    GET /api/ai/skills/demand/?missing=true
+    
+    Query params:
+    - missing: true to only list skills the profile does not have (optional)
+    - status: Only count applications with this status (optional)
+    - limit: Number of skills (default: 20, max: 100)
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    missing_only = request.query_params.get('missing', '').lower() in ['true', '1', 'yes']
+    return Response({
+        'results': get_skill_demand(
+            request.user,
+            status=request.query_params.get('status'),
+            limit=limit,
+            missing_only=missing_only,
+        ),
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_generations_view(request):
@@ -582,3 +790,54 @@ def generation_detail_view(request, pk):
     elif request.method == 'DELETE':
         generation.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def usage_summary_view(request):
+    """
+    Token usage of the authenticated user, per day and per generation type.
+    
+    GET /api/ai/usage/?days=30
+    
+    Query params:
+    - days: Window size in days (default: 30, max: 365)
+    - all_users: true for a per-user breakdown over all users (admin only)
+    """
+    try:
+        days = min(max(int(request.query_params.get('days', 30)), 1), 365)
+    except ValueError:
+        return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if request.query_params.get('all_users', '').lower() in ['true', '1', 'yes']:
+        if not request.user.is_staff:
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+        return Response({
+            'days': days,
+            'by_user': get_usage_by_user(AIGeneration.objects.all(), days=days),
+        })
+    
+    return Response(get_usage_summary(AIGeneration.objects.filter(user=request.user), days=days))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_metrics_view(request):
+    """
+    Process-level counters for the AI services (admin only).
+
+    GET /api/ai/metrics/
+    """
+    return Response({
+        'text_cache': get_cache_stats(),
+        'extraction_sandbox': get_counter_group('extraction_sandbox'),
+        'generation_cache': get_generation_cache_stats(),
+        'single_flight': get_counter_group('single_flight'),
+        'prompt_builder': get_counter_group('prompt_builder'),
+        'scraper_http': get_counter_group('scraper_http'),
+        'job_extraction': get_extraction_stats(),
+        'bulk_import': get_counter_group('bulk_import'),
+        'scrape_cache': get_counter_group('scrape_cache'),
+        'text_normalization': get_counter_group('text_normalization'),
+        'generation_writer': get_writer_stats(),
+    })
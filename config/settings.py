@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
@@ -135,6 +136,10 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Keep uploads up to the 10MB document limit in memory so resume parsing
+# never spills to a temporary file on disk
+FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -149,6 +154,107 @@ SIMPLE_JWT = {
 # OpenAI API Key
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 
+# OpenAI HTTP client (one pooled client per process, see ai_services/services/openai_client.py)
+OPENAI_BASE_URL = config('OPENAI_BASE_URL', default='')
+OPENAI_MAX_CONNECTIONS = config('OPENAI_MAX_CONNECTIONS', default=20, cast=int)
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = config('OPENAI_MAX_KEEPALIVE_CONNECTIONS', default=10, cast=int)
+OPENAI_KEEPALIVE_EXPIRY = config('OPENAI_KEEPALIVE_EXPIRY', default=30.0, cast=float)
+OPENAI_TIMEOUT = config('OPENAI_TIMEOUT', default=60.0, cast=float)
+OPENAI_CONNECT_TIMEOUT = config('OPENAI_CONNECT_TIMEOUT', default=5.0, cast=float)
+OPENAI_HTTP2 = config('OPENAI_HTTP2', default=True, cast=bool)
+# Identical concurrent generations share one upstream stream
+OPENAI_SINGLE_FLIGHT = config('OPENAI_SINGLE_FLIGHT', default=True, cast=bool)
+# Send prompt_cache_key so requests sharing a prompt prefix hit the same provider cache
+OPENAI_PROMPT_CACHE_KEY = config('OPENAI_PROMPT_CACHE_KEY', default=True, cast=bool)
+
+# Extracted resume text cache (shared by all AI endpoints)
+EXTRACTED_TEXT_CACHE_MAX_CHARS = config('EXTRACTED_TEXT_CACHE_MAX_CHARS', default=32 * 1024 * 1024, cast=int)
+EXTRACTED_TEXT_CACHE_MAX_ROWS = config('EXTRACTED_TEXT_CACHE_MAX_ROWS', default=5000, cast=int)
+
+# Generation result cache (match_score reused by default, other types on reuse_cached=true)
+GENERATION_CACHE_ENABLED = config('GENERATION_CACHE_ENABLED', default=True, cast=bool)
+GENERATION_CACHE_POLICIES = {}  # e.g. {'cover_letter': {'reuse': 'opt_in', 'ttl_hours': 48}}
+
+# Input token budget per generation type (resume + job description, after compression)
+PROMPT_INPUT_BUDGETS = {
+    'tailored_resume': config('PROMPT_BUDGET_TAILORED_RESUME', default=6000, cast=int),
+    'cover_letter': config('PROMPT_BUDGET_COVER_LETTER', default=4000, cast=int),
+    'interview_prep': config('PROMPT_BUDGET_INTERVIEW_PREP', default=4000, cast=int),
+    'match_score': config('PROMPT_BUDGET_MATCH_SCORE', default=3000, cast=int),
+}
+
+# Local match engine (mode=fast): IDF from stored job descriptions
+LOCAL_MATCH_IDF_TTL = config('LOCAL_MATCH_IDF_TTL', default=3600, cast=int)
+LOCAL_MATCH_IDF_MAX_DOCS = config('LOCAL_MATCH_IDF_MAX_DOCS', default=20000, cast=int)
+# Batch ranking: users whose term matrices stay cached per process
+RANKING_MATRIX_CACHE_SIZE = config('RANKING_MATRIX_CACHE_SIZE', default=100, cast=int)
+
+# Job scraper HTTP client (pooled session, retries, conditional-GET cache)
+SCRAPER_POOL_CONNECTIONS = config('SCRAPER_POOL_CONNECTIONS', default=20, cast=int)
+SCRAPER_POOL_MAXSIZE = config('SCRAPER_POOL_MAXSIZE', default=10, cast=int)
+SCRAPER_MAX_RETRIES = config('SCRAPER_MAX_RETRIES', default=3, cast=int)
+SCRAPER_BACKOFF_FACTOR = config('SCRAPER_BACKOFF_FACTOR', default=0.5, cast=float)
+SCRAPER_BACKOFF_JITTER = config('SCRAPER_BACKOFF_JITTER', default=0.5, cast=float)
+# Retry-After longer than this, or retries that would start after the
+# deadline (seconds into the fetch), end the retries instead of waiting
+SCRAPER_MAX_RETRY_AFTER = config('SCRAPER_MAX_RETRY_AFTER', default=5.0, cast=float)
+SCRAPER_RETRY_DEADLINE = config('SCRAPER_RETRY_DEADLINE', default=20.0, cast=float)
+SCRAPER_HTTP_CACHE_DIR = config('SCRAPER_HTTP_CACHE_DIR', default=str(BASE_DIR / '.cache' / 'scraper'))
+# Downloads are cut off at this decoded size, and (with lxml) end early once
+# the title, company and description elements have been received. With the
+# structured fast path on, early stop also waits for a JSON-LD JobPosting,
+# so pages without one are read to the end
+SCRAPER_MAX_PAGE_BYTES = config('SCRAPER_MAX_PAGE_BYTES', default=3 * 1024 * 1024, cast=int)
+SCRAPER_EARLY_STOP = config('SCRAPER_EARLY_STOP', default=True, cast=bool)
+# 'lxml' (targeted XPath extraction) or 'html.parser' (full BeautifulSoup tree)
+SCRAPER_HTML_PARSER = config('SCRAPER_HTML_PARSER', default='lxml')
+# Use a page's complete JSON-LD JobPosting instead of the LLM extractor
+SCRAPER_STRUCTURED_FAST_PATH = config('SCRAPER_STRUCTURED_FAST_PATH', default=True, cast=bool)
+
+# Scrape results shared across users by canonical job URL: fresh for TTL,
+# then served while a background re-scrape runs for STALE more hours
+SCRAPE_CACHE_ENABLED = config('SCRAPE_CACHE_ENABLED', default=True, cast=bool)
+SCRAPE_CACHE_TTL_HOURS = config('SCRAPE_CACHE_TTL_HOURS', default=12, cast=int)
+SCRAPE_CACHE_STALE_HOURS = config('SCRAPE_CACHE_STALE_HOURS', default=72, cast=int)
+
+# Bulk job URL import: concurrent fetches, polite per domain
+BULK_IMPORT_MAX_URLS = config('BULK_IMPORT_MAX_URLS', default=50, cast=int)
+BULK_IMPORT_WORKERS = config('BULK_IMPORT_WORKERS', default=8, cast=int)
+BULK_IMPORT_PER_DOMAIN_CONCURRENCY = config('BULK_IMPORT_PER_DOMAIN_CONCURRENCY', default=2, cast=int)
+BULK_IMPORT_PER_DOMAIN_INTERVAL = config('BULK_IMPORT_PER_DOMAIN_INTERVAL', default=1.0, cast=float)
+
+# Generation records are written behind the response: queued, written in
+# batches by a background thread, spooled to disk when the database fails
+GENERATION_WRITE_BEHIND = config('GENERATION_WRITE_BEHIND', default=True, cast=bool)
+GENERATION_WRITER_BATCH_SIZE = config('GENERATION_WRITER_BATCH_SIZE', default=50, cast=int)
+GENERATION_WRITER_MAX_QUEUE = config('GENERATION_WRITER_MAX_QUEUE', default=1000, cast=int)
+GENERATION_WRITER_RETRIES = config('GENERATION_WRITER_RETRIES', default=3, cast=int)
+GENERATION_WRITER_SPOOL_DIR = config('GENERATION_WRITER_SPOOL_DIR', default=str(BASE_DIR / '.cache' / 'generations'))
+
+# Text normalization: job description lines found in at least MIN_POSTINGS
+# postings from MIN_COMPANIES companies are dropped as boilerplate
+# (learned with the learn_boilerplate command)
+BOILERPLATE_MIN_POSTINGS = config('BOILERPLATE_MIN_POSTINGS', default=5, cast=int)
+BOILERPLATE_MIN_COMPANIES = config('BOILERPLATE_MIN_COMPANIES', default=3, cast=int)
+BOILERPLATE_FINGERPRINT_TTL = config('BOILERPLATE_FINGERPRINT_TTL', default=3600, cast=int)
+BOILERPLATE_LEARN_MAX_DOCS = config('BOILERPLATE_LEARN_MAX_DOCS', default=20000, cast=int)
+
+# Page-parallel PDF extraction (opt-in, uses a process pool for large PDFs;
+# with a single worker pages are extracted serially)
+PDF_PARALLEL_EXTRACTION = config('PDF_PARALLEL_EXTRACTION', default=False, cast=bool)
+PDF_PARALLEL_PAGE_THRESHOLD = config('PDF_PARALLEL_PAGE_THRESHOLD', default=8, cast=int)
+PDF_PARALLEL_MAX_WORKERS = config('PDF_PARALLEL_MAX_WORKERS', default=min(4, os.cpu_count() or 1), cast=int)
+
+# Document extraction mode: 'inprocess' or 'sandbox' (isolated worker pool with limits)
+DOCUMENT_EXTRACTION_MODE = config('DOCUMENT_EXTRACTION_MODE', default='inprocess')
+EXTRACTION_SANDBOX_WORKERS = config('EXTRACTION_SANDBOX_WORKERS', default=2, cast=int)
+EXTRACTION_SANDBOX_TIMEOUT = config('EXTRACTION_SANDBOX_TIMEOUT', default=10, cast=float)
+EXTRACTION_SANDBOX_MAX_RSS_MB = config('EXTRACTION_SANDBOX_MAX_RSS_MB', default=512, cast=int)
+EXTRACTION_SANDBOX_MAX_PAGES = config('EXTRACTION_SANDBOX_MAX_PAGES', default=50, cast=int)
+# A document claimed for extraction longer ago than this (seconds) is
+# treated as abandoned and extracted again by the next reader
+DOCUMENT_EXTRACTION_CLAIM_TIMEOUT = config('DOCUMENT_EXTRACTION_CLAIM_TIMEOUT', default=60, cast=float)
+
 # CORS Settings - Allow frontend development server
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8080",
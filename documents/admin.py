@@ -4,7 +4,8 @@ from .models import Document
 
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
-    list_display = ['file_name', 'document_type', 'user', 'is_master', 'created_at']
+    list_display = ['file_name', 'document_type', 'user', 'is_master', 'extraction_status', 'page_count', 'created_at']
     search_fields = ['file_name', 'user__username']
-    list_filter = ['document_type', 'is_master', 'created_at']
+    list_filter = ['document_type', 'is_master', 'extraction_status', 'created_at']
     raw_id_fields = ['application']
+    readonly_fields = ['content_hash', 'page_count', 'extraction_status', 'extraction_error', 'extracted_at']
@@ -0,0 +1,37 @@
+"""
+Extract Document Text
+
+Run with: python manage.py extract_document_text [--all]
+
+Backfills extracted text, content hash and page count for documents
+uploaded before background extraction existed (or whose extraction failed).
+"""
+
+from django.core.management.base import BaseCommand
+from documents.models import Document
+from documents.services.text_extraction import extract_document_text
+
+
+class Command(BaseCommand):
+    help = 'Extract and store text for documents that have not been processed yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-extract every document, not just pending/failed ones')
+
+    def handle(self, *args, **options):
+        documents = Document.objects.all()
+        if not options['all']:
+            documents = documents.exclude(extraction_status='ready')
+
+        ready = failed = 0
+        for document in documents.iterator():
+            extract_document_text(document)
+            if document.extraction_status == 'ready':
+                ready += 1
+                self.stdout.write(f"✓ {document.file_name}: {document.page_count or '?'} pages")
+            else:
+                failed += 1
+                self.stdout.write(f"✗ {document.file_name}: {document.extraction_error}")
+
+        self.stdout.write(f"\nDone: {ready} extracted, {failed} failed")
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_document_text_extraction'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='extraction_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('extracting', 'Extracting'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+    ]
@@ -18,6 +18,13 @@ class Document(models.Model):
         ('cover_letter', 'Cover Letter'),
         ('other', 'Other'),
     ]
+
+    EXTRACTION_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('extracting', 'Extracting'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     application = models.ForeignKey('applications.JobApplication', on_delete=models.CASCADE, null=True, blank=True)
@@ -27,6 +34,14 @@ class Document(models.Model):
     is_master = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Text extraction (filled in the background after upload)
+    extracted_text = models.TextField(blank=True, null=True, help_text="Text extracted from the file")
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text="SHA-256 of the file bytes")
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    extraction_status = models.CharField(max_length=10, choices=EXTRACTION_STATUS_CHOICES, default='pending')
+    extraction_error = models.TextField(blank=True, default='')
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return f"{self.file_name} ({self.document_type})"
 
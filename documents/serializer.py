@@ -9,8 +9,10 @@ class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Document
         fields = ['id', 'user_id', 'application', 'document_type', 'file', 
-              'file_name', 'is_master', 'file_url', 'created_at']
-        read_only_fields = ['user_id', 'file_name', 'created_at', 'file_url']
+              'file_name', 'is_master', 'file_url', 'created_at',
+              'content_hash', 'page_count', 'extraction_status']
+        read_only_fields = ['user_id', 'file_name', 'created_at', 'file_url',
+                            'content_hash', 'page_count', 'extraction_status']
     
     def get_file_url(self, obj):
         """Return the full URL to the file"""
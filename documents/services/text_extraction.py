@@ -0,0 +1,164 @@
+"""
+Document Text Extraction
+
+Extracts text, a content hash and a page count from uploaded documents
+once, in a background thread after upload, and stores them on the
+Document row. The AI endpoints then reuse Document.extracted_text
+instead of re-uploading and re-parsing the resume on every request.
+
+Whoever extracts a document first claims its row (pending -> extracting)
+with a conditional update, so the background thread and a request that
+needs the text before it is ready never parse the same file twice.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ai_services.services.resume_parser import extract_text, get_page_count
+from ai_services.services.text_cache import get_or_extract_text
+from ..models import Document
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLAIM_TIMEOUT = 60.0
+CLAIM_POLL_INTERVAL = 0.1
+
+EXTRACTION_FIELDS = [
+    'extracted_text', 'content_hash', 'page_count',
+    'extraction_status', 'extraction_error', 'extracted_at',
+]
+
+
+def extract_document_text(document):
+    """
+    Extract and store text, content hash and page count for a document.
+    Parsing goes through the shared text cache, so a file that was already
+    uploaded to an AI endpoint is not parsed again.
+
+    Args:
+        document (Document): Document with a stored file
+
+    Returns:
+        Document: The updated document
+    """
+    try:
+        with document.file.open('rb') as stored_file:
+            data = stored_file.read()
+
+        file_ext = os.path.splitext(document.file.name)[1].lower()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        text = get_or_extract_text(
+            content_hash,
+            file_ext,
+            lambda: extract_text(data, file_ext),
+            file_size=len(data),
+        )
+
+        document.extracted_text = text
+        document.content_hash = content_hash
+        document.page_count = get_page_count(data, file_ext)
+        document.extraction_status = 'ready'
+        document.extraction_error = ''
+    except Exception as e:
+        logger.warning("Text extraction failed for document %s: %s", document.pk, e)
+        document.extraction_status = 'failed'
+        document.extraction_error = str(e)
+
+    document.extracted_at = timezone.now()
+    document.save(update_fields=EXTRACTION_FIELDS)
+    return document
+
+
+def claim_extraction(document):
+    """
+    Claim a document for extraction: a pending row, or one whose claim is
+    older than DOCUMENT_EXTRACTION_CLAIM_TIMEOUT (its extractor died), is
+    marked 'extracting' with extracted_at set to the claim time. The
+    update is conditional, so only one caller wins.
+
+    Args:
+        document (Document): Document to extract
+
+    Returns:
+        bool: True if this caller now owns the extraction
+    """
+    now = timezone.now()
+    timeout = getattr(settings, 'DOCUMENT_EXTRACTION_CLAIM_TIMEOUT', DEFAULT_CLAIM_TIMEOUT)
+    claimable = Q(extraction_status='pending') | Q(
+        extraction_status='extracting', extracted_at__lt=now - timedelta(seconds=timeout),
+    )
+    claimed = Document.objects.filter(claimable, id=document.id).update(
+        extraction_status='extracting', extracted_at=now,
+    )
+    if claimed:
+        document.extraction_status = 'extracting'
+        document.extracted_at = now
+    return bool(claimed)
+
+
+def _extract_in_background(document_id):
+    close_old_connections()
+    try:
+        document = Document.objects.filter(id=document_id).first()
+        if document is not None and claim_extraction(document):
+            extract_document_text(document)
+    finally:
+        connection.close()
+
+
+def schedule_document_extraction(document):
+    """
+    Extract a document's text in a background thread once the
+    surrounding transaction has committed.
+
+    Args:
+        document (Document): Newly uploaded (or replaced) document
+    """
+    def start():
+        threading.Thread(
+            target=_extract_in_background,
+            args=(document.id,),
+            daemon=True,
+            name=f'document-extraction-{document.id}',
+        ).start()
+
+    transaction.on_commit(start)
+
+
+def get_document_text(document):
+    """
+    Get the stored text for a document. A pending document is claimed and
+    extracted inline; one that another thread is extracting is waited for
+    (and taken over if its claim goes stale) instead of parsed again.
+
+    Args:
+        document (Document): Document owned by the requesting user
+
+    Returns:
+        str: Extracted text
+
+    Raises:
+        Exception: If extraction failed for this document
+    """
+    while document.extraction_status in ('pending', 'extracting'):
+        if claim_extraction(document):
+            extract_document_text(document)
+            break
+        document.refresh_from_db(fields=EXTRACTION_FIELDS)
+        if document.extraction_status == 'extracting':
+            time.sleep(CLAIM_POLL_INTERVAL)
+
+    if document.extraction_status == 'failed':
+        raise Exception(document.extraction_error or 'Text extraction failed')
+
+    return document.extracted_text or ''
@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from .models import Document
 from .serializer import DocumentSerializer
+from .services.text_extraction import schedule_document_extraction
 
 
 class DocumentViewSet(viewsets.ModelViewSet):
@@ -16,6 +17,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
     Supported file types: PDF, DOCX, DOC, TXT
     Max file size: 10MB
     Files are organized by: media/documents/{user_id}/{document_type}/{filename}
+    Text, content hash and page count are extracted in the background after upload
+    and reused by the AI endpoints (document_id / use_master).
     """
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
@@ -27,4 +30,13 @@ class DocumentViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         # User is already set in serializer.create()
-        serializer.save()
+        document = serializer.save()
+        schedule_document_extraction(document)
+
+    def perform_update(self, serializer):
+        file_replaced = 'file' in serializer.validated_data
+        if file_replaced:
+            serializer.validated_data['extraction_status'] = 'pending'
+        document = serializer.save()
+        if file_replaced:
+            schedule_document_extraction(document)